@@ -0,0 +1,96 @@
+# backend/benchmarks/auth_dependency.py
+"""
+Microbenchmark da autenticação com o mesmo token repetido (o caso comum: um token de
+12 horas apresentado em toda requisição).
+
+Mede, por chamada:
+- decode_access_token sem cache (verificação HMAC + parse a cada vez) e com cache;
+- get_current_principal (só os claims do token, sem banco);
+- a dependência get_current_user completa, com os caches frios e quentes
+  (SQLite em memória; o caso frio inclui o SELECT do usuário).
+
+Uso:
+    SECRET_KEY=qualquer python -m backend.benchmarks.auth_dependency [iterações]
+"""
+import os
+import sys
+import timeit
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.core.security import create_access_token, decode_access_token, access_claims
+from backend.core.token_cache import verified_token_cache
+from backend.core.principal_cache import principal_cache
+from backend.database.database import Base
+from backend.dependencies import get_current_principal, get_current_user
+from backend.models.user import User
+
+
+class _FakeRequest:
+    """O suficiente de Request para get_current_user: headers e cookies."""
+
+    def __init__(self, token: str):
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.cookies = {}
+
+
+def _report(label: str, seconds: float, iterations: int):
+    print(f"{label:<45} {seconds / iterations * 1e6:>10.2f} µs/chamada")
+
+
+def run(iterations: int = 20000):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[User.__table__])
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = Session()
+    user = User(email="bench@docebrinquedo.com.br", hashed_password="x", is_admin=True)
+    db.add(user)
+    db.commit()
+    token = create_access_token(access_claims(user))
+    db.close()
+    request = _FakeRequest(token)
+
+    def decode_cold():
+        verified_token_cache.clear()
+        decode_access_token(token)
+
+    def decode_warm():
+        decode_access_token(token)
+
+    def dependency(clear_caches: bool):
+        def call():
+            if clear_caches:
+                verified_token_cache.clear()
+                principal_cache.clear()
+            session = Session()
+            try:
+                principal = get_current_principal(request, None, session)
+                get_current_user(principal, session).is_admin
+            finally:
+                session.close()
+        return call
+
+    def principal_only():
+        get_current_principal(request, None, None).is_admin
+
+    decode_warm()
+    _report("decode_access_token (sem cache)", timeit.timeit(decode_cold, number=iterations), iterations)
+    _report("decode_access_token (cache quente)", timeit.timeit(decode_warm, number=iterations), iterations)
+
+    _report("get_current_principal (claims)", timeit.timeit(principal_only, number=iterations), iterations)
+
+    dep_iterations = max(iterations // 10, 1)
+    _report("get_current_user (caches frios)", timeit.timeit(dependency(True), number=dep_iterations), dep_iterations)
+    dependency(False)()
+    _report("get_current_user (caches quentes)", timeit.timeit(dependency(False), number=dep_iterations), dep_iterations)
+
+    print("token cache:", verified_token_cache.stats())
+    print("principal cache:", principal_cache.stats())
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
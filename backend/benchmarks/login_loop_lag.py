@@ -0,0 +1,73 @@
+# backend/benchmarks/login_loop_lag.py
+"""
+Latência do event loop durante uma rajada de logins.
+
+Um "ticker" dorme 5 ms em loop e mede quanto cada despertar atrasou; ao mesmo tempo,
+N verificações de senha bcrypt são disparadas juntas. Compara:
+- inline: bcrypt chamado direto na coroutine (como o login fazia antes);
+- executor: verify_password_async (executor limitado de core.security).
+
+Uso:
+    SECRET_KEY=qualquer python -m backend.benchmarks.login_loop_lag [logins]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from backend.core import security
+
+TICK_SECONDS = 0.005
+
+
+async def _ticker(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def _burst(mode: str, logins: int, hashed: str) -> dict:
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    await asyncio.sleep(0.05)
+
+    async def login_inline():
+        security._check_password("senha-correta", hashed)
+
+    async def login_executor():
+        await security.verify_password_async("senha-correta", hashed)
+
+    login = login_inline if mode == "inline" else login_executor
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    await asyncio.sleep(0.05)
+    stop.set()
+    await ticker
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": mode,
+        "logins": logins,
+        "burst_seconds": round(elapsed, 3),
+        "lag_p50_ms": round(statistics.median(lags_ms), 2),
+        "lag_p99_ms": round(lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))], 2),
+        "lag_max_ms": round(lags_ms[-1], 2),
+    }
+
+
+async def run(logins: int = 20):
+    hashed = security._hash_password("senha-correta")
+    print(f"BCRYPT_ROUNDS={security.BCRYPT_ROUNDS} workers={security.PASSWORD_HASH_MAX_WORKERS}")
+    for mode in ("inline", "executor"):
+        print(await _burst(mode, logins, hashed))
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
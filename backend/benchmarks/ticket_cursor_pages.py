@@ -0,0 +1,77 @@
+# backend/benchmarks/ticket_cursor_pages.py
+"""
+Verifica a paginação por cursor das listagens de tickets em um SQLite em memória:
+percorre todas as páginas seguindo o next_cursor e confere que cada ticket aparece
+exatamente uma vez.
+
+Os tickets são criados no mesmo segundo (default func.now(), gravado sem fração) e
+também com created_at com microssegundos, os dois formatos que o SQLite guarda.
+
+Uso:
+    python -m backend.benchmarks.ticket_cursor_pages
+"""
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.migrations.principal import MIGRATIONS
+from backend.migrations.runner import run_migrations
+from backend.models.user import User
+from backend.ticket.crud import ticket as crud_ticket
+from backend.ticket.models.ticket import Ticket
+
+PAGE_SIZE = 2
+
+
+def _seed(db) -> set:
+    requester = User(email="solicitante@bench.local", hashed_password="x")
+    db.add(requester)
+    db.flush()
+
+    def new_ticket(n: int, created_at=None) -> Ticket:
+        ticket = Ticket(title=f"Ticket {n}", description="-", priority="baixa", category="TI", requester_id=requester.id)
+        if created_at is not None:
+            ticket.created_at = created_at
+        return ticket
+
+    # Mesmo segundo, gravado pelo banco sem fração de segundo
+    db.add_all([new_ticket(n) for n in range(5)])
+    db.flush()
+    # Gravados pelo Python, com microssegundos (inclusive empatados no mesmo instante)
+    base = datetime.utcnow().replace(microsecond=250000) - timedelta(seconds=1)
+    db.add_all([new_ticket(5 + n, base + timedelta(microseconds=(n // 2) * 1000)) for n in range(4)])
+    db.commit()
+    return {ticket_id for (ticket_id,) in db.query(Ticket.id).all()}
+
+
+def run() -> bool:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    run_migrations(engine, MIGRATIONS, label="benchmark")
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    expected = _seed(db)
+
+    seen, pages, cursor = [], 0, None
+    # Limite de páginas: com o seek quebrado o cursor não avança e o laço seria infinito
+    while pages <= len(expected):
+        tickets, _, cursor = crud_ticket.get_all_tickets(
+            db, include_closed_or_resolved=True, limit=PAGE_SIZE, cursor=cursor,
+            include_total="false", view="summary",
+        )
+        pages += 1
+        seen.extend(ticket.id for ticket in tickets)
+        print(f"página {pages}: {[ticket.id for ticket in tickets]}")
+        if cursor is None:
+            break
+    db.close()
+
+    ok = cursor is None and len(seen) == len(set(seen)) and set(seen) == expected
+    if ok:
+        print(f"✅ {len(expected)} tickets em {pages} páginas, sem repetição")
+    else:
+        print(f"❌ esperado {sorted(expected)}, visto {seen}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,126 @@
+# backend/benchmarks/ticket_write_statements.py
+"""
+Conta os comandos SQL e commits de cada escrita de ticket, simulando uma requisição
+completa (usuário logado + rota + CRUD) em um SQLite em memória.
+
+Uso:
+    python -m backend.benchmarks.ticket_write_statements
+
+Para comparar com a versão anterior do caminho de escrita, rode o mesmo script em um
+checkout anterior ao commit que introduziu _commit_keeping_loaded.
+"""
+import asyncio
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.migrations.principal import MIGRATIONS
+from backend.migrations.runner import run_migrations
+from backend.models.user import User
+from backend.ticket.crud import ticket as crud_ticket
+from backend.ticket.schemas.ticket import TicketCreate, TicketUpdate
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.statements = 0
+        self.commits = 0
+        self.sql = []
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        self.sql.append(" ".join(statement.split())[:100])
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    @contextmanager
+    def measure(self, label: str, results: list, verbose: bool = False):
+        self.statements, self.commits, self.sql = 0, 0, []
+        yield
+        results.append((label, self.statements, self.commits))
+        if verbose:
+            for sql in self.sql:
+                print(f"    {sql}")
+
+
+def _seed(Session):
+    db = Session()
+    requester = User(email="solicitante@bench.local", hashed_password="x")
+    tech = User(email="tecnico@bench.local", hashed_password="x", is_admin=True)
+    db.add_all([requester, tech])
+    db.commit()
+    ids = requester.id, tech.id
+    db.close()
+    return ids
+
+
+def _cancel_pending_tasks():
+    # As notificações por websocket não fazem parte da medição
+    current = asyncio.current_task()
+    for task in asyncio.all_tasks():
+        if task is not current:
+            task.cancel()
+
+
+async def run(verbose: bool = False):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    run_migrations(engine, MIGRATIONS, label="benchmark")
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    requester_id, tech_id = _seed(Session)
+    counter = StatementCounter(engine)
+    results = []
+
+    # Cada bloco abre uma sessão nova, como uma requisição: get_current_user + rota
+    with counter.measure("POST /tickets/", results, verbose):
+        db = Session()
+        requester = db.query(User).filter(User.id == requester_id).first()
+        ticket = crud_ticket.create_ticket(
+            db,
+            TicketCreate(title="Impressora", description="Sem toner", category="TI", priority="alta", assignee_id=tech_id),
+            requester_id=requester.id,
+        )
+        ticket_id = ticket.id
+        _ = (ticket.requester.email, ticket.assignee.email, ticket.updated_at)
+        db.close()
+    _cancel_pending_tasks()
+
+    with counter.measure("PUT /tickets/{id}", results, verbose):
+        db = Session()
+        tech = db.query(User).filter(User.id == tech_id).first()
+        db_ticket = crud_ticket.get_ticket(db, ticket_id)
+        ticket = crud_ticket.update_ticket(db, db_ticket, TicketUpdate(priority="média"))
+        _ = (ticket.requester.email, ticket.assignee.email, ticket.updated_at)
+        db.close()
+
+    with counter.measure("POST /tickets/{id}/accept", results, verbose):
+        db = Session()
+        tech = db.query(User).filter(User.id == tech_id).first()
+        ticket = crud_ticket.accept_ticket(db, ticket_id, current_user=tech)
+        _ = (ticket.requester.email, ticket.assignee.email, ticket.updated_at)
+        db.close()
+    _cancel_pending_tasks()
+
+    with counter.measure("POST /tickets/{id}/close", results, verbose):
+        db = Session()
+        tech = db.query(User).filter(User.id == tech_id).first()
+        ticket = crud_ticket.close_ticket(db, ticket_id, current_user=tech, observation="Trocado")
+        _ = (ticket.requester.email, ticket.assignee.email, ticket.updated_at)
+        db.close()
+    _cancel_pending_tasks()
+
+    print(f"{'rota':<30} {'comandos SQL':>12} {'commits':>8}")
+    for label, statements, commits in results:
+        print(f"{label:<30} {statements:>12} {commits:>8}")
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    asyncio.run(run(verbose="-v" in sys.argv))
@@ -0,0 +1,88 @@
+# backend/benchmarks/ws_broadcast.py
+"""
+Latência de ConnectionManager.broadcast com 1k e 5k conexões simuladas.
+
+Cada conexão falsa leva ~1 ms para "enviar" (await asyncio.sleep) e 1% delas são lentas
+(200 ms). Compara o laço sequencial antigo (json.dumps por conexão + await um a um)
+com o broadcast atual, medindo o tempo até a chamada retornar (o que bloqueia quem
+publica) e até o frame chegar a todas as conexões (filas de saída esvaziadas), e o
+custo de desconectar todas as conexões.
+
+Uso:
+    SECRET_KEY=qualquer python -m backend.benchmarks.ws_broadcast
+"""
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from backend.websocket.service.connection_manager import ConnectionManager
+
+PAYLOAD = {
+    "server_stats": {"cpu": {"percent": 12.5}, "memory": {"total": 16.0, "used": 7.2, "percent": 45.0}},
+    "users_stats": [{"id": i, "email": f"user{i}@docebrinquedo.com.br", "status": "online"} for i in range(50)],
+}
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.sent = 0
+
+    async def send_text(self, data: str):
+        await asyncio.sleep(self.delay)
+        self.sent += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def _build(connections: int) -> ConnectionManager:
+    manager = ConnectionManager()
+    for i in range(connections):
+        delay = 0.2 if i % 100 == 0 else 0.001
+        manager._register(i // 2, FakeWebSocket(delay))
+    return manager
+
+
+async def _legacy_broadcast(manager: ConnectionManager, type: str, message):
+    for conns in list(manager.active_connections.values()):
+        for conn in list(conns):
+            await conn.send_text(json.dumps(manager.set_msg(type, message)))
+
+
+async def run():
+    for connections in (1000, 5000):
+        manager = _build(connections)
+        started = time.perf_counter()
+        await _legacy_broadcast(manager, "system_stats", PAYLOAD)
+        legacy = time.perf_counter() - started
+        for ws in list(manager.connections):
+            manager.disconnect(ws)
+
+        manager = _build(connections)
+        sockets = list(manager.connections)
+        started = time.perf_counter()
+        await manager.broadcast("system_stats", PAYLOAD)
+        returned = time.perf_counter() - started
+        while any(ws.sent == 0 for ws in sockets):
+            await asyncio.sleep(0.001)
+        delivered = time.perf_counter() - started
+
+        print(
+            f"{connections:>5} conexões | sequencial: {legacy * 1000:9.1f} ms"
+            f" | atual: retorno {returned * 1000:7.1f} ms, entrega {delivered * 1000:7.1f} ms"
+            f" | {manager.queue_stats()}"
+        )
+
+        # Tempestade de desconexões (ex.: deploy): custo total de remover todas
+        started = time.perf_counter()
+        for ws in sockets:
+            manager.disconnect(ws)
+        print(f"{connections:>5} conexões | desconectar todas: {(time.perf_counter() - started) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
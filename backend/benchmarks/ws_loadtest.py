@@ -0,0 +1,288 @@
+# backend/benchmarks/ws_loadtest.py
+"""
+Teste de carga do websocket contra uma instância local da API.
+
+Abre milhares de conexões autenticadas em /ws (JWTs gerados aqui com o SECRET_KEY do
+servidor; os usuários das conexões não precisam existir no banco) e dispara, pelas rotas
+/api/ws/loadtest/*, mensagens em broadcast e por usuário (o caminho das notificações).
+Cada conexão responde aos pings do heartbeat e mede a latência de cada mensagem
+(instante de envio no servidor -> chegada no cliente, mesmo relógio por ser local).
+
+Relata:
+- taxa de conexão (conexões/s) e latência do handshake;
+- latência do fan-out por fase (p50/p90/p99/máx) e mensagens entregues/esperadas;
+- memória do servidor por conexão (RSS antes/depois de conectar, dividido por N);
+- atraso do event loop do servidor durante as rajadas (e do próprio gerador, que
+  invalida as medidas se ficar alto).
+
+Pré-requisitos:
+- servidor com WS_LOADTEST_ENABLED=true e o mesmo SECRET_KEY, um worker só
+  (com vários workers a sonda vê apenas um deles);
+- --admin-id de um super admin existente no banco (as rotas de apoio exigem o usuário);
+- pacote 'websockets' instalado neste ambiente e limite de arquivos abertos suficiente
+  dos dois lados (ulimit -n maior que o número de conexões).
+
+Uso:
+    SECRET_KEY=<o do servidor> python -m backend.benchmarks.ws_loadtest \\
+        --url http://127.0.0.1:8000 --connections 5000 --admin-id 1
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import urllib.parse
+import urllib.request
+from typing import Optional
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from backend.core.security import create_access_token
+
+TICK_SECONDS = 0.01
+
+
+def _percentile(values: list, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def _token(user_id: int, super_admin: bool = False) -> str:
+    return create_access_token({
+        "sub": str(user_id),
+        "is_active": True,
+        "is_admin": super_admin,
+        "is_super_admin": super_admin,
+    })
+
+
+class _Api:
+    """Chamadas HTTP às rotas de apoio (urllib numa thread, para não travar o gerador)."""
+
+    def __init__(self, base_url: str, admin_token: str):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": "application/json"}
+
+    def _request(self, method: str, path: str, params: dict, body=None) -> dict:
+        url = f"{self.base_url}{path}?{urllib.parse.urlencode(params)}"
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(url, data=data, headers=self.headers, method=method)
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return json.loads(response.read())
+
+    async def probe(self, seconds: float) -> dict:
+        return await asyncio.to_thread(self._request, "GET", "/api/ws/loadtest/probe", {"seconds": seconds})
+
+    async def publish(self, mode: str, seq: int, size: int, user_ids: Optional[list] = None) -> dict:
+        return await asyncio.to_thread(
+            self._request, "POST", "/api/ws/loadtest/publish",
+            {"mode": mode, "seq": seq, "size": size}, user_ids
+        )
+
+
+class _Stats:
+    def __init__(self):
+        self.latencies: dict[int, list] = {}
+        self.pings = 0
+        self.closed = 0
+        self.failed = 0
+
+    def delivered(self, seqs) -> int:
+        return sum(len(self.latencies.get(seq, ())) for seq in seqs)
+
+
+async def _client(ws_url: str, user_id: int, encoding: str, stats: _Stats, ready: list, connect_times: list,
+                  semaphore: asyncio.Semaphore, stop: asyncio.Event):
+    query = {"token": _token(user_id)}
+    if encoding != "json":
+        query["encoding"] = encoding
+    url = f"{ws_url}?{urllib.parse.urlencode(query)}"
+
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            ws = await websockets.connect(url, open_timeout=30, ping_interval=None, max_queue=None)
+        except Exception:
+            stats.failed += 1
+            return
+        connect_times.append(time.perf_counter() - started)
+    ready.append(ws)
+
+    receiver = asyncio.create_task(_receive(ws, stats))
+    await stop.wait()
+    receiver.cancel()
+    await ws.close()
+
+
+async def _receive(ws, stats: _Stats):
+    try:
+        async for raw in ws:
+            received_at = time.time()
+            data = msgpack.unpackb(raw, raw=False) if isinstance(raw, bytes) else json.loads(raw)
+            kind = data.get("type")
+            if kind == "loadtest":
+                message = data["message"]
+                stats.latencies.setdefault(message["seq"], []).append(received_at - message["sent_at"])
+            elif kind == "ping":
+                stats.pings += 1
+                await ws.send(json.dumps({"action": "pong"}))
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        stats.closed += 1
+
+
+async def _ticker(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append((time.perf_counter() - started - TICK_SECONDS) * 1000)
+
+
+async def _wait_connections(api: _Api, expected: int, timeout: float) -> dict:
+    """O handshake termina antes do registro no manager: espera o servidor contar todas."""
+    deadline = time.monotonic() + timeout
+    probe = await api.probe(0.1)
+    while probe["connections"] < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.2)
+        probe = await api.probe(0.1)
+    return probe
+
+
+async def _phase(api: _Api, stats: _Stats, mode: str, seqs: list, size: int, expected: int,
+                 user_ids: Optional[list], timeout: float) -> dict:
+    server_lags: list = []
+    done = asyncio.Event()
+
+    async def sample_server():
+        while not done.is_set():
+            server_lags.append((await api.probe(0.5))["loop_lag_ms"]["max"])
+
+    sampler = asyncio.create_task(sample_server())
+    publish_ms = []
+    for seq in seqs:
+        publish_ms.append((await api.publish(mode, seq, size, user_ids))["publish_ms"])
+        deadline = time.monotonic() + timeout
+        while stats.delivered([seq]) < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+    done.set()
+    await sampler
+
+    latencies = sorted(seconds * 1000 for seq in seqs for seconds in stats.latencies.get(seq, ()))
+    return {
+        "delivered": len(latencies),
+        "expected": expected * len(seqs),
+        "publish_ms": statistics.median(publish_ms),
+        "p50": _percentile(latencies, 0.50),
+        "p90": _percentile(latencies, 0.90),
+        "p99": _percentile(latencies, 0.99),
+        "max": latencies[-1] if latencies else 0.0,
+        "server_lag_max": max(server_lags) if server_lags else 0.0,
+    }
+
+
+def _print_phase(label: str, result: dict):
+    print(
+        f"{label:<10} | entregues {result['delivered']}/{result['expected']}"
+        f" | publicar {result['publish_ms']:7.1f} ms"
+        f" | p50 {result['p50']:7.1f} p90 {result['p90']:7.1f} p99 {result['p99']:7.1f}"
+        f" máx {result['max']:7.1f} ms | lag do servidor até {result['server_lag_max']:.1f} ms"
+    )
+
+
+async def run(args):
+    api = _Api(args.url, _token(args.admin_id, super_admin=True))
+    ws_url = urllib.parse.urlparse(args.url)._replace(scheme="wss" if args.url.startswith("https") else "ws", path="/ws").geturl()
+
+    baseline = await api.probe(1.0)
+    print(f"Servidor: {baseline['connections']} conexões, RSS {baseline['rss_bytes'] / 2**20:.1f} MiB")
+
+    stats = _Stats()
+    stop = asyncio.Event()
+    client_lags: list = []
+    ticker = asyncio.create_task(_ticker(client_lags, stop))
+    ready: list = []
+    connect_times: list = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    user_ids = [args.user_id_base + i // args.per_user for i in range(args.connections)]
+
+    started = time.perf_counter()
+    clients = [
+        asyncio.create_task(_client(ws_url, user_id, args.encoding, stats, ready, connect_times, semaphore, stop))
+        for user_id in user_ids
+    ]
+    while len(connect_times) + stats.failed < args.connections:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    connected = len(ready)
+
+    probe = await _wait_connections(api, baseline["connections"] + connected, args.timeout)
+    connect_ms = sorted(seconds * 1000 for seconds in connect_times)
+    per_connection = (probe["rss_bytes"] - baseline["rss_bytes"]) / max(connected, 1)
+    print(
+        f"Conexões   | {connected}/{args.connections} em {elapsed:.2f} s ({connected / elapsed:.0f}/s)"
+        f" | handshake p50 {_percentile(connect_ms, 0.5):.1f} p99 {_percentile(connect_ms, 0.99):.1f} ms"
+        f" | servidor vê {probe['connections'] - baseline['connections']}"
+    )
+    print(f"Memória    | RSS {probe['rss_bytes'] / 2**20:.1f} MiB, ~{per_connection / 1024:.1f} KiB por conexão")
+
+    if connected:
+        broadcast = await _phase(
+            api, stats, "broadcast", list(range(1, args.messages + 1)), args.size,
+            connected, None, args.timeout
+        )
+        _print_phase("broadcast", broadcast)
+
+        distinct = sorted(set(user_ids))
+        users = await _phase(
+            api, stats, "users", list(range(100001, 100001 + args.messages)), args.size,
+            connected, distinct, args.timeout
+        )
+        _print_phase("usuários", users)
+
+    final = await api.probe(1.0)
+    stop.set()
+    await asyncio.gather(*clients, return_exceptions=True)
+    await ticker
+
+    lags = sorted(client_lags)
+    print(
+        f"Servidor   | ao final: fila {final['queued']}, removidas por lentidão {final['evicted']}"
+        f" | lag p99 {final['loop_lag_ms']['p99']:.1f} ms"
+    )
+    print(
+        f"Gerador    | lag p99 {_percentile(lags, 0.99):.1f} ms, máx {(lags[-1] if lags else 0.0):.1f} ms"
+        f" | pings respondidos {stats.pings}, conexões caídas {stats.closed}"
+    )
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Teste de carga do websocket")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200, help="handshakes simultâneos")
+    parser.add_argument("--per-user", type=int, default=1, help="conexões por usuário (abas)")
+    parser.add_argument("--user-id-base", type=int, default=1_000_000)
+    parser.add_argument("--admin-id", type=int, default=1, help="id de um super admin existente")
+    parser.add_argument("--messages", type=int, default=20, help="mensagens por fase")
+    parser.add_argument("--size", type=int, default=256, help="bytes de enchimento por mensagem")
+    parser.add_argument("--encoding", choices=["json", "msgpack"], default="json")
+    parser.add_argument("--timeout", type=float, default=10.0, help="espera máxima por mensagem (s)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args(sys.argv[1:])
+    if websockets is None:
+        sys.exit("Instale o pacote 'websockets' para rodar o teste de carga.")
+    if args.encoding == "msgpack" and msgpack is None:
+        sys.exit("Instale o pacote 'msgpack' para --encoding msgpack.")
+    asyncio.run(run(args))
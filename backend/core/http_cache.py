@@ -0,0 +1,31 @@
+# backend/core/http_cache.py
+import hashlib
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """Gera um ETag fraco a partir das partes que identificam a versão do recurso."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Compara o ETag atual com o cabeçalho If-None-Match (comparação fraca, como manda o RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Resposta 304 sem corpo, repetindo o ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,86 @@
+# backend/core/principal_cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from backend.models.user import User
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 30))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 1024))
+
+
+def user_snapshot(user: User) -> dict:
+    """Valores de todas as colunas do usuário, no formato aceito por User(**snapshot)."""
+    return {column.key: getattr(user, column.key) for column in User.__mapper__.column_attrs}
+
+
+class PrincipalCache:
+    """
+    Cache em processo do usuário autenticado, indexado pelo id (claim 'sub' do token).
+
+    Guarda um snapshot das colunas, não a instância ORM: cada requisição reconstrói o
+    User na própria sessão sem ir ao banco. O TTL curto limita a defasagem de mudanças
+    feitas por outros workers; as escritas de usuário deste processo invalidam a entrada
+    explicitamente.
+    """
+
+    def __init__(self, ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple[dict, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            snapshot, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return snapshot
+
+    def set(self, user_id: int, snapshot: dict):
+        with self._lock:
+            self._entries[user_id] = (snapshot, time.monotonic() + self._ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Instância global
+principal_cache = PrincipalCache()
@@ -0,0 +1,200 @@
+# backend/core/rate_limit.py
+import asyncio
+import math
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" | "database"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+# Só confia no X-Forwarded-For quando a API está atrás de um proxy conhecido
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+
+LOGIN_RATE_IP_BURST = int(os.getenv("LOGIN_RATE_IP_BURST", 20))
+LOGIN_RATE_IP_PER_MINUTE = float(os.getenv("LOGIN_RATE_IP_PER_MINUTE", 10))
+LOGIN_RATE_EMAIL_BURST = int(os.getenv("LOGIN_RATE_EMAIL_BURST", 5))
+LOGIN_RATE_EMAIL_PER_MINUTE = float(os.getenv("LOGIN_RATE_EMAIL_PER_MINUTE", 3))
+
+
+class BucketRule(NamedTuple):
+    capacity: int             # tentativas em rajada
+    refill_per_second: float  # reposição contínua
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool
+    retry_after: float = 0.0  # segundos até haver uma ficha disponível
+    scope: Optional[str] = None  # "ip" | "email" quando recusado
+
+
+class RateLimitBackend(ABC):
+    """
+    Armazenamento dos baldes de fichas (token bucket). Implementações devem consumir
+    'cost' fichas de forma atômica e devolver (permitido, fichas restantes).
+    'blocking' indica que take faz I/O e deve rodar fora do event loop.
+    """
+
+    blocking = False
+
+    @abstractmethod
+    def take(self, key: str, rule: BucketRule, cost: float = 1.0) -> Tuple[bool, float]:
+        ...
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Baldes no processo. Suficiente para um worker; com vários, cada um limita sozinho."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, rule: BucketRule, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(rule.capacity), now))
+            tokens = min(float(rule.capacity), tokens + (now - updated_at) * rule.refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, tokens
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """
+    Baldes compartilhados entre workers na tabela rate_limit_buckets do banco principal
+    (criada pela migração 'rate_limit_buckets'). Cada tentativa é um único upsert atômico,
+    sem tocar na tabela de usuários.
+    """
+
+    blocking = True
+
+    # min(capacidade, fichas + tempo decorrido * reposição), portável entre PostgreSQL e SQLite
+    _REFILLED = """
+        CASE WHEN rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate > :capacity
+             THEN :capacity
+             ELSE rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate END
+    """
+
+    def __init__(self, engine: Engine):
+        self._engine = engine
+        refilled = self._REFILLED
+        self._statement = text(f"""
+            INSERT INTO rate_limit_buckets (key, tokens, updated_at, allowed)
+            VALUES (:key, :capacity - :cost, :now, TRUE)
+            ON CONFLICT (key) DO UPDATE SET
+                tokens = CASE WHEN {refilled} >= :cost THEN {refilled} - :cost ELSE {refilled} END,
+                allowed = ({refilled} >= :cost),
+                updated_at = :now
+            RETURNING allowed, tokens
+        """)
+
+    # Baldes parados há mais que isso já estariam cheios: podem ser apagados
+    STALE_SECONDS = 24 * 3600
+
+    def take(self, key: str, rule: BucketRule, cost: float = 1.0) -> Tuple[bool, float]:
+        params = {
+            "key": key,
+            "capacity": float(rule.capacity),
+            "rate": rule.refill_per_second,
+            "cost": float(cost),
+            "now": time.time(),
+        }
+        with self._engine.begin() as conn:
+            allowed, tokens = conn.execute(self._statement, params).one()
+            # Limpeza ocasional, amortizada entre as tentativas
+            if random.random() < 0.001:
+                conn.execute(text("DELETE FROM rate_limit_buckets WHERE updated_at < :cutoff"),
+                             {"cutoff": params["now"] - self.STALE_SECONDS})
+        return bool(allowed), float(tokens)
+
+
+class LoginRateLimiter:
+    """
+    Limita tentativas de login por IP e por e-mail antes de qualquer consulta ao banco de
+    usuários ou verificação bcrypt. Mantém contadores das tentativas recusadas.
+    """
+
+    def __init__(self, backend: RateLimitBackend, ip_rule: BucketRule, email_rule: BucketRule):
+        self.backend = backend
+        self.ip_rule = ip_rule
+        self.email_rule = email_rule
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected_ip = 0
+        self.rejected_email = 0
+
+    @staticmethod
+    def _retry_after(tokens: float, rule: BucketRule) -> float:
+        if rule.refill_per_second <= 0:
+            return 60.0
+        return max((1.0 - tokens) / rule.refill_per_second, 0.0)
+
+    def check(self, client_ip: str, email: str) -> RateLimitDecision:
+        allowed, tokens = self.backend.take(f"login:ip:{client_ip}", self.ip_rule)
+        if not allowed:
+            with self._lock:
+                self.rejected_ip += 1
+            return RateLimitDecision(False, self._retry_after(tokens, self.ip_rule), "ip")
+
+        allowed, tokens = self.backend.take(f"login:email:{email.strip().lower()}", self.email_rule)
+        if not allowed:
+            with self._lock:
+                self.rejected_email += 1
+            return RateLimitDecision(False, self._retry_after(tokens, self.email_rule), "email")
+
+        with self._lock:
+            self.allowed += 1
+        return RateLimitDecision(True)
+
+    async def check_async(self, client_ip: str, email: str) -> RateLimitDecision:
+        """check para rotas async: backends com I/O (banco) rodam numa thread."""
+        if self.backend.blocking:
+            return await asyncio.to_thread(self.check, client_ip, email)
+        return self.check(client_ip, email)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "allowed": self.allowed,
+                "rejected_ip": self.rejected_ip,
+                "rejected_email": self.rejected_email,
+            }
+
+
+def client_ip_from_request(request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def retry_after_header(decision: RateLimitDecision) -> str:
+    return str(max(1, math.ceil(decision.retry_after)))
+
+
+def _build_backend() -> RateLimitBackend:
+    if RATE_LIMIT_BACKEND == "database":
+        from backend.database.database import engine
+        return DatabaseRateLimitBackend(engine)
+    return InMemoryRateLimitBackend()
+
+
+# Instância global
+login_rate_limiter = LoginRateLimiter(
+    _build_backend(),
+    ip_rule=BucketRule(LOGIN_RATE_IP_BURST, LOGIN_RATE_IP_PER_MINUTE / 60.0),
+    email_rule=BucketRule(LOGIN_RATE_EMAIL_BURST, LOGIN_RATE_EMAIL_PER_MINUTE / 60.0),
+)
@@ -1,46 +1,144 @@
+import asyncio
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Union
 import bcrypt
 from jose import jwt, JWTError
 from dotenv import load_dotenv
+from backend.core.token_cache import verified_token_cache, token_digest
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+REFRESH_TOKEN_EXPIRE_HOURS = int(os.getenv("REFRESH_TOKEN_EXPIRE_HOURS", 12))
+
+# Custo do bcrypt para hashes novos; hashes com outro custo são refeitos no próximo login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# Quantos hashes/verificações rodam ao mesmo tempo (o bcrypt libera o GIL, então cada um ocupa um núcleo)
+PASSWORD_HASH_MAX_WORKERS = int(os.getenv("PASSWORD_HASH_MAX_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+# Quantas chamadas assíncronas podem aguardar na fila do executor antes de esperar no semáforo
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
 
 if SECRET_KEY is None:
     raise ValueError("Variável de ambiente SECRET_KEY não definida.")
 
 
 # ---------------- SENHA ----------------
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica se a senha em texto puro corresponde ao hash."""
+# O bcrypt nunca roda no event loop: todas as chamadas passam por este executor limitado,
+# então um pico de logins ocupa no máximo PASSWORD_HASH_MAX_WORKERS núcleos e não trava
+# websockets nem as demais requisições.
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_MAX_WORKERS, thread_name_prefix="bcrypt")
+_password_semaphore = asyncio.Semaphore(PASSWORD_HASH_MAX_PENDING)
+
+def _check_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         plain_password.encode('utf-8'),
         hashed_password.encode('utf-8')
     )
 
-def get_password_hash(password: str) -> str:
-    """Gera um hash bcrypt para a senha."""
-    salt = bcrypt.gensalt()
+def _hash_password(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifica se a senha em texto puro corresponde ao hash.
+    Versão síncrona, para rotas 'def' (threadpool): respeita o limite do executor.
+    """
+    return _password_executor.submit(_check_password, plain_password, hashed_password).result()
+
+def get_password_hash(password: str) -> str:
+    """Gera um hash bcrypt (custo BCRYPT_ROUNDS) para a senha. Versão síncrona."""
+    return _password_executor.submit(_hash_password, password).result()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifica a senha no executor, sem bloquear o event loop."""
+    async with _password_semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, _check_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Gera o hash no executor, sem bloquear o event loop."""
+    async with _password_semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, _hash_password, password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True se o hash foi gerado com custo diferente de BCRYPT_ROUNDS (formato $2b$<custo>$...)."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
 
 # ---------------- JWT ----------------
+def access_claims(user) -> dict:
+    """Claims de perfil embutidos no access token: as checagens de permissão dispensam o banco."""
+    return {
+        "sub": str(user.id),
+        "is_active": bool(user.is_active),
+        "is_admin": bool(user.is_admin),
+        "is_super_admin": bool(user.is_super_admin),
+    }
+
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    now = datetime.now(timezone.utc)
+    expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    to_encode.setdefault("type", "access")
+    # iat com fração de segundo (NumericDate aceita decimais): a revogação por usuário
+    # distingue tokens emitidos no mesmo segundo, antes e depois dela
+    to_encode.update({"exp": expire, "iat": now.timestamp(), "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token(user_id: int, expires_delta: Union[timedelta, None] = None) -> str:
+    """Refresh token: só identifica o usuário; os claims de perfil são relidos do banco a cada refresh."""
+    return create_access_token(
+        {"sub": str(user_id), "type": "refresh"},
+        expires_delta or timedelta(hours=REFRESH_TOKEN_EXPIRE_HOURS)
+    )
+
 def decode_access_token(token: str) -> dict:
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError as e:
-        raise ValueError("Token inválido ou expirado") from e
+    """
+    Verifica o token e retorna o payload. Tokens já verificados vêm do cache até o seu 'exp'.
+    Retorna sempre uma cópia, para que quem chama não altere o payload guardado.
+    """
+    digest = token_digest(token)
+    payload = verified_token_cache.get(digest)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError as e:
+            raise ValueError("Token inválido ou expirado") from e
+        verified_token_cache.set(digest, payload)
+    return dict(payload)
+
+
+# ---------------- COOKIES ----------------
+def set_access_cookie(response, access_token: str):
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,
+        max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        expires=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        secure=False,
+        samesite="lax"
+    )
+
+def set_refresh_cookie(response, refresh_token: str):
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        max_age=REFRESH_TOKEN_EXPIRE_HOURS * 3600,
+        expires=REFRESH_TOKEN_EXPIRE_HOURS * 3600,
+        secure=False,
+        samesite="lax"
+    )
@@ -0,0 +1,83 @@
+# backend/core/token_revocation.py
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenRevocationStore:
+    """
+    Revogações em memória consultadas a cada requisição, sem ir ao banco:
+    - jti revogados (logout, rotação do refresh token), guardados até o 'exp' do token;
+    - por usuário, um instante antes do qual os access tokens deixam de valer
+      (mudança de perfil, desativação ou exclusão). O cliente obtém um novo access
+      token, com os claims atuais, pelo refresh.
+
+    Com vários workers, cada revogação é repassada aos outros pelo pub/sub do websocket
+    ('publisher', ligado em ws_instance; exige WS_PUBSUB_BACKEND=postgres) e aplicada lá
+    com apply. Um worker que sobe depois de uma revogação não a conhece.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked_jtis: Dict[str, float] = {}
+        self._access_revoked_before: Dict[int, float] = {}
+        self._last_prune = time.time()
+        self.publisher: Optional[Callable[[dict], None]] = None
+
+    def _publish(self, event: dict):
+        if self.publisher is not None:
+            self.publisher(event)
+
+    def apply(self, event: dict):
+        """Aplica uma revogação recebida de outro worker (ou o eco da própria)."""
+        with self._lock:
+            if event.get("jti"):
+                self._revoked_jtis[event["jti"]] = float(event["exp"])
+            elif event.get("user_id") is not None:
+                user_id = int(event["user_id"])
+                before = float(event["before"])
+                self._access_revoked_before[user_id] = max(before, self._access_revoked_before.get(user_id, 0.0))
+
+    def _prune(self, now: float):
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        self._revoked_jtis = {jti: exp for jti, exp in self._revoked_jtis.items() if exp > now}
+
+    def revoke_token(self, payload: dict):
+        """Revoga um token específico (pelo jti) até a sua expiração."""
+        jti = payload.get("jti")
+        if not jti:
+            return
+        exp = float(payload.get("exp") or time.time() + 24 * 3600)
+        with self._lock:
+            self._revoked_jtis[jti] = exp
+        self._publish({"jti": jti, "exp": exp})
+
+    def revoke_access_tokens(self, user_id: int):
+        """Invalida todos os access tokens do usuário emitidos até agora."""
+        before = time.time()
+        with self._lock:
+            self._access_revoked_before[user_id] = before
+        self._publish({"user_id": user_id, "before": before})
+
+    def is_revoked(self, payload: dict) -> bool:
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            jti = payload.get("jti")
+            if jti and jti in self._revoked_jtis:
+                return True
+            if payload.get("type", "access") != "access":
+                return False
+            try:
+                revoked_before = self._access_revoked_before.get(int(payload.get("sub")))
+            except (TypeError, ValueError):
+                return True
+            # iat com fração de segundo; tokens antigos (iat inteiro) do mesmo segundo da
+            # revogação ficam revogados, o que só força um refresh a mais
+            return revoked_before is not None and float(payload.get("iat") or 0) < revoked_before
+
+
+# Instância global
+token_revocation = TokenRevocationStore()
@@ -1,41 +1,129 @@
-from fastapi import Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
-from backend.core.security import decode_access_token
+from typing import NamedTuple, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session, make_transient_to_detached
+from backend.core.security import decode_access_token, create_access_token, access_claims, set_access_cookie
+from backend.core.principal_cache import principal_cache, user_snapshot
+from backend.core.token_revocation import token_revocation
 from backend.database.database import get_db  # banco principal
 from backend.crud.user import get_user
 from backend.models.user import User
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+
+class Principal(NamedTuple):
+    """Identidade e perfil do usuário autenticado, lidos dos claims do access token."""
+    id: int
+    is_active: bool
+    is_admin: bool
+    is_super_admin: bool
+
+
+def _request_token(request: Request) -> Tuple[Optional[str], bool]:
+    """Retorna (token, veio_do_cookie)."""
     # Primeiro tenta do header Authorization
     auth_header = request.headers.get("Authorization")
     if auth_header and auth_header.startswith("Bearer "):
-        token = auth_header.split("Bearer ")[1]
-    else:
-        # Se não tiver no header, tenta dos cookies
-        token = request.cookies.get("access_token")
-    
-    if not token:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token ausente")
+        return auth_header.split("Bearer ")[1], False
+    # Se não tiver no header, tenta dos cookies
+    return request.cookies.get("access_token"), True
+
 
+def _valid_payload(token: Optional[str], token_type: str) -> Optional[dict]:
+    if not token:
+        return None
     try:
         payload = decode_access_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Token inválido")
+        int(payload.get("sub"))
     except Exception:
-        raise HTTPException(status_code=401, detail="Token inválido ou expirado")
+        return None
+    # Tokens antigos (sem 'type') são access tokens
+    if payload.get("type", "access") != token_type or token_revocation.is_revoked(payload):
+        return None
+    return payload
+
+
+def load_user(db: Session, user_id: int) -> Optional[User]:
+    """Usuário pelo id, via cache em processo (sem SELECT quando a entrada está válida)."""
+    snapshot = principal_cache.get(user_id)
+    if snapshot is not None:
+        # Reconstrói o usuário a partir do cache e o anexa à sessão da requisição sem SELECT;
+        # ele se comporta como se tivesse sido carregado (relacionamentos, edições e commit).
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
 
     user = get_user(db, user_id)
+    if user:
+        principal_cache.set(user_id, user_snapshot(user))
+    return user
+
+
+def _refresh_from_cookie(request: Request, response: Response, db: Session) -> Optional[dict]:
+    """
+    Sessão por cookie com access token vencido ou revogado: emite um novo a partir do
+    refresh_token (com os claims atuais do usuário) e o grava no cookie da resposta.
+    """
+    refresh_payload = _valid_payload(request.cookies.get("refresh_token"), "refresh")
+    if refresh_payload is None:
+        return None
+    user = load_user(db, int(refresh_payload["sub"]))
+    if not user or not user.is_active:
+        return None
+    access_token = create_access_token(access_claims(user))
+    set_access_cookie(response, access_token)
+    return decode_access_token(access_token)
+
+
+def get_current_principal(request: Request, response: Response, db: Session = Depends(get_db)) -> Principal:
+    """
+    Autentica a requisição só com o token: assinatura, expiração, revogação e claims de
+    perfil. Não consulta o banco, exceto para tokens antigos sem claims de perfil e na
+    renovação automática da sessão por cookie.
+    """
+    token, from_cookie = _request_token(request)
+    payload = _valid_payload(token, "access")
+    if payload is None and not from_cookie:
+        # Bearer vencido (o frontend guarda o token do login): recorre à sessão por cookie
+        payload = _valid_payload(request.cookies.get("access_token"), "access")
+    if payload is None:
+        payload = _refresh_from_cookie(request, response, db)
+
+    if payload is None:
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token ausente")
+        raise HTTPException(status_code=401, detail="Token inválido ou expirado")
+
+    user_id = int(payload["sub"])
+    if "is_admin" in payload:
+        principal = Principal(
+            id=user_id,
+            is_active=bool(payload.get("is_active", True)),
+            is_admin=bool(payload.get("is_admin")),
+            is_super_admin=bool(payload.get("is_super_admin")),
+        )
+    else:
+        user = load_user(db, user_id)
+        if not user:
+            raise HTTPException(status_code=401, detail="Usuário não encontrado ou inativo")
+        principal = Principal(user.id, bool(user.is_active), bool(user.is_admin), bool(user.is_super_admin))
+
+    if not principal.is_active:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado ou inativo")
+    return principal
+
+
+def get_current_user(principal: Principal = Depends(get_current_principal), db: Session = Depends(get_db)) -> User:
+    user = load_user(db, principal.id)
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Usuário não encontrado ou inativo")
     return user
 
-async def get_current_admin_user(current_user: User = Depends(get_current_user)):
-    if not (current_user.is_admin or current_user.is_super_admin):
+# As checagens de perfil usam os claims; o User só é carregado (via cache) se a permissão passar
+def get_current_admin_user(principal: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
+    if not (principal.is_admin or principal.is_super_admin):
         raise HTTPException(status_code=403, detail="Permissão insuficiente")
-    return current_user
+    return get_current_user(principal, db)
 
-async def get_current_super_admin_user(current_user: User = Depends(get_current_user)):
-    if not current_user.is_super_admin:
+def get_current_super_admin_user(principal: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
+    if not principal.is_super_admin:
         raise HTTPException(status_code=403, detail="Permissão insuficiente")
-    return current_user
+    return get_current_user(principal, db)
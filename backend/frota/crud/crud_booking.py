@@ -3,6 +3,7 @@ from datetime import datetime, timezone, timedelta
 
 from ..models.booking import Booking
 from ..models.vehicle import Vehicle
+from .crud_collection_version import bump_version, VEHICLES, BOOKINGS
 
 def create_checkout(db: Session, user_id:int, vehicle_id:int, purpose:str=None, observation:str=None, start_mileage:int=None, start_time: datetime = None):
     vehicle = db.query(Vehicle).filter(Vehicle.id == vehicle_id).with_for_update().first()
@@ -28,6 +29,7 @@ def create_checkout(db: Session, user_id:int, vehicle_id:int, purpose:str=None,
     # vehicle.status = "reserved"
     
     db.add(b)
+    bump_version(db, BOOKINGS)
     db.commit()
     db.refresh(b)
     
@@ -57,6 +59,7 @@ def create_schedule(db: Session, user_id:int, vehicle_id:int, start_time: dateti
     )
     
     db.add(b)
+    bump_version(db, BOOKINGS)
     db.commit()
     db.refresh(b)
     return b
@@ -96,6 +99,7 @@ def approve_booking(db: Session, booking_id:int, approver_id:int):
                 # Se falto muito tempo, mantém available (mas o sistema de conflito já impede outros agendamentos)
                 b.vehicle.status = "available"
 
+    bump_version(db, BOOKINGS, VEHICLES)
     db.commit()
     db.refresh(b)
     
@@ -127,6 +131,7 @@ def depart_booking(db: Session, booking_id: int, start_mileage: int):
     if b.vehicle:
         b.vehicle.status = "in-use"
         
+    bump_version(db, BOOKINGS, VEHICLES)
     db.commit()
     db.refresh(b)
     return b
@@ -140,6 +145,7 @@ def deny_booking(db: Session, booking_id:int):
     if b.vehicle:
         b.vehicle.status = "available"
     
+    bump_version(db, BOOKINGS, VEHICLES)
     db.commit()
     db.refresh(b)
     return b
@@ -156,6 +162,7 @@ def complete_return(db: Session, booking_id:int, end_mileage:int=None, parking_l
     if b.vehicle:
         b.vehicle.status = "available"
     
+    bump_version(db, BOOKINGS, VEHICLES)
     db.commit()
     db.refresh(b)
     return b
\ No newline at end of file
@@ -0,0 +1,32 @@
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from ..models.collection_version import CollectionVersion
+
+VEHICLES = "vehicles"
+BOOKINGS = "bookings"
+
+def bump_version(db: Session, *names: str):
+    """Incrementa a versão das coleções dentro da transação corrente (o commit fica com quem chamou)."""
+    db.query(CollectionVersion)\
+      .filter(CollectionVersion.name.in_(names))\
+      .update({CollectionVersion.version: CollectionVersion.version + 1}, synchronize_session=False)
+
+def bump_version_committed(*names: str):
+    """
+    Incrementa a versão numa transação própria do banco da frota, para escritas feitas em
+    outro banco que mudam o que as coleções embutem (ex.: o e-mail do usuário nas reservas).
+    """
+    db = SessionLocal()
+    try:
+        bump_version(db, *names)
+        db.commit()
+    finally:
+        db.close()
+
+def get_versions(db: Session, *names: str) -> dict:
+    """Lê as versões atuais das coleções em uma única consulta leve."""
+    rows = db.query(CollectionVersion.name, CollectionVersion.version)\
+             .filter(CollectionVersion.name.in_(names)).all()
+    versions = {name: 0 for name in names}
+    versions.update({name: version for name, version in rows})
+    return versions
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from ..models.vehicle import Vehicle, VehicleStatus # ADICIONADO VehicleStatus
 from ..models.booking import Booking
+from .crud_collection_version import bump_version, VEHICLES, BOOKINGS
 
 def get_vehicle(db: Session, vehicle_id: int):
     return db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
@@ -11,6 +12,7 @@ def get_vehicles(db: Session, skip: int = 0, limit: int = 100):
 def create_vehicle(db: Session, vehicle_data: dict):
     v = Vehicle(**vehicle_data)
     db.add(v)
+    bump_version(db, VEHICLES)
     db.commit()
     db.refresh(v)
     return v
@@ -21,6 +23,7 @@ def update_vehicle(db: Session, vehicle_id: int, vehicle_data: dict):
         return None
     for key, value in vehicle_data.items():
         setattr(v, key, value)
+    bump_version(db, VEHICLES, BOOKINGS)
     db.commit()
     db.refresh(v)
     return v
@@ -30,6 +33,7 @@ def update_vehicle_status(db: Session, vehicle_id: int, status: VehicleStatus):
     vehicle = get_vehicle(db, vehicle_id)
     if vehicle:
         vehicle.status = status
+        bump_version(db, VEHICLES, BOOKINGS)
         db.commit()
         db.refresh(vehicle)
     return vehicle
@@ -42,5 +46,6 @@ def delete_vehicle(db: Session, vehicle_id: int):
     db.query(Booking).filter(Booking.vehicle_id == vehicle_id).delete(synchronize_session=False)
 
     db.delete(v)
+    bump_version(db, VEHICLES, BOOKINGS)
     db.commit()
     return True
\ No newline at end of file
@@ -12,12 +12,35 @@ from backend.ticket.models.message import Message
 from backend.ticket.models.notification import Notification, NotificationType
 from backend.ticket.models.ticket import Ticket
 from backend.websocket.service.ws_instance import manager
+from backend.frota.services.vehicle_update_publisher import vehicle_update_publisher
 from backend.frota.database import get_db , SessionLocal as FleetSessionLocal 
 
 
-async def broadcast_vehicle_update():
-    """ Envia um sinal para TODOS os clientes conectados recarregarem a lista de veículos """
-    await manager.broadcast("vehicle_update", {"message": "Update vehicle list"})
+async def broadcast_vehicle_update(
+    vehicle_id: int = None,
+    status=None,
+    booking_id: int = None,
+    booking_status: str = None,
+    reload: bool = False
+):
+    """
+    Agenda um vehicle_update para os clientes inscritos em 'vehicles'. As chamadas de uma
+    mesma rajada são juntadas em um único evento com os ids e status alterados.
+    Sem argumentos, pede que os clientes recarreguem a lista.
+    """
+    if vehicle_id is None and booking_id is None:
+        reload = True
+    vehicle_update_publisher.queue(vehicle_id, status, booking_id, booking_status, reload)
+
+
+def vehicle_update_from_booking(booking: Booking) -> dict:
+    """Argumentos de broadcast_vehicle_update para uma reserva recém-alterada (lidos ainda na sessão)."""
+    return {
+        "vehicle_id": booking.vehicle_id,
+        "status": booking.vehicle.status if booking.vehicle else None,
+        "booking_id": booking.id,
+        "booking_status": booking.status,
+    }
 
 
 async def notify_frota_checkout_async(vehicle_id: int):
@@ -1,3 +1,4 @@
 from .vehicle import Vehicle
 from .booking import Booking
 from .fuel_supply import FuelSupply
+from .collection_version import CollectionVersion
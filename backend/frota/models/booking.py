@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Conflito de agendamento e status por veículo (vehicle_id, status, start_time)
+        Index("ix_bookings_vehicle_status_start", "vehicle_id", "status", "start_time"),
+        # Reservas do usuário, mais recentes primeiro
+        Index("ix_bookings_user_created", "user_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=False)
     user_id = Column(Integer, nullable=False)  # não relaciona mais com User diretamente
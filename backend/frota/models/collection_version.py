@@ -0,0 +1,12 @@
+# backend/frota/models/collection_version.py
+from sqlalchemy import Column, String, BigInteger
+from ..database import Base
+
+class CollectionVersion(Base):
+    """
+    Contador de versão por coleção ("vehicles", "bookings"), incrementado na mesma transação
+    de cada escrita. As rotas de listagem usam o valor para gerar o ETag sem carregar a coleção.
+    """
+    __tablename__ = "collection_versions"
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
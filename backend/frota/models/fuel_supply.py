@@ -1,12 +1,16 @@
 # backend/frota/models/fuel_supply.py
 import enum
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Enum as SQLAlchemyEnum, Boolean, Date, Time, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Enum as SQLAlchemyEnum, Boolean, Date, Time, Numeric, ForeignKey, Index
 from sqlalchemy.sql import func
 from ..database import Base
 from sqlalchemy.orm import relationship
 
 class FuelSupply(Base):
     __tablename__ = "fuel_supplies"
+    __table_args__ = (
+        Index("ix_fuel_supplies_vehicle_id", "vehicle_id"),
+        Index("ix_fuel_supplies_user_id", "user_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
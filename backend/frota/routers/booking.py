@@ -1,12 +1,13 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
-from backend.frota.events.notification import notify_frota_approve_async, notify_frota_checkout_async, notify_frota_deny_async, notify_frota_return_async, notify_frota_schedule_async, broadcast_vehicle_update
+from backend.frota.events.notification import notify_frota_approve_async, notify_frota_checkout_async, notify_frota_deny_async, notify_frota_return_async, notify_frota_schedule_async, broadcast_vehicle_update, vehicle_update_from_booking
 # --- Imports do Módulo Frota ---
 from ..crud.crud_booking import (
     create_checkout, create_schedule,    approve_booking, depart_booking, deny_booking,
     complete_return, get_booking, get_all_bookings, get_bookings_by_user
 )
+from ..crud.crud_collection_version import get_versions, VEHICLES, BOOKINGS
 from ..schemas.booking import BookingCheckout, BookingSchedule, BookingRead, BookingDepart
 # Import padronizado para a base da frota
 from ..database import get_db as get_frota_db
@@ -17,20 +18,34 @@ from backend.database.database import get_db as get_global_db
 from backend.crud.user import get_user, get_users_by_ids
 from backend.models.user import User as UserModel
 from ..crud import cnh as cnh_crud
+from backend.core.http_cache import make_etag, is_not_modified, not_modified
 
 router = APIRouter(
     prefix="", # 💡 CORREÇÃO: Mude de "/" para "" (string vazia)
     # tags=... (outras configurações)
 )
 
+def _bookings_etag(frota_db: Session, scope: str) -> str:
+    """ETag das listagens de reservas: versões de reservas e veículos (embutidos na resposta) + escopo."""
+    versions = get_versions(frota_db, BOOKINGS, VEHICLES)
+    return make_etag(BOOKINGS, scope, versions[BOOKINGS], versions[VEHICLES])
+
 @router.get("/", response_model=List[BookingRead])
 def list_bookings(
+    request: Request,
+    response: Response,
     frota_db: Session = Depends(get_frota_db),
     global_db: Session = Depends(get_global_db),
     current_user: UserModel = Depends(get_current_user)
 ):
+    is_admin = current_user.is_admin or current_user.is_super_admin
+    etag = _bookings_etag(frota_db, "all" if is_admin else f"user:{current_user.id}")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     # ✅ CORRIGIDO: Super admins também veem todas as reservas
-    if current_user.is_admin or current_user.is_super_admin:
+    if is_admin:
         bookings = get_all_bookings(frota_db)
     else:
         bookings = get_bookings_by_user(frota_db, user_id=current_user.id)
@@ -50,10 +65,17 @@ def list_bookings(
 
 @router.get("/me", response_model=List[BookingRead])
 def list_my_bookings(
+    request: Request,
+    response: Response,
     frota_db: Session = Depends(get_frota_db),
     global_db: Session = Depends(get_global_db),
     current_user: UserModel = Depends(get_current_user)
 ):
+    etag = _bookings_etag(frota_db, f"user:{current_user.id}")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     bookings = get_bookings_by_user(frota_db, user_id=current_user.id)
     if not bookings:
         return []
@@ -135,7 +157,7 @@ def approve(
     # RETORNO CORRIGIDO
      
     background_tasks.add_task(notify_frota_approve_async, booking)
-    background_tasks.add_task(broadcast_vehicle_update)
+    background_tasks.add_task(broadcast_vehicle_update, **vehicle_update_from_booking(booking))
     return booking
 
 @router.patch("/{booking_id}/deny", response_model=BookingRead)
@@ -162,7 +184,7 @@ def deny(
     booking.user = get_user(global_db, booking.user_id)
     # RETORNO CORRIGIDO
     background_tasks.add_task(notify_frota_deny_async, booking)
-    background_tasks.add_task(broadcast_vehicle_update)
+    background_tasks.add_task(broadcast_vehicle_update, **vehicle_update_from_booking(booking))
     return booking
 
 @router.post("/{booking_id}/depart", response_model=BookingRead)
@@ -184,7 +206,7 @@ def depart(
     try:
         updated_booking = depart_booking(frota_db, booking_id, payload.start_mileage)
         updated_booking.user = get_user(global_db, updated_booking.user_id)
-        background_tasks.add_task(broadcast_vehicle_update)
+        background_tasks.add_task(broadcast_vehicle_update, **vehicle_update_from_booking(updated_booking))
         return updated_booking
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -222,6 +244,6 @@ def do_return(
     booking.user = get_user(global_db, booking.user_id)
     # RETORNO CORRIGIDO
     background_tasks.add_task(notify_frota_return_async, booking)
-    background_tasks.add_task(broadcast_vehicle_update)
+    background_tasks.add_task(broadcast_vehicle_update, **vehicle_update_from_booking(booking))
     return booking
  
\ No newline at end of file
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from ..crud import crud_vehicle
+from ..crud.crud_collection_version import get_versions, VEHICLES
 from ..schemas import vehicle as vehicle_schema
 from ..database import get_db
 from backend.dependencies import get_current_user
 from ..models.vehicle import VehicleStatus
 from backend.frota.events.notification import broadcast_vehicle_update
+from backend.core.http_cache import make_etag, is_not_modified, not_modified
 
 router = APIRouter(
     prefix="", # 🚨 CORREÇÃO CRÍTICA: AGORA ESTÁ VAZIO ("")
@@ -22,7 +24,12 @@ class VehicleStatusUpdate(BaseModel):
 # 🚨 CORREÇÃO: O endpoint de listagem agora é "" (vazio).
 # Rota final: /api/frota/vehicles
 @router.get("", response_model=list[vehicle_schema.VehicleRead])
-def list_vehicles(db: Session = Depends(get_db)):
+def list_vehicles(request: Request, response: Response, db: Session = Depends(get_db)):
+    # GET condicional: a versão da coleção decide o 304 sem carregar os veículos
+    etag = make_etag(VEHICLES, get_versions(db, VEHICLES)[VEHICLES])
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return crud_vehicle.get_vehicles(db)
 
 @router.get("/{vehicle_id}", response_model=vehicle_schema.VehicleRead)
@@ -55,7 +62,8 @@ def update_one_vehicle(
     if not v:
         raise HTTPException(status_code=404, detail="Veículo não encontrado")
     
-    background_tasks.add_task(broadcast_vehicle_update)
+    # Edição de cadastro: os clientes recarregam a lista
+    background_tasks.add_task(broadcast_vehicle_update, v.id, v.status, reload=True)
     return v
 
 # --- ADICIONADO: Nova rota para alterar o status ---
@@ -74,7 +82,7 @@ def update_status(
     if not vehicle:
         raise HTTPException(status_code=404, detail="Veículo não encontrado para atualizar status")
     
-    background_tasks.add_task(broadcast_vehicle_update)
+    background_tasks.add_task(broadcast_vehicle_update, vehicle.id, vehicle.status)
     return vehicle
 
 @router.delete("/{vehicle_id}", status_code=200)
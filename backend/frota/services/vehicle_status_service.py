@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from ..models.booking import Booking
 from ..models.vehicle import Vehicle, VehicleStatus
 from ..database import SessionLocal
+from ..crud.crud_collection_version import bump_version, VEHICLES, BOOKINGS
+from .vehicle_update_publisher import vehicle_update_publisher
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,7 +50,9 @@ class VehicleStatusService:
                 if active_booking:
                     if v.status != VehicleStatus.in_use:
                         v.status = VehicleStatus.in_use
+                        bump_version(db, VEHICLES, BOOKINGS)
                         db.commit()
+                        vehicle_update_publisher.queue(v.id, VehicleStatus.in_use)
                     continue
 
                 # 2. Verificar se há algum booking 'confirmed' que deve entrar em 'in-use'
@@ -75,7 +79,9 @@ class VehicleStatusService:
                 if v.status != new_status:
                     logger.info(f"🔄 Atualizando status do veículo {v.name} ({v.license_plate}): {v.status} -> {new_status}")
                     v.status = new_status
+                    bump_version(db, VEHICLES, BOOKINGS)
                     db.commit()
+                    vehicle_update_publisher.queue(v.id, new_status)
                     
         except Exception as e:
             logger.error(f"❌ Erro ao atualizar statuses: {e}")
@@ -0,0 +1,67 @@
+# backend/frota/services/vehicle_update_publisher.py
+import asyncio
+import os
+from typing import Optional
+from backend.websocket.service.topics import TOPIC_VEHICLES
+from backend.websocket.service.ws_instance import manager
+
+# Janela em que as mudanças de veículos/reservas são juntadas em um único vehicle_update
+VEHICLE_UPDATE_WINDOW_SECONDS = float(os.getenv("VEHICLE_UPDATE_WINDOW_SECONDS", 0.5))
+
+
+def _status_value(status) -> Optional[str]:
+    return getattr(status, "value", status)
+
+
+class VehicleUpdatePublisher:
+    """
+    Junta as mudanças de uma rajada (aprovar, negar, saída, devolução, edição, status)
+    e publica um único vehicle_update no tópico 'vehicles', com o novo status de cada
+    veículo/reserva alterado. O cliente corrige o estado local e só recarrega a lista
+    quando 'reload' vier true (edição de cadastro) ou quando não conhecer um id.
+    """
+
+    def __init__(self):
+        self._vehicles: dict[int, Optional[str]] = {}
+        self._bookings: dict[int, dict] = {}
+        self._reload = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.merged = 0
+
+    def queue(
+        self,
+        vehicle_id: Optional[int] = None,
+        status=None,
+        booking_id: Optional[int] = None,
+        booking_status: Optional[str] = None,
+        reload: bool = False
+    ):
+        """Registra uma mudança; precisa ser chamado no event loop."""
+        if vehicle_id is not None and status is not None:
+            self._vehicles[vehicle_id] = _status_value(status)
+        if booking_id is not None:
+            self._bookings[booking_id] = {"id": booking_id, "vehicle_id": vehicle_id, "status": booking_status}
+        self._reload = self._reload or reload
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+        else:
+            self.merged += 1
+
+    async def _flush_later(self):
+        await asyncio.sleep(VEHICLE_UPDATE_WINDOW_SECONDS)
+        vehicles, bookings, reload = self._vehicles, self._bookings, self._reload
+        self._vehicles, self._bookings, self._reload = {}, {}, False
+
+        self.published += 1
+        await manager.publish(TOPIC_VEHICLES, "vehicle_update", {
+            "message": "Update vehicle list",
+            "vehicles": [{"id": vehicle_id, "status": status} for vehicle_id, status in vehicles.items()],
+            "bookings": list(bookings.values()),
+            "reload": reload,
+        })
+
+
+# Instância global
+vehicle_update_publisher = VehicleUpdatePublisher()
@@ -1,33 +1,36 @@
 import asyncio
-from fastapi import FastAPI, APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, APIRouter, Body, Depends, WebSocket, WebSocketDisconnect
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
-from backend.frota.database import engine as frota_engine
-from backend.frota.models import vehicle, booking, cnh, fuel_supply
+from typing import List, Optional
 from backend.ticket.routers.auth_router import router as auth_router
-from backend.ticket.routers import users_router, tickets_router, messages_router, notification_router
+from backend.ticket.routers import users_router, tickets_router, messages_router, notification_router, reports_router
 from backend.frota.routers.vehicle import router as frota_vehicles_router
 from backend.frota.routers.booking import router as frota_bookings_router
 from backend.frota.routers.upload import router as frota_upload_router
 from backend.frota.routers import user_cnh
-from backend.websocket.service.settings import get_online_users_data, get_system_stats
 from backend.websocket.service.ws_instance import manager
+from backend.websocket.service.system_stats_stream import system_stats_stream
+from backend.websocket.service.heartbeat import heartbeat_service
+from backend.websocket.service import loadtest as ws_loadtest
+from backend.dependencies import get_current_super_admin_user
 from backend.frota.routers.fuel_supply import router as frota_fuel_supplies_router
 from backend.frota.services.fuel_reminder_service import fuel_reminder_service
 from backend.frota.services.vehicle_status_service import vehicle_status_service
+from backend.ticket.services.ticket_projections import ticket_projector
+from backend.migrations import run_principal_migrations, run_frota_migrations
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Application startup event triggered.")
-    print("🔧 Criando tabelas da Frota...")
+    print("🔧 Aplicando migrações dos bancos...")
 
-    vehicle.Base.metadata.create_all(bind=frota_engine)
-    booking.Base.metadata.create_all(bind=frota_engine)
-    cnh.Base.metadata.create_all(bind=frota_engine)
-    fuel_supply.Base.metadata.create_all(bind=frota_engine)
+    run_principal_migrations()
+    print("✅ Banco de dados principal atualizado.")
 
+    run_frota_migrations()
     print("✅ Banco de dados da Frota configurado com sucesso.")
 
     # 🔁 Inicia scheduler de abastecimento
@@ -36,9 +39,16 @@ async def lifespan(app: FastAPI):
     )
     print("⛽ Agendador de notificações de abastecimento iniciado")
 
-    # 📡 Inicia broadcast do websocket
-    broadcast_task = asyncio.create_task(broadcast_system_stats())
-    print("📡 Broadcast de system stats iniciado")
+    # 🔀 Pub/sub do websocket (entrega entre workers)
+    await manager.start()
+    print(f"🔀 Pub/sub do websocket: {type(manager.pubsub).__name__}")
+
+    # 📡 Inicia o stream de system stats (só amostra enquanto houver assinantes)
+    broadcast_task = asyncio.create_task(system_stats_stream.start_scheduler())
+    print("📡 Stream de system stats iniciado")
+
+    # 💓 Pings e remoção de conexões websocket mortas
+    heartbeat_task = asyncio.create_task(heartbeat_service.start_scheduler())
 
     # 🚗 Inicia scheduler de status de veículos
     status_task = asyncio.create_task(
@@ -46,6 +56,12 @@ async def lifespan(app: FastAPI):
     )
     print("🚗 Agendador de status de veículos iniciado")
 
+    # 📊 Inicia projetor dos relatórios de tickets (consome ticket_events)
+    projector_task = asyncio.create_task(
+        ticket_projector.start_scheduler()
+    )
+    print("📊 Projetor de relatórios de tickets iniciado")
+
     # 🔥 APLICAÇÃO RODANDO
     yield
 
@@ -55,7 +71,14 @@ async def lifespan(app: FastAPI):
     fuel_reminder_service.stop()
     scheduler_task.cancel()
 
+    ticket_projector.stop()
+    projector_task.cancel()
+
+    system_stats_stream.stop()
     broadcast_task.cancel()
+    heartbeat_service.stop()
+    heartbeat_task.cancel()
+    await manager.pubsub.stop()
     status_task.cancel()
     try:
         await broadcast_task
@@ -65,17 +88,6 @@ async def lifespan(app: FastAPI):
 
     print("✅ Lifespan finalizado com sucesso")
 
-async def broadcast_system_stats():
-    while True:
-        stats = get_system_stats()
-        users = await get_online_users_data()
-        stats["connections"] = sum(len(conns) for conns in manager.active_connections.values())
-        await manager.broadcast("system_stats", {
-            "server_stats": stats,
-            "users_stats": users
-        })
-        await asyncio.sleep(2)
-
 app = FastAPI(
     title="Sistema Integrado de Gestão",
     description="API para gerenciamento de tickets e frota de veículos.",
@@ -133,6 +145,7 @@ api_router.include_router(auth_router, prefix="/auth", tags=["Auth"])
 
 ticket_api_router = APIRouter(prefix="/ticket")
 ticket_api_router.include_router(users_router, tags=["Ticket - Users"])
+ticket_api_router.include_router(reports_router, tags=["Ticket - Relatórios"])
 ticket_api_router.include_router(tickets_router, tags=["Ticket - Tickets"])
 ticket_api_router.include_router(messages_router, tags=["Ticket - Msgs"])
 ticket_api_router.include_router(notification_router, tags=["Ticket - Notifications"])
@@ -146,6 +159,24 @@ frota_api_router.include_router(frota_fuel_supplies_router, tags=["Frota - Abast
 frota_api_router.include_router(user_cnh.router, prefix="/admin/users/cnh", tags=["Frota - Admin CNH"])
 api_router.include_router(frota_api_router)
 
+# Métricas das filas de saída do websocket
+@api_router.get("/ws/stats", tags=["WebSocket"])
+async def websocket_queue_stats(current_user = Depends(get_current_super_admin_user)):
+    return {**manager.queue_stats(), "pubsub": manager.pubsub.stats(), "heartbeat": heartbeat_service.stats()}
+
+# Apoio ao teste de carga do websocket (benchmarks/ws_loadtest.py); só com WS_LOADTEST_ENABLED=true
+if ws_loadtest.WS_LOADTEST_ENABLED:
+    @api_router.post("/ws/loadtest/publish", tags=["WebSocket"])
+    async def websocket_loadtest_publish(
+        mode: str = "broadcast", seq: int = 0, size: int = 256, user_ids: Optional[List[int]] = Body(default=None),
+        current_user = Depends(get_current_super_admin_user)
+    ):
+        return await ws_loadtest.publish_load(mode, user_ids or [], seq, size)
+
+    @api_router.get("/ws/loadtest/probe", tags=["WebSocket"])
+    async def websocket_loadtest_probe(seconds: float = 1.0, current_user = Depends(get_current_super_admin_user)):
+        return await ws_loadtest.probe_server(min(seconds, 10.0))
+
 app.include_router(api_router)
 
 @app.websocket("/ws")
@@ -168,11 +199,15 @@ async def websocket_endpoint(websocket: WebSocket, token: str = None):
         await websocket.close(code=1008)
         return
 
-    await manager.connect(websocket, token)
+    # Codificação dos frames enviados: json (padrão) ou msgpack
+    await manager.connect(websocket, token, websocket.query_params.get("encoding"))
     try:
         while True:
             data = await websocket.receive_text()
-            print("📩 Mensagem recebida:", data)
+            # Sem log por mensagem: cada conexão manda um pong a cada intervalo do heartbeat
+            manager.touch(websocket)
+            # subscribe/unsubscribe de tópicos
+            await manager.handle_client_message(websocket, data)
             # await manager.broadcast(f"Echo: {data}")
     except WebSocketDisconnect:
         manager.disconnect(websocket)
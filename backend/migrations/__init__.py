@@ -0,0 +1,3 @@
+from .runner import Migration, run_migrations
+from .principal import run_principal_migrations
+from .frota import run_frota_migrations
@@ -0,0 +1,125 @@
+# backend/migrations/explain_check.py
+"""
+Verifica, via EXPLAIN, se as consultas quentes usam os índices criados pelas migrações.
+
+Uso (com os bancos já migrados):
+    python -m backend.migrations.explain_check
+
+No PostgreSQL o seq scan é desabilitado durante o EXPLAIN (SET LOCAL enable_seqscan = off):
+com tabelas pequenas o planejador preferiria ler a tabela inteira, e o que interessa aqui é
+provar que existe um índice capaz de atender cada consulta.
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query, Session
+from backend.database.database import engine as principal_engine
+from backend.frota.database import engine as frota_engine
+from backend.ticket.models.ticket import Ticket, TicketStatus
+from backend.ticket.models.notification import Notification
+from backend.frota.models.booking import Booking
+from backend.frota.models.fuel_supply import FuelSupply
+from backend.ticket.crud import ticket as crud_ticket
+
+_NOW = datetime.now(timezone.utc)
+# Cursor de uma página intermediária, como o cliente devolve em ?cursor=
+_CURSOR = crud_ticket._encode_cursor(SimpleNamespace(id=1000, created_at=_NOW))
+
+
+def _ticket_page(cursor=None, **filters):
+    """Página de listagem montada pelo crud (filtros, seek, ordenação e limite), como a API envia."""
+    return lambda db: crud_ticket._page_query(crud_ticket._list_query(db, **filters), 0, 10, cursor, view="summary")
+
+
+# (banco, descrição, consulta, índices aceitos). A consulta pode ser uma função que recebe
+# a sessão e monta a Query pelo mesmo caminho do crud.
+CHECKS = [
+    ("principal", "tickets: listagem geral (cursor)",
+     _ticket_page(include_closed=False),
+     {"ix_tickets_created_at_id", "ix_tickets_status_created_at"}),
+    ("principal", "tickets: página seguinte (cursor)",
+     _ticket_page(_CURSOR, include_closed=False),
+     {"ix_tickets_created_at_id"}),
+    ("principal", "tickets: meus chamados",
+     _ticket_page(status_values=[TicketStatus.open.value], requester_id=1),
+     {"ix_tickets_requester_created_at"}),
+    ("principal", "tickets: atribuídos a mim ou sem técnico",
+     _ticket_page(include_closed=False, assigned_or_unassigned_to=1),
+     {"ix_tickets_assignee_status", "ix_tickets_created_at_id"}),
+    ("principal", "tickets: estatística por status",
+     select(func.count(Ticket.id)).where(Ticket.status == TicketStatus.open.value),
+     {"ix_tickets_status_created_at"}),
+    ("principal", "tickets: estatística por técnico",
+     select(func.count(Ticket.id)).where(Ticket.assignee_id == 1, Ticket.status == TicketStatus.closed.value),
+     {"ix_tickets_assignee_status"}),
+    ("principal", "notificações não lidas",
+     select(Notification.id).where(Notification.user_id == 1, Notification.is_read == False)
+     .order_by(Notification.created_at.desc()),
+     {"ix_notifications_user_is_read"}),
+    ("frota", "reservas: conflito de agendamento",
+     select(Booking.id).where(
+         Booking.vehicle_id == 1,
+         Booking.status.in_(["pending", "confirmed", "in-use"]),
+         Booking.start_time < _NOW + timedelta(hours=2),
+         Booking.end_time > _NOW,
+     ).limit(1),
+     {"ix_bookings_vehicle_status_start"}),
+    ("frota", "reservas: minhas reservas",
+     select(Booking.id).where(Booking.user_id == 1).order_by(Booking.created_at.desc()),
+     {"ix_bookings_user_created"}),
+    ("frota", "abastecimentos por veículo",
+     select(FuelSupply.id).where(FuelSupply.vehicle_id == 1),
+     {"ix_fuel_supplies_vehicle_id"}),
+    ("frota", "abastecimentos por usuário",
+     select(FuelSupply.id).where(FuelSupply.user_id == 1),
+     {"ix_fuel_supplies_user_id"}),
+]
+
+
+def explain(engine: Engine, stmt) -> str:
+    """Retorna o plano da consulta como texto."""
+    if isinstance(stmt, Query):
+        stmt = stmt.statement
+    # render_postcompile expande os IN (...) em parâmetros comuns; sem isso o SQL fica com
+    # __[POSTCOMPILE_x] e o banco o rejeita
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    sql = str(compiled)
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            rows = conn.exec_driver_sql("EXPLAIN " + sql, params).fetchall()
+            plan = "\n".join(row[0] for row in rows)
+        else:
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+            plan = "\n".join(str(row[-1]) for row in rows)
+        conn.rollback()
+    return plan
+
+
+def run_checks() -> bool:
+    engines = {"principal": principal_engine, "frota": frota_engine}
+    all_ok = True
+    for db_name, description, stmt, expected in CHECKS:
+        if callable(stmt):
+            with Session(engines[db_name]) as db:
+                stmt = stmt(db)
+        plan = explain(engines[db_name], stmt)
+        used = sorted(index for index in expected if index in plan)
+        if used:
+            print(f"✅ [{db_name}] {description}: usa {', '.join(used)}")
+        else:
+            all_ok = False
+            print(f"❌ [{db_name}] {description}: nenhum índice esperado ({', '.join(sorted(expected))})")
+            print("   " + plan.replace("\n", "\n   "))
+    return all_ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
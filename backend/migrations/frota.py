@@ -0,0 +1,39 @@
+# backend/migrations/frota.py
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from backend.frota.database import Base, engine
+from backend.frota.models.vehicle import Vehicle
+from backend.frota.models.booking import Booking
+from backend.frota.models.fuel_supply import FuelSupply
+from backend.frota.models.cnh import CnhInfoModel
+from backend.frota.models.collection_version import CollectionVersion
+from .runner import Migration, create_indexes, run_migrations
+
+
+def _baseline(conn: Connection):
+    Base.metadata.create_all(bind=conn)
+    # CnhInfoModel usa a Base principal, mas a tabela fica no banco da frota
+    CnhInfoModel.__table__.create(bind=conn, checkfirst=True)
+
+
+def _hot_path_indexes(conn: Connection):
+    create_indexes(conn, Booking.__table__, FuelSupply.__table__)
+
+
+def _collection_versions(conn: Connection):
+    CollectionVersion.__table__.create(bind=conn, checkfirst=True)
+    for name in ("vehicles", "bookings"):
+        exists = conn.execute(text("SELECT 1 FROM collection_versions WHERE name = :name"), {"name": name}).first()
+        if not exists:
+            conn.execute(text("INSERT INTO collection_versions (name, version) VALUES (:name, 0)"), {"name": name})
+
+
+MIGRATIONS = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "hot_path_indexes", _hot_path_indexes),
+    Migration(3, "collection_versions", _collection_versions),
+]
+
+
+def run_frota_migrations():
+    run_migrations(engine, MIGRATIONS, label="frota")
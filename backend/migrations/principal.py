@@ -0,0 +1,73 @@
+# backend/migrations/principal.py
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from backend.database.database import Base, engine
+from backend.models.user import User
+from backend.ticket.models.ticket import Ticket
+from backend.ticket.models.message import Message
+from backend.ticket.models.notification import Notification
+from backend.ticket.models.ticket_event import (
+    TicketEvent, ProjectionOffset, TechnicianWorkload, DailyTicketCount, TicketAcceptTime,
+)
+from backend.ticket.crud.search import ensure_search_index
+from .runner import Migration, create_indexes, run_migrations
+
+# Tabelas do banco principal (cnh_info compartilha a Base, mas vive no banco da frota)
+PRINCIPAL_TABLES = [User.__table__, Ticket.__table__, Message.__table__, Notification.__table__]
+
+
+def _baseline(conn: Connection):
+    Base.metadata.create_all(bind=conn, tables=PRINCIPAL_TABLES)
+
+
+def _hot_path_indexes(conn: Connection):
+    create_indexes(conn, Ticket.__table__, Notification.__table__)
+
+
+def _ticket_events(conn: Connection):
+    """
+    Cria o fluxo de eventos e as tabelas de projeção. Os tickets existentes entram como
+    eventos 'created' com o status e o técnico atuais, para que as projeções partam do
+    estado real; o histórico anterior (aceites e fechamentos passados) não é reconstruído.
+    """
+    Base.metadata.create_all(bind=conn, tables=[
+        TicketEvent.__table__, ProjectionOffset.__table__, TechnicianWorkload.__table__,
+        DailyTicketCount.__table__, TicketAcceptTime.__table__,
+    ])
+    conn.execute(text("""
+        INSERT INTO ticket_events (ticket_id, event_type, requester_id, to_status, to_assignee_id, created_at)
+        SELECT t.id, 'created', t.requester_id, t.status, t.assignee_id, coalesce(t.created_at, CURRENT_TIMESTAMP)
+        FROM tickets t
+        WHERE NOT EXISTS (SELECT 1 FROM ticket_events e WHERE e.ticket_id = t.id)
+        ORDER BY t.id
+    """))
+
+
+def _rate_limit_buckets(conn: Connection):
+    """Baldes do limitador de login compartilhado entre workers (RATE_LIMIT_BACKEND=database)."""
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+            key VARCHAR(255) PRIMARY KEY,
+            tokens DOUBLE PRECISION NOT NULL,
+            updated_at DOUBLE PRECISION NOT NULL,
+            allowed BOOLEAN NOT NULL DEFAULT TRUE
+        )
+    """))
+
+
+def _requester_created_at_index(conn: Connection):
+    create_indexes(conn, Ticket.__table__)
+
+
+MIGRATIONS = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "hot_path_indexes", _hot_path_indexes),
+    Migration(3, "ticket_search", ensure_search_index),
+    Migration(4, "ticket_events", _ticket_events),
+    Migration(5, "rate_limit_buckets", _rate_limit_buckets),
+    Migration(6, "ticket_requester_created_at_index", _requester_created_at_index),
+]
+
+
+def run_principal_migrations():
+    run_migrations(engine, MIGRATIONS, label="principal")
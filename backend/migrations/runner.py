@@ -0,0 +1,76 @@
+# backend/migrations/runner.py
+import zlib
+from datetime import datetime, timezone
+from typing import Callable, List
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+
+class Migration:
+    """Uma etapa versionada do schema. 'upgrade' recebe a conexão já dentro da transação."""
+
+    def __init__(self, version: int, name: str, upgrade: Callable[[Connection], None]):
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+
+    def __repr__(self):
+        return f"<Migration({self.version}, '{self.name}')>"
+
+
+def create_indexes(conn: Connection, *tables):
+    """Cria (se ainda não existirem) todos os índices declarados nos modelos das tabelas informadas."""
+    for table in tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+def run_migrations(engine: Engine, migrations: List[Migration], label: str):
+    """
+    Aplica, em ordem, as migrações ainda não registradas na tabela schema_migrations_<label>
+    do banco (uma por conjunto: principal e frota podem até compartilhar o mesmo banco).
+    A antiga tabela única schema_migrations não é lida: com versões repetidas entre os
+    conjuntos ela não diz a qual pertence cada linha. Na primeira execução com a tabela nova
+    as migrações rodam de novo, e todas são idempotentes (checkfirst / IF NOT EXISTS).
+    Cada migração roda na sua própria transação. No PostgreSQL um advisory lock impede que
+    vários workers subindo ao mesmo tempo apliquem a mesma migração em paralelo.
+    """
+    if not label.isidentifier():
+        raise ValueError(f"Rótulo de migrações inválido: {label!r}")
+    table = f"schema_migrations_{label}"
+    is_postgres = engine.dialect.name == "postgresql"
+    lock_key = zlib.crc32(f"schema_migrations:{label}".encode("utf-8"))
+
+    with engine.connect() as conn:
+        if is_postgres:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": lock_key})
+            conn.commit()
+        try:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    version INTEGER PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    applied_at TIMESTAMP NOT NULL
+                )
+            """))
+            applied = set(conn.execute(text(f"SELECT version FROM {table}")).scalars())
+            conn.commit()
+
+            for migration in sorted(migrations, key=lambda m: m.version):
+                if migration.version in applied:
+                    continue
+                print(f"🔧 [{label}] Aplicando migração {migration.version:03d}_{migration.name}...")
+                try:
+                    migration.upgrade(conn)
+                    conn.execute(
+                        text(f"INSERT INTO {table} (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+                        {"version": migration.version, "name": migration.name, "applied_at": datetime.now(timezone.utc)}
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+        finally:
+            if is_postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": lock_key})
+                conn.commit()
@@ -2,6 +2,7 @@
 import asyncio
 from sqlalchemy.orm import Session
 from backend.ticket.events.notification import notify_message_sent
+from backend.ticket.crud import search as ticket_search
 from backend.ticket.models.message import Message
 from backend.ticket.models.ticket import Ticket # Para verificar se o ticket existe
 from backend.models.user import User
@@ -52,6 +53,7 @@ def create_message(db: Session, message: MessageCreate):
         sent_at=datetime.now() # Garante que a data é definida no momento da criação
     )
     db.add(db_message)
+    ticket_search.index_message(db, ticket_id=db_message.ticket_id, content=db_message.content)
     db.commit()
     db.refresh(db_message)
 
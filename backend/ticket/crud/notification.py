@@ -8,8 +8,13 @@ def create_notification(
     user_id: int,
     ticket_id: int,
     message: Optional[str] = None,
-    notif_type: NotificationType = NotificationType.ticket_created
+    notif_type: NotificationType = NotificationType.ticket_created,
+    commit: bool = True
 ) -> Notification:
+    """
+    Com commit=False a notificação entra na transação de quem chamou (só o flush,
+    para preencher o id) e o commit fica por conta dele.
+    """
     new_notification = Notification(
         user_id=user_id,
         ticket_id=ticket_id,
@@ -17,10 +22,24 @@ def create_notification(
         notification_type=notif_type
     )
     db.add(new_notification)
+    if not commit:
+        db.flush()
+        return new_notification
     db.commit()
     db.refresh(new_notification)
     return new_notification
 
+def create_notifications_bulk(db: Session, notifications: List[dict]) -> List[Notification]:
+    """
+    Cria várias notificações de uma vez (cada dict com os campos de Notification).
+    Não faz commit: as notificações entram na transação de quem chamou. O flush
+    apenas preenche os ids para o envio via websocket.
+    """
+    new_notifications = [Notification(**data) for data in notifications]
+    db.add_all(new_notifications)
+    db.flush()
+    return new_notifications
+
 def create_notification_frota(
     db: Session,
     user_id: int,
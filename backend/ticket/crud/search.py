@@ -0,0 +1,195 @@
+# backend/ticket/crud/search.py
+import base64
+import json
+import os
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import Float, Integer, and_, or_, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, joinedload
+from fastapi import HTTPException
+from backend.ticket.models.ticket import Ticket
+from backend.models.user import User
+
+# Configuração de idioma do PostgreSQL usada em to_tsvector / websearch_to_tsquery
+SEARCH_TEXT_CONFIG = os.getenv("TICKET_SEARCH_LANGUAGE", "portuguese")
+
+# O índice de busca vive em uma tabela própria ("ticket_search"):
+# - PostgreSQL: coluna tsvector com índice GIN, pesos A (título), B (descrição) e C (mensagens);
+# - SQLite (perfil de desenvolvimento sql_app.db): tabela virtual FTS5 com rowid = ticket_id.
+# Ela é mantida pelas funções de escrita de tickets e mensagens na mesma transação.
+
+_PG_DOCUMENT = """
+    setweight(to_tsvector(CAST(:cfg AS regconfig), coalesce(t.title, '')), 'A') ||
+    setweight(to_tsvector(CAST(:cfg AS regconfig), coalesce(t.description, '')), 'B') ||
+    setweight(to_tsvector(CAST(:cfg AS regconfig), coalesce(
+        (SELECT string_agg(m.content, ' ') FROM messages m WHERE m.ticket_id = t.id), ''
+    )), 'C')
+"""
+
+_SQLITE_COLUMNS = """
+    t.id, t.title, t.description,
+    coalesce((SELECT group_concat(m.content, ' ') FROM messages m WHERE m.ticket_id = t.id), '')
+"""
+
+
+def _dialect(db_or_engine) -> str:
+    bind = db_or_engine.get_bind() if isinstance(db_or_engine, Session) else db_or_engine
+    return bind.dialect.name
+
+
+def ensure_search_index(conn: Connection):
+    """
+    Cria a estrutura de busca (se necessário) e indexa os tickets que ainda não estão nela.
+    Executada pela migração 'ticket_search' do banco principal.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS ticket_search (
+                ticket_id INTEGER PRIMARY KEY REFERENCES tickets(id) ON DELETE CASCADE,
+                document tsvector NOT NULL
+            )
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_ticket_search_document ON ticket_search USING GIN (document)"))
+        conn.execute(text(f"""
+            INSERT INTO ticket_search (ticket_id, document)
+            SELECT t.id, {_PG_DOCUMENT} FROM tickets t
+            WHERE NOT EXISTS (SELECT 1 FROM ticket_search s WHERE s.ticket_id = t.id)
+        """), {"cfg": SEARCH_TEXT_CONFIG})
+    else:
+        conn.execute(text("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS ticket_search
+            USING fts5(title, description, messages, tokenize = 'unicode61 remove_diacritics 2')
+        """))
+        conn.execute(text(f"""
+            INSERT INTO ticket_search (rowid, title, description, messages)
+            SELECT {_SQLITE_COLUMNS} FROM tickets t
+            WHERE t.id NOT IN (SELECT rowid FROM ticket_search)
+        """))
+
+
+def index_ticket(db: Session, ticket_id: int):
+    """(Re)indexa título, descrição e mensagens de um ticket. Não faz commit."""
+    if _dialect(db) == "postgresql":
+        db.execute(text(f"""
+            INSERT INTO ticket_search (ticket_id, document)
+            SELECT t.id, {_PG_DOCUMENT} FROM tickets t WHERE t.id = :ticket_id
+            ON CONFLICT (ticket_id) DO UPDATE SET document = EXCLUDED.document
+        """), {"cfg": SEARCH_TEXT_CONFIG, "ticket_id": ticket_id})
+    else:
+        db.execute(text("DELETE FROM ticket_search WHERE rowid = :ticket_id"), {"ticket_id": ticket_id})
+        db.execute(text(f"""
+            INSERT INTO ticket_search (rowid, title, description, messages)
+            SELECT {_SQLITE_COLUMNS} FROM tickets t WHERE t.id = :ticket_id
+        """), {"ticket_id": ticket_id})
+
+
+def index_message(db: Session, ticket_id: int, content: str):
+    """Acrescenta o conteúdo de uma nova mensagem ao documento do ticket, sem reagregar o histórico."""
+    if _dialect(db) == "postgresql":
+        db.execute(text("""
+            UPDATE ticket_search
+            SET document = document || setweight(to_tsvector(CAST(:cfg AS regconfig), :content), 'C')
+            WHERE ticket_id = :ticket_id
+        """), {"cfg": SEARCH_TEXT_CONFIG, "content": content, "ticket_id": ticket_id})
+    else:
+        db.execute(text("""
+            UPDATE ticket_search SET messages = messages || ' ' || :content WHERE rowid = :ticket_id
+        """), {"content": content, "ticket_id": ticket_id})
+
+
+def remove_ticket(db: Session, ticket_id: int):
+    """Remove o ticket do índice de busca. Não faz commit."""
+    column = "ticket_id" if _dialect(db) == "postgresql" else "rowid"
+    db.execute(text(f"DELETE FROM ticket_search WHERE {column} = :ticket_id"), {"ticket_id": ticket_id})
+
+
+# --- Cursor (rank, id) da paginação por relevância ---
+def _encode_cursor(rank: float, ticket_id: int) -> str:
+    raw = json.dumps({"r": rank, "i": ticket_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return float(data["r"]), int(data["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor de busca inválido.")
+
+
+def _fts5_query(q: str) -> str:
+    """Converte o texto livre em uma consulta FTS5 segura: cada termo vira um prefixo entre aspas."""
+    terms = re.findall(r"\w+", q, flags=re.UNICODE)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_tickets(
+    db: Session,
+    current_user: User,
+    q: str,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[Ticket], Optional[str]]:
+    """
+    Busca tickets por título, descrição e mensagens, ordenados por relevância (maior primeiro).
+    Cada ticket retornado recebe o atributo 'search_rank'.
+    """
+    if _dialect(db) == "postgresql":
+        # rank em double precision para o valor do cursor voltar idêntico na comparação
+        hits_sql = """
+            SELECT s.ticket_id AS ticket_id,
+                   CAST(ts_rank_cd(s.document, websearch_to_tsquery(CAST(:cfg AS regconfig), :q)) AS double precision) AS rank
+            FROM ticket_search s
+            WHERE s.document @@ websearch_to_tsquery(CAST(:cfg AS regconfig), :q)
+        """
+        params = {"cfg": SEARCH_TEXT_CONFIG, "q": q}
+    else:
+        match = _fts5_query(q)
+        if not match:
+            return [], None
+        # bm25 é "menor = melhor"; invertido para manter a mesma ordenação do PostgreSQL
+        hits_sql = """
+            SELECT rowid AS ticket_id, -bm25(ticket_search, 10.0, 4.0, 1.0) AS rank
+            FROM ticket_search
+            WHERE ticket_search MATCH :q
+        """
+        params = {"q": match}
+
+    hits = text(hits_sql).bindparams(**params).columns(ticket_id=Integer, rank=Float).subquery("hits")
+
+    query = db.query(Ticket, hits.c.rank).join(hits, hits.c.ticket_id == Ticket.id)
+
+    # Mesmo escopo de leitura de read_ticket_route
+    if current_user.is_admin and not current_user.is_super_admin:
+        query = query.filter(or_(
+            Ticket.requester_id == current_user.id,
+            Ticket.assignee_id == current_user.id,
+            Ticket.assignee_id == None
+        ))
+    elif not current_user.is_super_admin:
+        query = query.filter(Ticket.requester_id == current_user.id)
+
+    if cursor:
+        cursor_rank, cursor_id = _decode_cursor(cursor)
+        query = query.filter(or_(
+            hits.c.rank < cursor_rank,
+            and_(hits.c.rank == cursor_rank, Ticket.id < cursor_id)
+        ))
+
+    rows = query.order_by(hits.c.rank.desc(), Ticket.id.desc())\
+                .options(joinedload(Ticket.requester))\
+                .options(joinedload(Ticket.assignee))\
+                .limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_ticket, last_rank = rows[-1]
+        next_cursor = _encode_cursor(last_rank, last_ticket.id)
+
+    tickets = []
+    for ticket, rank in rows:
+        ticket.search_rank = rank
+        tickets.append(ticket)
+    return tickets, next_cursor
@@ -1,19 +1,26 @@
 import asyncio
+import base64
 import json
 import os
 import shutil
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, Query, aliased, joinedload, load_only
+from sqlalchemy import or_, literal, String
 from fastapi import HTTPException, UploadFile
 from backend.ticket.events.notification import notify_ticket_created, notify_ticket_created_async, notify_ticket_wsb_async
 from backend.ticket.events.notification import notify_ticket_accept
 from backend.ticket.events.notification import notify_ticket_close
+from backend.ticket.events.notification import add_ticket_notifications_bulk, notify_tickets_ws_bulk_async
 from backend.ticket.models.notification import NotificationType
 from backend.ticket.models.ticket import Ticket, TicketStatus
 from backend.models.user import User
 from backend.ticket.schemas.ticket import TicketCreate, TicketUpdate
+from backend.ticket.services.ticket_stats import ticket_stats_store, ticket_key, TicketKey
+from backend.ticket.services.ticket_count_cache import ticket_count_cache, TicketCountSignature
+from backend.ticket.crud import search as ticket_search
+from backend.ticket.crud.ticket_event import record_ticket_event, record_ticket_change
+from backend.ticket.models.ticket_event import TicketEventType
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 # --- Funções auxiliares para upload ---
@@ -65,6 +72,155 @@ def _delete_attachment_file(file_url: str):
         print(f"Aviso: Arquivo de anexo não encontrado para exclusão: {file_path}")
 
 
+# Status que as listagens escondem quando include_closed_or_resolved=False
+_CLOSED_STATUS_VALUES = [TicketStatus.closed.value, TicketStatus.resolved.value, TicketStatus.cancelled.value]
+
+
+# --- Manutenção incremental das estatísticas ---
+def _track_ticket_change(old: Optional[TicketKey], new: Optional[TicketKey]):
+    """Propaga a mudança de um ticket já commitado para os contadores e o cache de totais."""
+    ticket_stats_store.apply(old, new)
+    ticket_count_cache.invalidate()
+
+
+def _commit_keeping_loaded(db: Session):
+    """
+    Commit sem expirar os objetos da sessão. O Ticket usa eager_defaults, então os valores
+    gerados pelo banco (id, created_at, updated_at) já voltaram no RETURNING do INSERT/UPDATE,
+    e os usuários dos relacionamentos vêm do identity map: a resposta é montada sem refresh
+    nem recarga com joinedload depois do commit.
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+# --- Totais das listagens paginadas ---
+def _count_total(db: Session, query: Query, signature: TicketCountSignature, include_total: str = "true") -> Optional[int]:
+    """
+    Calcula o total da listagem conforme o modo pedido pelo cliente:
+    - "true": COUNT exato, reaproveitando o cache por assinatura de filtros;
+    - "estimated": total vindo dos contadores em memória, sem consultar o banco;
+    - "false": não calcula (clientes de rolagem infinita usam apenas o next_cursor).
+    """
+    if include_total == "false":
+        return None
+    if include_total == "estimated":
+        return ticket_stats_store.estimate_count(
+            db,
+            scope=signature.scope,
+            user_id=signature.user_id,
+            statuses=signature.statuses,
+            excluded_statuses=() if signature.include_closed else _CLOSED_STATUS_VALUES,
+        )
+
+    total = ticket_count_cache.get(signature)
+    if total is None:
+        total = query.count()
+        ticket_count_cache.set(signature, total)
+    return total
+
+
+# --- Funções auxiliares para paginação por cursor ---
+def _encode_cursor(ticket: Ticket) -> str:
+    """Gera um cursor opaco a partir da chave de ordenação (created_at, id) do ticket."""
+    raw = json.dumps({"c": ticket.created_at.isoformat(), "i": ticket.id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica o cursor opaco de volta para (created_at, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido.")
+
+# Colunas carregadas no modo view=summary (as mesmas de TicketSummary)
+_SUMMARY_COLUMNS = (
+    Ticket.id, Ticket.title, Ticket.status, Ticket.priority, Ticket.category,
+    Ticket.created_at, Ticket.updated_at, Ticket.requester_id, Ticket.assignee_id,
+)
+
+def _cursor_created_at(query: Query, value: datetime):
+    """
+    Valor do cursor na comparação com created_at. No SQLite as datas são texto e o default
+    func.now() grava '2026-10-18 14:34:56', enquanto o DateTime do SQLAlchemy enviaria
+    '2026-10-18 14:34:56.000000' (que ordena depois do valor gravado): lá o cursor vai no
+    mesmo texto da coluna, e a coluna segue crua na ordenação e no seek, usando o índice.
+    """
+    if query.session.get_bind().dialect.name != "sqlite":
+        return value
+    stored_format = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+    return literal(value.strftime(stored_format), String)
+
+def _page_query(query: Query, skip: int, limit: int, cursor: Optional[str] = None, view: str = "full") -> Query:
+    """
+    Aplica o seek do cursor, a ordenação (created_at DESC, id DESC) e o limite (um registro
+    a mais, para saber se existe próxima página). Também usado pelo explain_check.
+    """
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        cursor_value = _cursor_created_at(query, cursor_created_at)
+        # O 'created_at <= cursor' redundante vira um range no índice (created_at, id); só o
+        # OR não é usado como seek pelo SQLite
+        query = query.filter(
+            Ticket.created_at <= cursor_value,
+            or_(Ticket.created_at < cursor_value, Ticket.id < cursor_id)
+        )
+        skip = 0
+
+    if view == "summary":
+        query = query.options(load_only(*_SUMMARY_COLUMNS))
+    else:
+        query = query.options(joinedload(Ticket.requester))\
+                     .options(joinedload(Ticket.assignee))
+
+    return query.order_by(Ticket.created_at.desc(), Ticket.id.desc())\
+                .offset(skip).limit(limit + 1)
+
+def _paginate(query: Query, skip: int, limit: int, cursor: Optional[str] = None, view: str = "full") -> Tuple[List[Ticket], Optional[str]]:
+    """
+    Retorna a página e o cursor da próxima.
+    Com cursor, a consulta faz seek direto no índice (created_at, id) e ignora o skip,
+    então o custo de cada página independe da profundidade.
+    Com view="summary", carrega só as colunas da listagem e dispensa os joins de usuários.
+    """
+    rows = _page_query(query, skip, limit, cursor, view).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1])
+    return rows, next_cursor
+
+
+def _list_query(
+    db: Session,
+    status_values: Optional[List[str]] = None,
+    include_closed: bool = True,
+    requester_id: Optional[int] = None,
+    assigned_or_unassigned_to: Optional[int] = None
+) -> Query:
+    """Filtros das listagens de tickets (também usados pelo explain_check)."""
+    query = db.query(Ticket)
+    if requester_id:
+        query = query.filter(Ticket.requester_id == requester_id)
+    if status_values:
+        query = query.filter(Ticket.status.in_(status_values))
+    if not include_closed:
+        query = query.filter(Ticket.status.notin_(_CLOSED_STATUS_VALUES))
+    if assigned_or_unassigned_to is not None:
+        query = query.filter(or_(
+            Ticket.assignee_id == assigned_or_unassigned_to,
+            Ticket.assignee_id == None
+        ))
+    return query
+
+
 # --- Funções CRUD para Ticket ---
 
 def get_ticket(db: Session, ticket_id: int):
@@ -73,31 +229,48 @@ def get_ticket(db: Session, ticket_id: int):
              .options(joinedload(Ticket.assignee))\
              .filter(Ticket.id == ticket_id).first()
 
+def get_ticket_version(db: Session, ticket_id: int):
+    """
+    Consulta leve (uma linha, sem hidratar o ORM) com o necessário para a checagem de
+    permissão e para o ETag de GET /tickets/{id}: os ids do solicitante e do técnico e os
+    updated_at do ticket e dos dois usuários embutidos na resposta.
+    """
+    requester = aliased(User)
+    assignee = aliased(User)
+    return db.query(
+                Ticket.id, Ticket.requester_id, Ticket.assignee_id, Ticket.updated_at,
+                requester.updated_at.label("requester_updated_at"),
+                assignee.updated_at.label("assignee_updated_at"),
+            )\
+             .join(requester, requester.id == Ticket.requester_id)\
+             .outerjoin(assignee, assignee.id == Ticket.assignee_id)\
+             .filter(Ticket.id == ticket_id).first()
+
 def get_tickets(
     db: Session, 
     current_user: User, 
     requester_id: Optional[int] = None, 
     status: Optional[List[TicketStatus]] = None, 
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: str = "true",
+    view: str = "full"
 ):
-    query = db.query(Ticket)
-
-    if requester_id:
-        query = query.filter(Ticket.requester_id == requester_id)
-    
-    if status:
-        status_values = [s.value for s in status]
-        query = query.filter(Ticket.status.in_(status_values))
-    
-    total_tickets = query.count()
+    status_values = [s.value for s in status] if status else None
+    query = _list_query(db, status_values, requester_id=requester_id)
+
+    signature = TicketCountSignature(
+        scope="requester" if requester_id else "all",
+        user_id=requester_id or None,
+        statuses=frozenset(status_values) if status_values else None,
+        include_closed=True,
+    )
+    total_tickets = _count_total(db, query, signature, include_total)
     
-    tickets_paginated = query.order_by(Ticket.created_at.desc())\
-                             .options(joinedload(Ticket.requester))\
-                             .options(joinedload(Ticket.assignee))\
-                             .offset(skip).limit(limit).all()
+    tickets_paginated, next_cursor = _paginate(query, skip, limit, cursor, view)
     
-    return tickets_paginated, total_tickets
+    return tickets_paginated, total_tickets, next_cursor
 
 def get_assigned_and_unassigned_tickets(
     db: Session, 
@@ -105,64 +278,65 @@ def get_assigned_and_unassigned_tickets(
     status: Optional[List[TicketStatus]] = None,
     include_closed_or_resolved: bool = False,
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: str = "true",
+    view: str = "full"
 ):
-    query = db.query(Ticket)
-
-    if status:
-        status_values = [s.value for s in status]
-        query = query.filter(Ticket.status.in_(status_values))
-    
-    if not include_closed_or_resolved:
-        query = query.filter(Ticket.status.notin_([TicketStatus.closed.value, TicketStatus.resolved.value, TicketStatus.cancelled.value]))
+    status_values = [s.value for s in status] if status else None
 
     if current_user.is_admin:
-        query = query.filter(or_(
-            Ticket.assignee_id == current_user.id,
-            Ticket.assignee_id == None
-        ))
+        query = _list_query(db, status_values, include_closed_or_resolved, assigned_or_unassigned_to=current_user.id)
+        scope = "assigned_or_unassigned"
     elif not current_user.is_super_admin:
-        return [], 0 
-
-    total_tickets = query.count()
+        return [], 0, None
+    else:
+        query = _list_query(db, status_values, include_closed_or_resolved)
+        scope = "all"
+
+    signature = TicketCountSignature(
+        scope=scope,
+        user_id=current_user.id if scope == "assigned_or_unassigned" else None,
+        statuses=frozenset(status_values) if status_values else None,
+        include_closed=include_closed_or_resolved,
+    )
+    total_tickets = _count_total(db, query, signature, include_total)
 
-    tickets_paginated = query.order_by(Ticket.created_at.desc())\
-                             .options(joinedload(Ticket.requester))\
-                             .options(joinedload(Ticket.assignee))\
-                             .offset(skip).limit(limit).all()
+    tickets_paginated, next_cursor = _paginate(query, skip, limit, cursor, view)
 
-    return tickets_paginated, total_tickets
+    return tickets_paginated, total_tickets, next_cursor
 
 def get_all_tickets(
     db: Session, 
     status: Optional[List[TicketStatus]] = None,
     include_closed_or_resolved: bool = False,
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: str = "true",
+    view: str = "full"
 ):
-    query = db.query(Ticket)
-
-    if status:
-        status_values = [s.value for s in status]
-        query = query.filter(Ticket.status.in_(status_values))
-    
-    if not include_closed_or_resolved:
-        query = query.filter(Ticket.status.notin_([TicketStatus.closed.value, TicketStatus.resolved.value, TicketStatus.cancelled.value]))
-
-    total_tickets = query.count()
+    status_values = [s.value for s in status] if status else None
+    query = _list_query(db, status_values, include_closed_or_resolved)
+
+    signature = TicketCountSignature(
+        scope="all",
+        user_id=None,
+        statuses=frozenset(status_values) if status_values else None,
+        include_closed=include_closed_or_resolved,
+    )
+    total_tickets = _count_total(db, query, signature, include_total)
 
-    tickets_paginated = query.order_by(Ticket.created_at.desc())\
-                             .options(joinedload(Ticket.requester))\
-                             .options(joinedload(Ticket.assignee))\
-                             .offset(skip).limit(limit).all()
+    tickets_paginated, next_cursor = _paginate(query, skip, limit, cursor, view)
                              
-    return tickets_paginated, total_tickets
+    return tickets_paginated, total_tickets, next_cursor
 
 
 def create_ticket(db: Session, ticket_data: TicketCreate, requester_id: int, attachment: Optional[UploadFile] = None):
     initial_status = TicketStatus.open.value
    
     # Validação do ID do técnico, permitindo que qualquer usuário o defina
+    assignee_user = None
     if ticket_data.assignee_id:
         assignee_user = db.query(User).filter(User.id == ticket_data.assignee_id).first()
         if not assignee_user or not (assignee_user.is_admin or assignee_user.is_super_admin):
@@ -188,24 +362,22 @@ def create_ticket(db: Session, ticket_data: TicketCreate, requester_id: int, att
         assignee_id=ticket_data.assignee_id,
         attachment_url=attachment_url # Salva a URL do anexo no banco de dados
     )
+    # O técnico já validado acima é reaproveitado; o solicitante (usuário logado) vem do identity map
+    db_ticket.assignee = assignee_user
     db.add(db_ticket)
-    db.commit()
-    db.refresh(db_ticket)
-    
-    # Recarrega o ticket para incluir os objetos de relacionamento completos para a resposta
-    db_ticket = db.query(Ticket)\
-                    .options(joinedload(Ticket.requester))\
-                    .options(joinedload(Ticket.assignee))\
-                    .filter(Ticket.id == db_ticket.id).first()
-    
+    db.flush()  # INSERT ... RETURNING id, created_at, updated_at
+    ticket_search.index_ticket(db, db_ticket.id)
+    record_ticket_event(db, TicketEventType.created, db_ticket.id, requester_id, None, ticket_key(db_ticket))
+
     # [AJUSTE AQUI] Notifica apenas o técnico atribuído, se houver.
-    # O código anterior tinha a notificação do solicitante comentada, o que podia causar confusão.
-    # Esta nova lógica é mais clara e segue a regra de negócio.
+    # A notificação entra na mesma transação do ticket.
+    if db_ticket.assignee_id:
+        notify_ticket_created(db, user_id=db_ticket.assignee_id, ticket_id=db_ticket.id, commit=False)
 
+    _commit_keeping_loaded(db)
+    _track_ticket_change(None, ticket_key(db_ticket))
 
     try:
-        if db_ticket.assignee_id:
-            notify_ticket_created(db, user_id=db_ticket.assignee_id, ticket_id=db_ticket.id)
         admins: List[User] = db.query(User).filter(User.is_admin == True, User.is_active == True).all()
         print(f"[quantidade de registro]: {len(admins)}")
 
@@ -222,10 +394,12 @@ def create_ticket(db: Session, ticket_data: TicketCreate, requester_id: int, att
 
     return db_ticket
 
-def update_ticket(db: Session, db_ticket: Ticket, ticket_update: TicketUpdate, attachment: Optional[UploadFile] = None):
+def update_ticket(db: Session, db_ticket: Ticket, ticket_update: TicketUpdate, attachment: Optional[UploadFile] = None, actor_id: Optional[int] = None):
     # Converte o Pydantic model para um dicionário, excluindo campos não definidos
     # e também excluindo campos que são None para evitar violar restrições NOT NULL
     update_data = ticket_update.model_dump(exclude_unset=True)
+    old_key = ticket_key(db_ticket)
+    assignee_user = None
 
     # [AJUSTE AQUI] Lógica de validação para o atribuidor (assignee_id)
     # Movemos a regra de permissão para a rota (router/ticket.py), que é o lugar ideal para lidar com isso.
@@ -235,6 +409,8 @@ def update_ticket(db: Session, db_ticket: Ticket, ticket_update: TicketUpdate, a
         assignee_user = db.query(User).filter(User.id == new_assignee_id).first()
         if not assignee_user or not (assignee_user.is_admin or assignee_user.is_super_admin):
             raise ValueError("ID de atribuidor inválido. O atribuidor deve ser um usuário técnico (Admin) ou um SuperAdmin existente.")
+        # Mantém o relacionamento coerente para a resposta, sem recarregar o ticket
+        db_ticket.assignee = assignee_user
             
     # Se um ticket sem atribuição for colocado em andamento, mudar para "open"
     # Esta lógica pode precisar de revisão dependendo do fluxo de negócio exato.
@@ -270,30 +446,33 @@ def update_ticket(db: Session, db_ticket: Ticket, ticket_update: TicketUpdate, a
             setattr(db_ticket, key, value)
             
     db.add(db_ticket)
-    db.commit()
-    db.refresh(db_ticket)
-    
-    # Recarrega o ticket para incluir os objetos de relacionamento completos para a resposta
-    db_ticket = db.query(Ticket)\
-                    .options(joinedload(Ticket.requester))\
-                    .options(joinedload(Ticket.assignee))\
-                    .filter(Ticket.id == db_ticket.id).first()
+    if "title" in update_data or "description" in update_data:
+        db.flush()
+        ticket_search.index_ticket(db, db_ticket.id)
+    new_key = ticket_key(db_ticket)
+    record_ticket_change(db, db_ticket.id, actor_id, old_key, new_key)
+    _commit_keeping_loaded(db)
+    _track_ticket_change(old_key, new_key)
     return db_ticket
 
-def delete_ticket(db: Session, ticket_id: int):
+def delete_ticket(db: Session, ticket_id: int, actor_id: Optional[int] = None):
     db_ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
     if db_ticket:
         # Antes de deletar o ticket do banco de dados, deleta o arquivo anexo se existir
         if db_ticket.attachment_url:
             _delete_attachment_file(db_ticket.attachment_url)
 
+        old_key = ticket_key(db_ticket)
+        ticket_search.remove_ticket(db, db_ticket.id)
+        record_ticket_event(db, TicketEventType.deleted, db_ticket.id, actor_id, old_key, None)
         db.delete(db_ticket)
         db.commit()
+        _track_ticket_change(old_key, None)
         return True
     return False
 
 def accept_ticket(db: Session, ticket_id: int, current_user: User):
-    db_ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    db_ticket = get_ticket(db, ticket_id)
     if not db_ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
 
@@ -303,9 +482,13 @@ def accept_ticket(db: Session, ticket_id: int, current_user: User):
     if db_ticket.status != TicketStatus.open.value:
         raise ValueError("Chamado não pode ser aceito, pois não está com status 'aberto'.")
 
+    old_key = ticket_key(db_ticket)
+
     # Atribui o ticket ao técnico logado se ainda não estiver atribuído
     if db_ticket.assignee_id is None:
+        # FK e relacionamento juntos: ticket_key lê o assignee_id antes do flush
         db_ticket.assignee_id = current_user.id
+        db_ticket.assignee = current_user
     # Ou verifica se já está atribuído ao técnico logado
     elif db_ticket.assignee_id != current_user.id:
         raise ValueError("Chamado já está atribuído a outro técnico.")
@@ -313,20 +496,15 @@ def accept_ticket(db: Session, ticket_id: int, current_user: User):
     db_ticket.status = TicketStatus.in_progress.value
     db_ticket.updated_at = datetime.now()
     db.add(db_ticket)
-    db.commit()
-    db.refresh(db_ticket)
-
-    db_ticket = db.query(Ticket)\
-                    .options(joinedload(Ticket.requester))\
-                    .options(joinedload(Ticket.assignee))\
-                    .filter(Ticket.id == db_ticket.id).first()
-    
-
-    notify_ticket_accept(db, user_id=db_ticket.requester_id, ticket_id=db_ticket.id)
+    # Notificação na mesma transação; o envio por websocket só roda depois que esta função retorna
+    record_ticket_event(db, TicketEventType.accepted, db_ticket.id, current_user.id, old_key, ticket_key(db_ticket))
+    notify_ticket_accept(db, user_id=db_ticket.requester_id, ticket_id=db_ticket.id, commit=False)
+    _commit_keeping_loaded(db)
+    _track_ticket_change(old_key, ticket_key(db_ticket))
     return db_ticket
 
 def close_ticket(db: Session, ticket_id: int, current_user: User, observation: Optional[str] = None):
-    db_ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    db_ticket = get_ticket(db, ticket_id)
     
     if not db_ticket:
         raise HTTPException(status_code=404, detail="Ticket não encontrado.")
@@ -346,63 +524,133 @@ def close_ticket(db: Session, ticket_id: int, current_user: User, observation: O
         )
 
    
+    old_key = ticket_key(db_ticket)
     db_ticket.status = TicketStatus.closed.value
     db_ticket.observation = observation
     db_ticket.updated_at = datetime.now()
     db.add(db_ticket)
+    # Notificação do solicitante, na mesma transação
+    record_ticket_event(db, TicketEventType.closed, db_ticket.id, current_user.id, old_key, ticket_key(db_ticket))
+    notify_ticket_close(db, user_id=db_ticket.requester_id, ticket_id=db_ticket.id, commit=False)
+    _commit_keeping_loaded(db)
+    _track_ticket_change(old_key, ticket_key(db_ticket))
+    return db_ticket
+
+def bulk_update_tickets(
+    db: Session,
+    current_user: User,
+    ticket_ids: List[int],
+    action: str,
+    assignee_id: Optional[int] = None,
+    status: Optional[TicketStatus] = None,
+    observation: Optional[str] = None
+) -> List[dict]:
+    """
+    Aplica assign/status/close a vários chamados em uma única transação.
+
+    As permissões são verificadas por chamado com as mesmas regras das rotas individuais
+    (PUT /tickets/{id} e POST /tickets/{id}/close); os recusados voltam com ok=False e o
+    motivo, sem impedir os demais. Os aprovados são alterados com um único UPDATE, as
+    notificações são gravadas juntas na mesma transação e enviadas por websocket em uma
+    única tarefa após o commit.
+    """
+    if action == "assign":
+        if not current_user.is_super_admin and assignee_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Você não pode atribuir chamados a outro técnico.")
+        assignee_user = db.query(User).filter(User.id == assignee_id).first()
+        if not assignee_user or not (assignee_user.is_admin or assignee_user.is_super_admin):
+            raise ValueError("ID de atribuidor inválido. O atribuidor deve ser um usuário técnico (Admin) ou um SuperAdmin existente.")
+
+    # Uma única leitura, só das colunas necessárias, travando as linhas até o commit
+    rows = db.query(Ticket.id, Ticket.status, Ticket.requester_id, Ticket.assignee_id)\
+             .filter(Ticket.id.in_(ticket_ids))\
+             .with_for_update().all()
+    rows_by_id = {row.id: row for row in rows}
+
+    results = []
+    approved = []
+    for ticket_id in ticket_ids:
+        row = rows_by_id.get(ticket_id)
+        detail = None
+        if row is None:
+            detail = "Ticket não encontrado."
+        elif action == "close":
+            if row.status in _CLOSED_STATUS_VALUES:
+                detail = "Chamado já está fechado, cancelado ou resolvido."
+            elif row.assignee_id != current_user.id:
+                detail = "Você não pode fechar este chamado porque não está atribuído a você."
+        elif not (
+            current_user.is_super_admin
+            or row.requester_id == current_user.id
+            or row.assignee_id == current_user.id
+            or (current_user.is_admin and row.assignee_id is None)
+        ):
+            detail = "Você não tem permissão para atualizar este chamado."
+
+        results.append({"ticket_id": ticket_id, "ok": detail is None, "detail": detail})
+        if detail is None:
+            approved.append(row)
+
+    if not approved:
+        db.rollback()
+        return results
+
+    values = {Ticket.updated_at: datetime.now()}
+    if action == "assign":
+        values[Ticket.assignee_id] = assignee_id
+    elif action == "status":
+        values[Ticket.status] = status.value
+    else:
+        values[Ticket.status] = TicketStatus.closed.value
+        values[Ticket.observation] = observation
+
+    approved_ids = [row.id for row in approved]
+    db.query(Ticket).filter(Ticket.id.in_(approved_ids)).update(values, synchronize_session=False)
+
+    # Mesmos destinatários das rotas individuais: o técnico atribuído / o solicitante do chamado fechado
+    ws_type = None
+    notifications = []
+    if action == "assign":
+        ws_type = "ticket_created"
+        notifications = add_ticket_notifications_bulk(
+            db, [(assignee_id, row.id) for row in approved], "Chamado atribuído a você."
+        )
+    elif action == "close":
+        ws_type = "ticket_finish"
+        notifications = add_ticket_notifications_bulk(
+            db, [(row.requester_id, row.id) for row in approved], "Ticket finalizado."
+        )
+
+    changes = []
+    for row in approved:
+        new_status = row.status
+        if action == "status":
+            new_status = status.value
+        elif action == "close":
+            new_status = TicketStatus.closed.value
+        new_assignee_id = assignee_id if action == "assign" else row.assignee_id
+        old_key = (row.status, row.requester_id, row.assignee_id)
+        new_key = (new_status, row.requester_id, new_assignee_id)
+        record_ticket_change(db, row.id, current_user.id, old_key, new_key)
+        changes.append((old_key, new_key))
+
     db.commit()
-    db.refresh(db_ticket)
 
-    # Recarrega o ticket para a resposta
-    db_ticket = db.query(Ticket)\
-                      .options(joinedload(Ticket.requester))\
-                      .options(joinedload(Ticket.assignee))\
-                      .filter(Ticket.id == db_ticket.id).first()
-    
-    # Notificação do solicitante
-    notify_ticket_close(db, user_id=db_ticket.requester_id, ticket_id=db_ticket.id)
-    return db_ticket
+    for old_key, new_key in changes:
+        _track_ticket_change(old_key, new_key)
+
+    if notifications:
+        try:
+            asyncio.create_task(notify_tickets_ws_bulk_async(ws_type, notifications))
+        except Exception as e:
+            print(f"[ERRO ao notificar operação em lote]: {e}")
+
+    return results
 
 def get_tickets_stats_for_user(db: Session, current_user: User) -> dict:
     """
     Retorna as estatísticas de tickets com base no perfil do usuário.
+    Lidas dos contadores em memória (carregados com uma única agregação agrupada
+    e mantidos pelas funções de escrita deste módulo).
     """
-    stats = {}
-    
-    # Lógica para o ADMIN/TECNICO
-    if current_user.is_super_admin: # Assumindo que super_admin é o ADMIN/TECNICO
-        stats["open_tickets_all_techs"] = db.query(Ticket).filter(Ticket.status == TicketStatus.open.value).count()
-        stats["in_progress_tickets_all"] = db.query(Ticket).filter(Ticket.status == TicketStatus.in_progress.value).count()
-        stats["closed_tickets_all"] = db.query(Ticket).filter(Ticket.status.in_([TicketStatus.closed.value, TicketStatus.resolved.value])).count()
-        stats["total_resolved_all_techs"] = db.query(Ticket).filter(Ticket.status == TicketStatus.resolved.value).count()
-
-    # Lógica para o TECNICO
-    elif current_user.is_admin: # Assumindo que is_admin é o TECNICO
-        stats["open_tickets_assigned_to_me"] = db.query(Ticket).filter(
-            (Ticket.status == TicketStatus.open.value) &
-            (Ticket.assignee_id == current_user.id)
-        ).count()
-        stats["in_progress_tickets_all"] = db.query(Ticket).filter(Ticket.status == TicketStatus.in_progress.value).count()
-        stats["closed_by_me"] = db.query(Ticket).filter(
-            (Ticket.status == TicketStatus.closed.value) &
-            (Ticket.assignee_id == current_user.id)
-        ).count()
-        stats["total_resolved_all_techs"] = db.query(Ticket).filter(Ticket.status == TicketStatus.resolved.value).count()
-
-    # Lógica para o USUARIO COMUM
-    else:
-        stats["open_tickets"] = db.query(Ticket).filter(
-            (Ticket.requester_id == current_user.id) &
-            (Ticket.status == TicketStatus.open.value)
-        ).count()
-        stats["in_progress_tickets"] = db.query(Ticket).filter(
-            (Ticket.requester_id == current_user.id) &
-            (Ticket.status == TicketStatus.in_progress.value)
-        ).count()
-        stats["closed_tickets"] = db.query(Ticket).filter(
-            (Ticket.requester_id == current_user.id) &
-            (Ticket.status.in_([TicketStatus.closed.value, TicketStatus.resolved.value]))
-        ).count()
-        stats["total_created_by_me"] = db.query(Ticket).filter(Ticket.requester_id == current_user.id).count()
-
-    return stats
\ No newline at end of file
+    return ticket_stats_store.stats_for_user(db, current_user)
@@ -0,0 +1,65 @@
+# backend/ticket/crud/ticket_event.py
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from backend.ticket.models.ticket import TicketStatus
+from backend.ticket.models.ticket_event import TicketEvent, TicketEventType
+from backend.ticket.services.ticket_stats import TicketKey
+
+
+def record_ticket_event(
+    db: Session,
+    event_type: TicketEventType,
+    ticket_id: int,
+    actor_id: Optional[int],
+    old: Optional[TicketKey],
+    new: Optional[TicketKey]
+) -> TicketEvent:
+    """
+    Acrescenta um evento ao fluxo ticket_events com o antes/depois de (status, técnico).
+    Não faz commit: o evento entra na transação da escrita que o originou.
+    """
+    _, requester_id, _ = new or old
+    event = TicketEvent(
+        ticket_id=ticket_id,
+        event_type=event_type.value,
+        actor_id=actor_id,
+        requester_id=requester_id,
+        from_status=old[0] if old else None,
+        to_status=new[0] if new else None,
+        from_assignee_id=old[2] if old else None,
+        to_assignee_id=new[2] if new else None,
+    )
+    db.add(event)
+    return event
+
+
+def record_ticket_change(
+    db: Session,
+    ticket_id: int,
+    actor_id: Optional[int],
+    old: TicketKey,
+    new: TicketKey
+) -> Optional[TicketEvent]:
+    """Classifica uma edição genérica (PUT ou lote) e registra o evento; nada se status e técnico não mudaram."""
+    if old == new:
+        return None
+    if old[2] != new[2]:
+        event_type = TicketEventType.reassigned
+    elif new[0] == TicketStatus.closed.value:
+        event_type = TicketEventType.closed
+    else:
+        event_type = TicketEventType.status_changed
+    return record_ticket_event(db, event_type, ticket_id, actor_id, old, new)
+
+
+def get_events_after(
+    db: Session,
+    last_event_id: int,
+    limit: int = 500,
+    created_before: Optional[datetime] = None
+) -> List[TicketEvent]:
+    query = db.query(TicketEvent).filter(TicketEvent.id > last_event_id)
+    if created_before is not None:
+        query = query.filter(TicketEvent.created_at <= created_before)
+    return query.order_by(TicketEvent.id).limit(limit).all()
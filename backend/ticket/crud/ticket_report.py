@@ -0,0 +1,59 @@
+# backend/ticket/crud/ticket_report.py
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+from backend.models.user import User
+from backend.ticket.models.ticket_event import ProjectionOffset, TechnicianWorkload, DailyTicketCount
+from backend.ticket.services.ticket_projections import TicketProjector
+
+# Leituras dos relatórios: apenas as tabelas de projeção, nunca a tabela tickets.
+
+
+def _last_event_id(db: Session) -> int:
+    offset = db.query(ProjectionOffset.last_event_id).filter(ProjectionOffset.name == TicketProjector.NAME).scalar()
+    return offset or 0
+
+
+def get_workload_report(db: Session) -> dict:
+    rows = db.query(TechnicianWorkload.assignee_id, TechnicianWorkload.status, TechnicianWorkload.tickets, User.email)\
+             .outerjoin(User, User.id == TechnicianWorkload.assignee_id)\
+             .filter(TechnicianWorkload.tickets > 0)\
+             .order_by(TechnicianWorkload.assignee_id).all()
+
+    items = {}
+    for assignee_id, status, tickets, email in rows:
+        item = items.setdefault(assignee_id, {"assignee_id": assignee_id, "email": email, "by_status": {}, "total": 0})
+        item["by_status"][status] = tickets
+        item["total"] += tickets
+
+    return {"items": list(items.values()), "last_event_id": _last_event_id(db)}
+
+
+def get_daily_report(db: Session, days: int = 30) -> dict:
+    since = date.today() - timedelta(days=days - 1)
+    rows = db.query(DailyTicketCount)\
+             .filter(DailyTicketCount.day >= since)\
+             .order_by(DailyTicketCount.day).all()
+
+    items = []
+    totals = {"opened": 0, "accepted": 0, "closed": 0, "accept_seconds_total": 0.0}
+    for row in rows:
+        items.append({
+            "day": row.day,
+            "opened": row.opened,
+            "accepted": row.accepted,
+            "closed": row.closed,
+            "avg_seconds_to_accept": row.accept_seconds_total / row.accepted if row.accepted else None,
+        })
+        totals["opened"] += row.opened
+        totals["accepted"] += row.accepted
+        totals["closed"] += row.closed
+        totals["accept_seconds_total"] += row.accept_seconds_total
+
+    return {
+        "items": items,
+        "opened": totals["opened"],
+        "accepted": totals["accepted"],
+        "closed": totals["closed"],
+        "avg_seconds_to_accept": totals["accept_seconds_total"] / totals["accepted"] if totals["accepted"] else None,
+        "last_event_id": _last_event_id(db),
+    }
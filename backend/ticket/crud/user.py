@@ -1,16 +1,18 @@
 from sqlalchemy.orm import Session
 from backend.models.user import User
 from backend.ticket.schemas.user import UserCreate, UserUpdate
-from passlib.context import CryptContext
+from backend.core import security
+from backend.core.principal_cache import principal_cache
+from backend.core.token_revocation import token_revocation
+from backend.frota.crud.crud_collection_version import bump_version_committed, BOOKINGS
 from datetime import datetime
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+# Hash e verificação ficam em core.security (executor limitado e custo configurável)
 def get_password_hash(password: str):
-    return pwd_context.hash(password)
+    return security.get_password_hash(password)
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return security.verify_password(plain_password, hashed_password)
 
 def get_user(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
@@ -61,6 +63,11 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate):
     db_user.updated_at = datetime.now()
     db.add(db_user)
     db.commit()
+    principal_cache.invalidate(user_id)
+    # Os claims de perfil dos access tokens emitidos ficam desatualizados: força o refresh
+    token_revocation.revoke_access_tokens(user_id)
+    # As reservas embutem os dados do usuário: invalida o ETag das listagens
+    bump_version_committed(BOOKINGS)
     db.refresh(db_user)
     return db_user
 
@@ -69,6 +76,9 @@ def delete_user(db: Session, user_id: int):
     if db_user:
         db.delete(db_user)
         db.commit()
+        principal_cache.invalidate(user_id)
+        token_revocation.revoke_access_tokens(user_id)
+        bump_version_committed(BOOKINGS)
         return True
     return False
 
@@ -1,5 +1,6 @@
 import asyncio
 import json
+from typing import List, Tuple
 from sqlalchemy.orm import Session
 from backend.models.user import User
 from backend.ticket.crud import notification as notification_crud
@@ -9,8 +10,9 @@ from backend.ticket.models.message import Message
 from backend.ticket.models.notification import Notification, NotificationType
 from backend.ticket.models.ticket import Ticket
 from backend.websocket.service.ws_instance import manager
+from backend.websocket.service.topics import ticket_topic
 
-def notify_ticket_created(db: Session, user_id: int, ticket_id: int):
+def notify_ticket_created(db: Session, user_id: int, ticket_id: int, commit: bool = True):
 
     # result = ticket_crud.get_ticket(db, ticket_id)
    
@@ -19,7 +21,8 @@ def notify_ticket_created(db: Session, user_id: int, ticket_id: int):
         user_id=user_id,
         ticket_id=ticket_id,
         message="Novo ticket criado. Tk:"+ str(ticket_id),
-        notif_type=NotificationType.ticket_created
+        notif_type=NotificationType.ticket_created,
+        commit=commit
     )
 
 async def notify_ticket_created_async(user_id: int, ticket_id: int):
@@ -89,31 +92,71 @@ def notify_message_sent(db: Session, user_id: int, ticket_id: int,message_id: in
             notif_type=NotificationType.message_sent
         )
 
-def notify_ticket_accept(db: Session, user_id: int, ticket_id: int):
-
-    result = ticket_crud.get_ticket(db, ticket_id)
+def notify_ticket_accept(db: Session, user_id: int, ticket_id: int, commit: bool = True):
+    """user_id é o solicitante do chamado (quem recebe a notificação)."""
     note = notification_crud.create_notification(
         db=db,
-        user_id=result.requester_id,
+        user_id=user_id,
         ticket_id=ticket_id,
         message='Ticket iniciado. Tk:'+ str(ticket_id),
-        notif_type=NotificationType.ticket_created
+        notif_type=NotificationType.ticket_created,
+        commit=commit
     )
     asyncio.create_task(notify_ticket_ws_message_not_async(user_id=note.user_id,id_msg=note.id, ticket=note.ticket,notif_type="ticket_started",msg=note.message))
     
 
-def notify_ticket_close(db: Session, user_id: int, ticket_id: int):
-
-    result = ticket_crud.get_ticket(db, ticket_id)
+def notify_ticket_close(db: Session, user_id: int, ticket_id: int, commit: bool = True):
+    """user_id é o solicitante do chamado (quem recebe a notificação)."""
     note = notification_crud.create_notification(
         db=db,
-        user_id=result.requester_id,
+        user_id=user_id,
         ticket_id=ticket_id,
         message='Ticket finalizado. Tk:'+ str(ticket_id),
-        notif_type=NotificationType.ticket_created
+        notif_type=NotificationType.ticket_created,
+        commit=commit
     )
     asyncio.create_task(notify_ticket_ws_message_not_async(user_id=note.user_id,id_msg=note.id, ticket=note.ticket,notif_type="ticket_finish",msg=note.message))   
 
+def add_ticket_notifications_bulk(
+    db: Session,
+    targets: List[Tuple[int, int]],
+    message: str,
+    notif_type: NotificationType = NotificationType.ticket_created
+) -> List[dict]:
+    """
+    Cria, sem commit, uma notificação por par (user_id, ticket_id) e devolve os payloads
+    para notify_tickets_ws_bulk_async, que deve ser agendado só depois do commit.
+    """
+    notes = notification_crud.create_notifications_bulk(db, [
+        {
+            "user_id": user_id,
+            "ticket_id": ticket_id,
+            "message": f"{message} Tk:{ticket_id}",
+            "notification_type": notif_type,
+        }
+        for user_id, ticket_id in targets
+    ])
+    return [
+        {"user_id": note.user_id, "id": note.id, "ticket_id": note.ticket_id, "message": note.message}
+        for note in notes
+    ]
+
+async def notify_tickets_ws_bulk_async(notif_type: str, payloads: List[dict]):
+    """Envia as notificações de uma operação em lote em uma única tarefa."""
+    for payload in payloads:
+        try:
+            await manager.send_to_user(
+                payload["user_id"],
+                notif_type,
+                {
+                    "id": payload["id"],
+                    "ticket_id": payload["ticket_id"],
+                    "message": payload["message"],
+                }
+            )
+        except Exception as e:
+            print(f"Erro ao criar notificação ws (async): {e}")
+
 async def notify_ticket_ws_async(user_id: int, ticket:Ticket, notif_type: str,msg: str=""):
     try:       
         await manager.send_to_user(
@@ -155,6 +198,10 @@ async def notify_ticket_wsb_async( ticket: Ticket,msg: str, notif_type: str):
         
         
 async def notify_ticket_ws_message_async(db: Session,user_id: int, id_msg: int, ticket: Ticket, notif_type: str):
+    """
+    Publica a mensagem no tópico 'ticket:<id>' (quem está com o chamado aberto), exceto
+    para as conexões do próprio autor, que já exibem a mensagem enviada.
+    """
     try:
         print("id_msg:", id_msg)
         # Busca a mensagem
@@ -181,10 +228,11 @@ async def notify_ticket_ws_message_async(db: Session,user_id: int, id_msg: int,
                     "content": message.content,
                     "sent_at": message.sent_at.isoformat()  # Formata a data como string ISO
             }
-        await manager.send_to_user(
-            user_id,
+        await manager.publish(
+            ticket_topic(ticket.id),
             notif_type,
-            msg
+            msg,
+            exclude_user_id=message.sender_id if message else None
         )
 
     except Exception as e:
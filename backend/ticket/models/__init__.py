@@ -1,4 +1,5 @@
 # backend/models/__init__.py
 from ...models.user import User
 from .ticket import Ticket
-from .message import Message
\ No newline at end of file
+from .message import Message
+from .ticket_event import TicketEvent, ProjectionOffset, TechnicianWorkload, DailyTicketCount, TicketAcceptTime
@@ -2,7 +2,7 @@
 # Arquivo: backend/ticket/models/notification.py
 #
 from datetime import datetime
-from sqlalchemy import Boolean, Column, Enum, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Boolean, Column, Enum, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -22,6 +22,10 @@ class NotificationType(str, enum.Enum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Notificações não lidas do usuário, mais recentes primeiro
+        Index("ix_notifications_user_is_read", "user_id", "is_read", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -15,6 +15,19 @@ class TicketStatus(str, enum.Enum):
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # 🔹 Índice da paginação por cursor: ORDER BY created_at DESC, id DESC
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        # 🔹 Filtros das listagens e estatísticas
+        Index("ix_tickets_status_created_at", "status", "created_at"),
+        Index("ix_tickets_requester_status", "requester_id", "status"),
+        # 🔹 "Meus chamados": filtra pelo solicitante já na ordem da paginação
+        Index("ix_tickets_requester_created_at", "requester_id", "created_at", "id"),
+        Index("ix_tickets_assignee_status", "assignee_id", "status"),
+    )
+    # 🔹 id, created_at e updated_at gerados pelo banco voltam no próprio INSERT/UPDATE (RETURNING),
+    # dispensando o refresh depois do commit
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
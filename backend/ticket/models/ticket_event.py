@@ -0,0 +1,80 @@
+# backend/ticket/models/ticket_event.py
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, Index
+from sqlalchemy.sql import func
+import enum
+from backend.database.database import Base
+
+
+class TicketEventType(str, enum.Enum):
+    created = "created"
+    accepted = "accepted"
+    reassigned = "reassigned"
+    status_changed = "status_changed"
+    closed = "closed"
+    deleted = "deleted"
+
+
+class TicketEvent(Base):
+    """
+    Fluxo append-only das mudanças de tickets, gravado pelas funções CRUD na mesma transação
+    da escrita. O id é o offset consumido pelas projeções; linhas nunca são alteradas.
+    Cada evento carrega o antes e o depois de (status, técnico), então as projeções não
+    precisam consultar a tabela tickets. Sem FK em ticket_id: o histórico sobrevive à exclusão.
+    """
+    __tablename__ = "ticket_events"
+    __table_args__ = (
+        Index("ix_ticket_events_ticket_id", "ticket_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    ticket_id = Column(Integer, nullable=False)
+    event_type = Column(String(30), nullable=False)
+    actor_id = Column(Integer, nullable=True)
+    requester_id = Column(Integer, nullable=False)
+    from_status = Column(String, nullable=True)
+    to_status = Column(String, nullable=True)
+    from_assignee_id = Column(Integer, nullable=True)
+    to_assignee_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
+
+
+# --- Projeções (tabelas de leitura dos relatórios) ---
+
+class ProjectionOffset(Base):
+    """Último evento aplicado por cada projetor."""
+    __tablename__ = "ticket_projection_offsets"
+
+    name = Column(String(50), primary_key=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+
+class TechnicianWorkload(Base):
+    """Quantidade atual de chamados por técnico e status."""
+    __tablename__ = "ticket_proj_workload"
+
+    assignee_id = Column(Integer, primary_key=True)
+    status = Column(String, primary_key=True)
+    tickets = Column(Integer, nullable=False, default=0)
+
+
+class DailyTicketCount(Base):
+    """Chamados abertos, aceitos e fechados por dia, com a soma dos tempos até o aceite."""
+    __tablename__ = "ticket_proj_daily"
+
+    day = Column(Date, primary_key=True)
+    opened = Column(Integer, nullable=False, default=0)
+    accepted = Column(Integer, nullable=False, default=0)
+    closed = Column(Integer, nullable=False, default=0)
+    accept_seconds_total = Column(Float, nullable=False, default=0)
+
+
+class TicketAcceptTime(Base):
+    """Abertura e primeiro aceite de cada chamado (base do tempo até o aceite)."""
+    __tablename__ = "ticket_proj_accept_time"
+
+    ticket_id = Column(Integer, primary_key=True)
+    opened_at = Column(DateTime(timezone=True), nullable=False)
+    accepted_at = Column(DateTime(timezone=True), nullable=True)
+    accepted_by = Column(Integer, nullable=True)
+    seconds_to_accept = Column(Float, nullable=True)
@@ -1,53 +1,122 @@
 #
 # Arquivo: backend/ticket/routers/auth_router.py (VERSÃO CORRIGIDA)
 #
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from backend.database.database import get_db
 from backend.crud.user import get_user_by_email
-from backend.core.security import create_access_token, verify_password
+from backend.core.security import (
+    create_access_token, create_refresh_token, access_claims, decode_access_token,
+    set_access_cookie, set_refresh_cookie, ACCESS_TOKEN_EXPIRE_MINUTES,
+    verify_password_async, get_password_hash_async, password_needs_rehash,
+)
+from backend.core.token_revocation import token_revocation
+from backend.core.principal_cache import principal_cache
+from backend.core.rate_limit import login_rate_limiter, client_ip_from_request, retry_after_header
+from backend.dependencies import get_current_super_admin_user, load_user
 from backend.models.user import User
-from backend.ticket.schemas.token import Token
+from backend.ticket.schemas.token import Token, RefreshRequest
 
 # --- CORREÇÃO AQUI ---
 # O 'prefix="/auth"' FOI REMOVIDO DAQUI.
 # O main.py agora é o único responsável por adicionar este prefixo.
 router = APIRouter(tags=["auth"])
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
+async def authenticate_user(db: Session, email: str, password: str) -> User | None:
     user = get_user_by_email(db, email=email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    # bcrypt fora do event loop (executor limitado em core.security)
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
+def _issue_tokens(response: Response, user: User) -> dict:
+    """Access token curto com claims de perfil + refresh token; ambos também em cookies httponly."""
+    access_token = create_access_token(data=access_claims(user))
+    refresh_token = create_refresh_token(user.id)
+    set_access_cookie(response, access_token)
+    set_refresh_cookie(response, refresh_token)
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user_e": user.email,
+        "refresh_token": refresh_token,
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+def _decode_or_none(token: Optional[str]) -> Optional[dict]:
+    if not token:
+        return None
+    try:
+        return decode_access_token(token)
+    except ValueError:
+        return None
+
 @router.post("/login", response_model=Token)
-async def login(response: Response, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, email=form_data.username, password=form_data.password)
+async def login(request: Request, response: Response, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # Limite por IP e por e-mail antes de qualquer consulta ao banco ou bcrypt
+    decision = await login_rate_limiter.check_async(client_ip_from_request(request), form_data.username)
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login. Tente novamente mais tarde.",
+            headers={"Retry-After": retry_after_header(decision)}
+        )
+
+    user = await authenticate_user(db, email=form_data.username, password=form_data.password)
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Usuário ou senha inválidos/inativo")
 
+    # Hash gerado com outro custo (BCRYPT_ROUNDS mudou): refaz com a senha que acabou de ser validada
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash_async(form_data.password)
+
     user.lastSeen = datetime.now()
     db.commit()  # salva no banco
     db.refresh(user) 
-    access_token_expires = timedelta(hours=12)
-    access_token = create_access_token(data={"sub": str(user.id)}, expires_delta=access_token_expires)
-
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        max_age=12*3600,
-        expires=12*3600,
-        secure=False,
-        samesite="lax"
-    )
-    return {"access_token": access_token, "token_type": "bearer",   "user_e": user.email}
+    principal_cache.invalidate(user.id)
+    return _issue_tokens(response, user)
+
+@router.post("/refresh", response_model=Token)
+def refresh(request: Request, response: Response, payload: Optional[RefreshRequest] = None, db: Session = Depends(get_db)):
+    """
+    Troca um refresh token válido por um novo par de tokens (rotação: o refresh usado é revogado).
+    Os claims de perfil do novo access token refletem o estado atual do usuário.
+    """
+    token = (payload.refresh_token if payload else None) or request.cookies.get("refresh_token")
+    refresh_payload = _decode_or_none(token)
+    if (
+        refresh_payload is None
+        or refresh_payload.get("type") != "refresh"
+        or token_revocation.is_revoked(refresh_payload)
+    ):
+        raise HTTPException(status_code=401, detail="Refresh token inválido ou expirado")
+
+    user = load_user(db, int(refresh_payload["sub"]))
+    if not user or not user.is_active:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado ou inativo")
+
+    token_revocation.revoke_token(refresh_payload)
+    return _issue_tokens(response, user)
 
 @router.post("/logout")
-def logout(response: Response):
+def logout(request: Request, response: Response):
+    # Revoga os tokens apresentados: deixam de valer imediatamente, sem esperar o 'exp'
+    auth_header = request.headers.get("Authorization")
+    bearer = auth_header.split("Bearer ")[1] if auth_header and auth_header.startswith("Bearer ") else None
+    for token in {bearer, request.cookies.get("access_token"), request.cookies.get("refresh_token")}:
+        token_payload = _decode_or_none(token)
+        if token_payload:
+            token_revocation.revoke_token(token_payload)
+
     response.delete_cookie("access_token")
-    return {"msg": "Logout realizado com sucesso"}
\ No newline at end of file
+    response.delete_cookie("refresh_token")
+    return {"msg": "Logout realizado com sucesso"}
+
+@router.get("/rate-limit/stats")
+async def login_rate_limit_stats(current_user: User = Depends(get_current_super_admin_user)):
+    return login_rate_limiter.stats()
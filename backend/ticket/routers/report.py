@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from backend.dependencies import get_db, get_current_admin_user
+from backend.models.user import User
+from backend.ticket.crud import ticket_report as crud_report
+from backend.ticket.schemas.report import WorkloadReportResponse, DailyTicketReportResponse
+
+router = APIRouter(
+    prefix="/tickets/reports",
+    tags=["reports"]
+)
+
+@router.get("/workload", response_model=WorkloadReportResponse, summary="Carga atual de chamados por técnico")
+async def workload_report_route(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Lido da projeção mantida a partir de ticket_events (defasagem de alguns segundos).
+    """
+    return crud_report.get_workload_report(db)
+
+@router.get("/daily", response_model=DailyTicketReportResponse, summary="Chamados abertos, aceitos e fechados por dia e tempo até o aceite")
+async def daily_report_route(
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Lido da projeção diária mantida a partir de ticket_events (defasagem de alguns segundos).
+    """
+    return crud_report.get_daily_report(db, days=days)
@@ -1,24 +1,36 @@
 import os
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, File, UploadFile, Form, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status, File, UploadFile, Form, Query
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from backend.ticket.schemas.ticket import CloseTicketRequest, TicketCreate, TicketUpdate, TicketResponse, TicketPaginationResponse
+from typing import Optional, List, Union
+from backend.ticket.schemas.ticket import CloseTicketRequest, TicketBulkRequest, TicketBulkResponse, TicketCreate, TicketUpdate, TicketResponse, TicketPaginationResponse, TicketSearchResponse, TicketSummary, TicketSummaryPaginationResponse
+from backend.ticket.schemas.dashboard import TicketStatsResponse
 from backend.ticket.crud import ticket as crud_ticket
+from backend.ticket.crud import search as crud_search
 from backend.dependencies import get_db, get_current_user, get_current_admin_user, get_current_super_admin_user
 from backend.models.user import User
 from backend.ticket.models.ticket import TicketStatus
-from backend.ticket.services.tasks import  send_ticket_closed_email_background
+from backend.ticket.services.tasks import  send_ticket_closed_email_background, send_tickets_closed_email_background
+from backend.core.http_cache import make_etag, is_not_modified, not_modified
 
 router = APIRouter(
     prefix="/tickets",
     tags=["tickets"]
 )
 
-@router.get("/my-tickets/", response_model=TicketPaginationResponse, summary="Obter meus chamados (solicitados por mim)")
+def _list_items(tickets, view: str):
+    """No modo resumido, serializa só as colunas carregadas (evita lazy loads dos campos omitidos)."""
+    if view == "summary":
+        return [TicketSummary.model_validate(t) for t in tickets]
+    return tickets
+
+@router.get("/my-tickets/", response_model=Union[TicketPaginationResponse, TicketSummaryPaginationResponse], summary="Obter meus chamados (solicitados por mim)")
 async def read_my_tickets_route(
     status: Optional[List[TicketStatus]] = Query(None, description="Filtrar por um ou mais status do chamado."),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em 'next_cursor'. Quando informado, o 'skip' é ignorado."),
+    include_total: str = Query("true", pattern="^(true|false|estimated)$", description="'true' calcula o total exato, 'estimated' usa os contadores em memória e 'false' não calcula o total."),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary' retorna apenas título, status, prioridade, categoria e datas de cada chamado."),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -26,30 +38,38 @@ async def read_my_tickets_route(
     Retorna uma lista paginada de chamados solicitados pelo usuário autenticado.
     """
     try:
-        tickets, total_tickets = crud_ticket.get_tickets(
+        tickets, total_tickets, next_cursor = crud_ticket.get_tickets(
             db,
             current_user=current_user,
             requester_id=current_user.id,
             status=status,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            view=view
         )
         
         return {
-            "items": tickets,
+            "items": _list_items(tickets, view),
             "total_tickets": total_tickets,
+            "total_is_estimate": include_total == "estimated",
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
 
-@router.get("/assigned-to-me-or-unassigned/", response_model=TicketPaginationResponse, summary="Obter chamados atribuídos a mim ou não atribuídos (para técnicos/admins)")
+@router.get("/assigned-to-me-or-unassigned/", response_model=Union[TicketPaginationResponse, TicketSummaryPaginationResponse], summary="Obter chamados atribuídos a mim ou não atribuídos (para técnicos/admins)")
 async def read_assigned_or_unassigned_tickets_route(
     status: Optional[List[TicketStatus]] = Query(None, description="Filtrar por um ou mais status do chamado."),
     include_closed_or_resolved: bool = Query(False, description="Incluir chamados resolvidos/fechados/cancelados no relatório."),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em 'next_cursor'. Quando informado, o 'skip' é ignorado."),
+    include_total: str = Query("true", pattern="^(true|false|estimated)$", description="'true' calcula o total exato, 'estimated' usa os contadores em memória e 'false' não calcula o total."),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary' retorna apenas título, status, prioridade, categoria e datas de cada chamado."),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
@@ -57,30 +77,38 @@ async def read_assigned_or_unassigned_tickets_route(
     Retorna uma lista paginada de chamados atribuídos ao técnico logado ou que não estão atribuídos.
     """
     try:
-        tickets, total_tickets = crud_ticket.get_assigned_and_unassigned_tickets(
+        tickets, total_tickets, next_cursor = crud_ticket.get_assigned_and_unassigned_tickets(
             db,
             current_user=current_user,
             status=status,
             include_closed_or_resolved=include_closed_or_resolved,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            view=view
         )
         
         return {
-            "items": tickets,
+            "items": _list_items(tickets, view),
             "total_tickets": total_tickets,
+            "total_is_estimate": include_total == "estimated",
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
 
-@router.get("/all/", response_model=TicketPaginationResponse, summary="Obter todos os chamados (apenas para Super Admins)")
+@router.get("/all/", response_model=Union[TicketPaginationResponse, TicketSummaryPaginationResponse], summary="Obter todos os chamados (apenas para Super Admins)")
 async def read_all_tickets_route(
     status: Optional[List[TicketStatus]] = Query(None, description="Filtrar por um ou mais status do chamado."),
     include_closed_or_resolved: bool = Query(False, description="Incluir chamados resolvidos/fechados/cancelados no relatório."),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em 'next_cursor'. Quando informado, o 'skip' é ignorado."),
+    include_total: str = Query("true", pattern="^(true|false|estimated)$", description="'true' calcula o total exato, 'estimated' usa os contadores em memória e 'false' não calcula o total."),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary' retorna apenas título, status, prioridade, categoria e datas de cada chamado."),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
@@ -88,34 +116,98 @@ async def read_all_tickets_route(
     Retorna uma lista paginada de todos os chamados no sistema, sem restrição de atribuição.
     """
     try:
-        tickets, total_tickets = crud_ticket.get_all_tickets(
+        tickets, total_tickets, next_cursor = crud_ticket.get_all_tickets(
             db,
             status=status,
             include_closed_or_resolved=include_closed_or_resolved,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            view=view
         )
         
         return {
-            "items": tickets,
+            "items": _list_items(tickets, view),
             "total_tickets": total_tickets,
+            "total_is_estimate": include_total == "estimated",
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro interno ao buscar todos os chamados: {e}")
 
+@router.get("/search", response_model=TicketSearchResponse, summary="Buscar chamados por texto (título, descrição e mensagens)")
+async def search_tickets_route(
+    q: str = Query(..., min_length=2, description="Texto a buscar no título, na descrição e nas mensagens do chamado."),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em 'next_cursor'."),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Retorna os chamados que casam com o texto, do mais relevante para o menos relevante.
+    Técnicos veem apenas chamados atribuídos a eles, não atribuídos ou abertos por eles; Super Admins veem todos.
+    """
+    tickets, next_cursor = crud_search.search_tickets(db, current_user=current_user, q=q, limit=limit, cursor=cursor)
+    return {
+        "items": tickets,
+        "limit": limit,
+        "next_cursor": next_cursor
+    }
+
+@router.post("/bulk", response_model=TicketBulkResponse, summary="Atribuir, alterar status ou fechar vários chamados de uma vez")
+async def bulk_tickets_route(
+    payload: TicketBulkRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Aplica a mesma ação a uma lista de chamados em uma única transação e retorna o
+    resultado de cada id. Os e-mails de fechamento são enviados em uma única tarefa.
+    """
+    try:
+        results = crud_ticket.bulk_update_tickets(
+            db=db,
+            current_user=current_user,
+            ticket_ids=payload.ticket_ids,
+            action=payload.action,
+            assignee_id=payload.assignee_id,
+            status=payload.status,
+            observation=payload.observation
+        )
+    except HTTPException as e:
+        raise e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro interno na operação em lote: {e}")
+
+    updated_ids = [item["ticket_id"] for item in results if item["ok"]]
+    if payload.action == "close":
+        send_tickets_closed_email_background(background_tasks=background_tasks, ticket_ids=updated_ids)
+
+    return {"action": payload.action, "updated": len(updated_ids), "results": results}
+
 @router.get("/{ticket_id}", response_model=TicketResponse, summary="Obter um chamado por ID")
 async def read_ticket_route(
     ticket_id: int, 
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_user)
 ):
     """
     Retorna os detalhes de um chamado específico.
     O acesso é permitido ao solicitante, ao técnico atribuído ou a um Super Admin.
+    Suporta GET condicional: com If-None-Match igual ao ETag atual, responde 304 sem recarregar o chamado.
     """
-    db_ticket = crud_ticket.get_ticket(db, ticket_id=ticket_id)
+    # Checagem leve primeiro: permissões + versão, sem hidratar o ticket e os usuários
+    db_ticket = crud_ticket.get_ticket_version(db, ticket_id=ticket_id)
     if not db_ticket:
         raise HTTPException(status_code=404, detail="Ticket não encontrado.")
     
@@ -132,7 +224,13 @@ async def read_ticket_route(
     if not (is_requester or is_assignee or is_super_admin):
         raise HTTPException(status_code=403, detail="Você não tem permissão para visualizar este chamado.")
 
-    return db_ticket
+    etag = make_etag("ticket", db_ticket.id, db_ticket.updated_at, db_ticket.assignee_id,
+                     db_ticket.requester_updated_at, db_ticket.assignee_updated_at)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    return crud_ticket.get_ticket(db, ticket_id=ticket_id)
 
 @router.post("/", response_model=TicketResponse, summary="Criar um novo chamado", status_code=status.HTTP_201_CREATED)
 async def create_ticket_route(
@@ -247,7 +345,7 @@ async def update_ticket_route(
             raise HTTPException(status_code=403, detail="Você não pode atribuir este chamado a outro técnico.")
 
     try:
-        updated_ticket = crud_ticket.update_ticket(db, db_ticket, ticket_update, attachment=attachment)
+        updated_ticket = crud_ticket.update_ticket(db, db_ticket, ticket_update, attachment=attachment, actor_id=current_user.id)
         return updated_ticket
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -270,7 +368,7 @@ async def delete_ticket_route(
     if not (db_ticket.requester_id == current_user.id or current_user.is_super_admin):
         raise HTTPException(status_code=403, detail="Você não tem permissão para deletar este chamado.")
     
-    crud_ticket.delete_ticket(db, ticket_id=ticket_id)
+    crud_ticket.delete_ticket(db, ticket_id=ticket_id, actor_id=current_user.id)
     return {"message": "Ticket deletado com sucesso."}
 
 @router.post("/{ticket_id}/accept", response_model=TicketResponse, summary="Aceitar um chamado (para técnicos)")
@@ -317,7 +415,7 @@ async def close_ticket_route(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
         
-@router.get("/stats/", summary="Obter estatísticas de tickets para o usuário logado")
+@router.get("/stats/", response_model=TicketStatsResponse, response_model_exclude_none=True, summary="Obter estatísticas de tickets para o usuário logado")
 async def get_stats_route(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
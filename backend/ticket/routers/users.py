@@ -10,6 +10,8 @@ from backend.dependencies import get_current_user, get_current_super_admin_user,
 # --- MUDANÇA AQUI ---
 # Importamos os schemas necessários, incluindo o nosso novo 'UserRead'.
 from backend.ticket.schemas.user import UserCreate, UserUpdate, UserRead 
+from backend.core.principal_cache import principal_cache
+from backend.core.token_cache import verified_token_cache
 
 router = APIRouter(
     prefix="/users",
@@ -39,6 +41,11 @@ async def read_users_me(current_user: UserRead = Depends(get_current_user)):
     print("Current User:", current_user)  # para depuração
     return current_user
 
+# Métricas dos caches de autenticação (usuário e tokens verificados)
+@router.get("/cache-stats/", tags=["users"])
+async def auth_cache_stats(current_user = Depends(get_current_super_admin_user)):
+    return {"principal": principal_cache.stats(), "tokens": verified_token_cache.stats()}
+
 # As outras rotas também são atualizadas para usar UserRead nas respostas
 @router.get("/", response_model=List[UserRead])
 def read_users_route(
@@ -0,0 +1,33 @@
+# backend/ticket/schemas/report.py
+from datetime import date
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+
+class TechnicianWorkloadItem(BaseModel):
+    assignee_id: int
+    email: Optional[str] = None
+    # Quantidade de chamados por status
+    by_status: Dict[str, int]
+    total: int
+
+class WorkloadReportResponse(BaseModel):
+    items: List[TechnicianWorkloadItem]
+    # Último evento já refletido nas projeções
+    last_event_id: int
+
+class DailyTicketReportItem(BaseModel):
+    day: date
+    opened: int
+    accepted: int
+    closed: int
+    # Média do tempo entre abertura e primeiro aceite (None se não houve aceite no dia)
+    avg_seconds_to_accept: Optional[float] = None
+
+class DailyTicketReportResponse(BaseModel):
+    items: List[DailyTicketReportItem]
+    opened: int
+    accepted: int
+    closed: int
+    avg_seconds_to_accept: Optional[float] = None
+    last_event_id: int
@@ -1,6 +1,6 @@
 # backend/schemas/ticket.py
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Literal
 from datetime import datetime
 from backend.ticket.models.ticket import TicketStatus
 from backend.ticket.schemas.user import UserBase 
@@ -100,12 +100,99 @@ class TicketPaginationResponse(BaseModel):
     Schema para encapsular a resposta de uma lista de tickets paginada.
     """
     items: List[TicketResponse]
-    total_tickets: int
+    # None quando o cliente pede include_total=false
+    total_tickets: Optional[int] = None
+    # True quando o total veio dos contadores em memória (include_total=estimated)
+    total_is_estimate: bool = False
     skip: int
     limit: int
+    # Cursor opaco para a próxima página (None quando não há mais resultados)
+    next_cursor: Optional[str] = None
     
     class Config:
         from_attributes = True
 
+# --- PROJEÇÃO RESUMIDA (view=summary) ---
+
+class TicketSummary(BaseModel):
+    """
+    Versão enxuta do ticket para páginas de listagem: sem descrição, observação,
+    anexo e sem os objetos de usuário.
+    """
+    id: int
+    title: str
+    category: str
+    priority: str
+    status: TicketStatus
+    requester_id: int
+    assignee_id: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+        use_enum_values = True
+
+class TicketSummaryPaginationResponse(BaseModel):
+    """
+    Mesmo envelope de TicketPaginationResponse, com itens resumidos.
+    """
+    items: List[TicketSummary]
+    total_tickets: Optional[int] = None
+    total_is_estimate: bool = False
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None
+
+# --- BUSCA TEXTUAL ---
+
+class TicketSearchHit(TicketResponse):
+    # Relevância do resultado (maior = mais relevante)
+    search_rank: float
+
+class TicketSearchResponse(BaseModel):
+    """
+    Resultado da busca textual, ordenado por relevância e paginado por cursor.
+    """
+    items: List[TicketSearchHit]
+    limit: int
+    next_cursor: Optional[str] = None
+
 class CloseTicketRequest(BaseModel):
-    observation: Optional[str] = None
\ No newline at end of file
+    observation: Optional[str] = None
+
+# --- OPERAÇÕES EM LOTE ---
+
+class TicketBulkRequest(BaseModel):
+    """
+    Aplica a mesma ação a vários chamados em uma única transação.
+    - assign: atribui todos a assignee_id;
+    - status: muda o status de todos para 'status';
+    - close: fecha todos (mesmas regras de POST /tickets/{id}/close), com observação opcional.
+    """
+    ticket_ids: List[int] = Field(..., min_length=1, max_length=500)
+    action: Literal["assign", "status", "close"]
+    assignee_id: Optional[int] = None
+    status: Optional[TicketStatus] = None
+    observation: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_action_fields(self):
+        if self.action == "assign" and self.assignee_id is None:
+            raise ValueError("assignee_id é obrigatório para a ação 'assign'.")
+        if self.action == "status" and self.status is None:
+            raise ValueError("status é obrigatório para a ação 'status'.")
+        # Ids repetidos são aplicados uma única vez, mantendo a ordem original
+        self.ticket_ids = list(dict.fromkeys(self.ticket_ids))
+        return self
+
+class TicketBulkItemResult(BaseModel):
+    ticket_id: int
+    ok: bool
+    # Motivo da recusa quando ok=False
+    detail: Optional[str] = None
+
+class TicketBulkResponse(BaseModel):
+    action: str
+    updated: int
+    results: List[TicketBulkItemResult]
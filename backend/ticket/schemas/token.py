@@ -5,6 +5,13 @@ class Token(BaseModel): # <-- Verifique se o nome da classe é "Token" com 'T' m
     access_token: str
     token_type: str
     user_e:str
+    # Renovação do access token (POST /auth/refresh); também vai no cookie httponly
+    refresh_token: str | None = None
+    expires_in: int | None = None  # segundos de validade do access token
+
+class RefreshRequest(BaseModel):
+    # Opcional: sem corpo, usa o cookie refresh_token
+    refresh_token: str | None = None
 
 class TokenData(BaseModel):
     id: int | None = None
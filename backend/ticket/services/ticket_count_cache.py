@@ -0,0 +1,58 @@
+# backend/ticket/services/ticket_count_cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import FrozenSet, NamedTuple, Optional
+
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("TICKET_COUNT_CACHE_TTL_SECONDS", 30))
+COUNT_CACHE_MAX_ENTRIES = int(os.getenv("TICKET_COUNT_CACHE_MAX_ENTRIES", 512))
+
+
+class TicketCountSignature(NamedTuple):
+    """Assinatura normalizada dos filtros de uma listagem de tickets."""
+    scope: str                          # "requester" | "assigned_or_unassigned" | "all"
+    user_id: Optional[int]              # solicitante ou técnico, conforme o escopo
+    statuses: Optional[FrozenSet[str]]  # None = sem filtro de status
+    include_closed: bool
+
+
+class TicketCountCache:
+    """
+    Cache dos totais (COUNT) das listagens paginadas, indexado pela assinatura dos filtros.
+    Qualquer escrita em tickets limpa o cache inteiro; o TTL limita a defasagem em relação
+    a escritas feitas por outros workers.
+    """
+
+    def __init__(self, ttl_seconds: float = COUNT_CACHE_TTL_SECONDS, max_entries: int = COUNT_CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[TicketCountSignature, tuple[int, float]]" = OrderedDict()
+
+    def get(self, signature: TicketCountSignature) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is None:
+                return None
+            total, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[signature]
+                return None
+            self._entries.move_to_end(signature)
+            return total
+
+    def set(self, signature: TicketCountSignature, total: int):
+        with self._lock:
+            self._entries[signature] = (total, time.monotonic() + self._ttl)
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Instância global
+ticket_count_cache = TicketCountCache()
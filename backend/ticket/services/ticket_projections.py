@@ -0,0 +1,153 @@
+# backend/ticket/services/ticket_projections.py
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Tuple
+from sqlalchemy.orm import Session
+from backend.database.database import SessionLocal
+from backend.ticket.crud.ticket_event import get_events_after
+from backend.ticket.models.ticket_event import (
+    TicketEvent, TicketEventType, ProjectionOffset,
+    TechnicianWorkload, DailyTicketCount, TicketAcceptTime,
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECTION_INTERVAL_SECONDS = float(os.getenv("TICKET_PROJECTION_INTERVAL_SECONDS", 10))
+PROJECTION_BATCH_SIZE = int(os.getenv("TICKET_PROJECTION_BATCH_SIZE", 500))
+# Eventos mais novos que isso ficam para a próxima rodada: no PostgreSQL os ids da sequência
+# podem ser commitados fora de ordem, e um evento com id menor que ainda não ficou visível
+# seria pulado para sempre se o offset passasse à frente dele.
+PROJECTION_SAFETY_LAG_SECONDS = float(os.getenv("TICKET_PROJECTION_SAFETY_LAG_SECONDS", 5))
+
+
+class TicketProjector:
+    """
+    Consome ticket_events por offset e mantém as projeções dos relatórios:
+    carga por técnico, contagens diárias (abertos/aceitos/fechados) e tempo até o aceite.
+
+    Cada lote aplica os eventos e avança o offset na mesma transação, então um evento é
+    projetado exatamente uma vez mesmo que o processo caia no meio. A linha do offset é
+    travada durante o lote, o que serializa vários workers rodando o projetor.
+    """
+
+    NAME = "ticket_reports"
+
+    def __init__(self):
+        self.is_running = False
+
+    # --- Aplicação dos eventos ---
+
+    def _get(self, db: Session, cache: Dict[Tuple, object], model, pk: Tuple):
+        # A sessão não faz autoflush: linhas criadas neste lote só existem no cache
+        key = (model.__tablename__, pk)
+        if key not in cache:
+            cache[key] = db.get(model, pk)
+        return cache[key]
+
+    def _get_or_add(self, db: Session, cache: Dict[Tuple, object], model, pk: Tuple, **values):
+        row = self._get(db, cache, model, pk)
+        if row is None:
+            row = model(**values)
+            db.add(row)
+            cache[(model.__tablename__, pk)] = row
+        return row
+
+    def _workload(self, db: Session, cache: Dict[Tuple, object], assignee_id: int, status: str) -> TechnicianWorkload:
+        return self._get_or_add(db, cache, TechnicianWorkload, (assignee_id, status),
+                                assignee_id=assignee_id, status=status, tickets=0)
+
+    def _daily(self, db: Session, cache: Dict[Tuple, object], day) -> DailyTicketCount:
+        return self._get_or_add(db, cache, DailyTicketCount, (day,),
+                                day=day, opened=0, accepted=0, closed=0, accept_seconds_total=0.0)
+
+    def _apply(self, db: Session, cache: Dict[Tuple, object], event: TicketEvent):
+        # Carga por técnico: sai do (técnico, status) antigo e entra no novo
+        if event.from_assignee_id is not None and event.from_status is not None:
+            self._workload(db, cache, event.from_assignee_id, event.from_status).tickets -= 1
+        if event.to_assignee_id is not None and event.to_status is not None:
+            self._workload(db, cache, event.to_assignee_id, event.to_status).tickets += 1
+
+        day = event.created_at.date()
+        if event.event_type == TicketEventType.created.value:
+            self._daily(db, cache, day).opened += 1
+            self._get_or_add(db, cache, TicketAcceptTime, (event.ticket_id,),
+                             ticket_id=event.ticket_id, opened_at=event.created_at)
+        elif event.event_type == TicketEventType.closed.value:
+            self._daily(db, cache, day).closed += 1
+        elif event.event_type == TicketEventType.accepted.value:
+            daily = self._daily(db, cache, day)
+            daily.accepted += 1
+            accept_time = self._get(db, cache, TicketAcceptTime, (event.ticket_id,))
+            # Só o primeiro aceite conta; tickets anteriores ao fluxo de eventos não têm abertura registrada
+            if accept_time is not None and accept_time.accepted_at is None:
+                seconds = max((event.created_at - accept_time.opened_at).total_seconds(), 0.0)
+                accept_time.accepted_at = event.created_at
+                accept_time.accepted_by = event.actor_id
+                accept_time.seconds_to_accept = seconds
+                daily.accept_seconds_total += seconds
+
+    def run_batch(self, db: Session, batch_size: int = PROJECTION_BATCH_SIZE) -> int:
+        """Aplica até batch_size eventos pendentes; retorna quantos foram aplicados."""
+        offset = db.query(ProjectionOffset)\
+                   .filter(ProjectionOffset.name == self.NAME)\
+                   .with_for_update().first()
+        if offset is None:
+            offset = ProjectionOffset(name=self.NAME, last_event_id=0)
+            db.add(offset)
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=PROJECTION_SAFETY_LAG_SECONDS)
+        events = get_events_after(db, offset.last_event_id, limit=batch_size, created_before=cutoff)
+        if not events:
+            db.rollback()
+            return 0
+
+        cache: Dict[Tuple, object] = {}
+        for event in events:
+            self._apply(db, cache, event)
+        offset.last_event_id = events[-1].id
+        db.commit()
+        return len(events)
+
+    def catch_up(self) -> int:
+        """Processa lotes até não haver eventos pendentes."""
+        db = SessionLocal()
+        applied = 0
+        try:
+            while True:
+                count = self.run_batch(db)
+                applied += count
+                if count < PROJECTION_BATCH_SIZE:
+                    return applied
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # --- Agendador ---
+
+    async def start_scheduler(self):
+        """Executa o projetor periodicamente (fora do event loop, em uma thread)."""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        logger.info("📊 Projetor de relatórios de tickets iniciado")
+
+        while self.is_running:
+            try:
+                applied = await asyncio.to_thread(self.catch_up)
+                if applied:
+                    logger.info(f"📊 {applied} eventos de tickets projetados")
+            except Exception as e:
+                logger.error(f"❌ Erro no projetor de tickets: {e}")
+            await asyncio.sleep(PROJECTION_INTERVAL_SECONDS)
+
+    def stop(self):
+        self.is_running = False
+
+
+# Instância global
+ticket_projector = TicketProjector()
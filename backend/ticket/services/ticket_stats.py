@@ -0,0 +1,143 @@
+# backend/ticket/services/ticket_stats.py
+import os
+import threading
+import time
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from backend.ticket.models.ticket import Ticket, TicketStatus
+
+# (status, requester_id, assignee_id) de um ticket
+TicketKey = Tuple[str, int, Optional[int]]
+
+STATS_RESYNC_SECONDS = int(os.getenv("TICKET_STATS_RESYNC_SECONDS", 300))
+
+
+class TicketStatsStore:
+    """
+    Contadores de tickets em memória, mantidos incrementalmente pelas funções CRUD.
+
+    A carga inicial é uma única agregação agrupada por (status, requester_id, assignee_id).
+    Depois disso, cada escrita aplica apenas o delta (chave antiga -> chave nova), e as
+    leituras de estatísticas viram consultas O(1) nos contadores. Como o processo pode não
+    enxergar escritas feitas por outros workers, os contadores são recarregados do banco
+    a cada STATS_RESYNC_SECONDS.
+    """
+
+    def __init__(self, resync_seconds: int = STATS_RESYNC_SECONDS):
+        self._lock = threading.Lock()
+        self._resync_seconds = resync_seconds
+        self._loaded_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self):
+        self.by_status: Counter = Counter()
+        self.by_requester: Counter = Counter()
+        self.by_requester_status: Counter = Counter()
+        self.by_assignee_status: Counter = Counter()
+
+    def _add(self, key: TicketKey, delta: int):
+        status, requester_id, assignee_id = key
+        self.by_status[status] += delta
+        self.by_requester[requester_id] += delta
+        self.by_requester_status[(requester_id, status)] += delta
+        # assignee_id None também é contado (tickets não atribuídos)
+        self.by_assignee_status[(assignee_id, status)] += delta
+
+    def load(self, db: Session):
+        """Recarrega todos os contadores com uma única consulta agrupada."""
+        rows = db.query(Ticket.status, Ticket.requester_id, Ticket.assignee_id, func.count(Ticket.id))\
+                 .group_by(Ticket.status, Ticket.requester_id, Ticket.assignee_id).all()
+        with self._lock:
+            self._reset()
+            for status, requester_id, assignee_id, total in rows:
+                self._add((status, requester_id, assignee_id), total)
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session):
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self._resync_seconds:
+            self.load(db)
+
+    def invalidate(self):
+        """Força a recarga na próxima leitura."""
+        with self._lock:
+            self._loaded_at = None
+
+    def apply(self, old: Optional[TicketKey], new: Optional[TicketKey]):
+        """Aplica a mudança de um ticket (None em 'old' = criação, None em 'new' = exclusão)."""
+        if old == new:
+            return
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if old is not None:
+                self._add(old, -1)
+            if new is not None:
+                self._add(new, 1)
+
+    def estimate_count(
+        self,
+        db: Session,
+        scope: str,
+        user_id: Optional[int],
+        statuses: Optional[Iterable[str]],
+        excluded_statuses: Iterable[str] = (),
+    ) -> int:
+        """
+        Estima o total de uma listagem a partir dos contadores, sem COUNT no banco.
+        É exato dentro do processo, mas pode divergir de escritas feitas por outros workers
+        até a próxima recarga.
+        """
+        self.ensure_loaded(db)
+        excluded = set(excluded_statuses)
+        with self._lock:
+            candidates = statuses if statuses is not None else list(self.by_status.keys())
+            wanted = [s for s in candidates if s not in excluded]
+            if scope == "requester":
+                if statuses is None and not excluded:
+                    return self.by_requester[user_id]
+                return sum(self.by_requester_status[(user_id, s)] for s in wanted)
+            if scope == "assigned_or_unassigned":
+                return sum(self.by_assignee_status[(user_id, s)] + self.by_assignee_status[(None, s)] for s in wanted)
+            return sum(self.by_status[s] for s in wanted)
+
+    def stats_for_user(self, db: Session, current_user) -> dict:
+        """Monta o mesmo dicionário de TicketStatsResponse a partir dos contadores."""
+        self.ensure_loaded(db)
+        open_ = TicketStatus.open.value
+        in_progress = TicketStatus.in_progress.value
+        closed = TicketStatus.closed.value
+        resolved = TicketStatus.resolved.value
+
+        with self._lock:
+            if current_user.is_super_admin:
+                return {
+                    "open_tickets_all_techs": self.by_status[open_],
+                    "in_progress_tickets_all": self.by_status[in_progress],
+                    "closed_tickets_all": self.by_status[closed] + self.by_status[resolved],
+                    "total_resolved_all_techs": self.by_status[resolved],
+                }
+            if current_user.is_admin:
+                return {
+                    "open_tickets_assigned_to_me": self.by_assignee_status[(current_user.id, open_)],
+                    "in_progress_tickets_all": self.by_status[in_progress],
+                    "closed_by_me": self.by_assignee_status[(current_user.id, closed)],
+                    "total_resolved_all_techs": self.by_status[resolved],
+                }
+            return {
+                "open_tickets": self.by_requester_status[(current_user.id, open_)],
+                "in_progress_tickets": self.by_requester_status[(current_user.id, in_progress)],
+                "closed_tickets": self.by_requester_status[(current_user.id, closed)]
+                                  + self.by_requester_status[(current_user.id, resolved)],
+                "total_created_by_me": self.by_requester[current_user.id],
+            }
+
+
+def ticket_key(ticket: Ticket) -> TicketKey:
+    return (ticket.status, ticket.requester_id, ticket.assignee_id)
+
+
+# Instância global
+ticket_stats_store = TicketStatsStore()
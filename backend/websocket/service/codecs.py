@@ -0,0 +1,53 @@
+# backend/websocket/service/codecs.py
+import json
+from typing import Optional, Union
+
+try:
+    import msgpack  # em requirements.txt; se faltar no ambiente, todos os clientes recebem JSON
+except ImportError:
+    msgpack = None
+
+# Codificação dos frames enviados, escolhida na conexão: /ws?token=...&encoding=msgpack
+# - json: frame de texto, JSON compacto (sem espaços; acentos em UTF-8, sem \uXXXX);
+# - msgpack: frame binário com o mesmo envelope {"type", "message"}.
+# As mensagens do cliente (subscribe, pong) continuam em JSON texto nos dois casos.
+# A compressão permessage-deflate é negociada entre o navegador e o servidor ASGI
+# (uvicorn a habilita por padrão, opção --ws-per-message-deflate) e vale para os dois.
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+
+
+def available_codecs() -> list:
+    return [CODEC_JSON, CODEC_MSGPACK] if msgpack is not None else [CODEC_JSON]
+
+
+def negotiate_codec(requested: Optional[str]) -> str:
+    """Codificação pedida pelo cliente, se suportada; senão JSON."""
+    if requested and requested.lower() in available_codecs():
+        return requested.lower()
+    return CODEC_JSON
+
+
+def encode(codec: str, envelope: dict) -> Union[str, bytes]:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(envelope, use_bin_type=True)
+    return json.dumps(envelope, separators=(",", ":"), ensure_ascii=False)
+
+
+class Frame:
+    """
+    Mensagem a enviar ({"type", "message"}), codificada sob demanda no máximo uma vez por
+    codificação: num fan-out, todas as conexões com o mesmo codec recebem os mesmos bytes.
+    """
+    __slots__ = ("type", "envelope", "_encoded")
+
+    def __init__(self, type: str, message):
+        self.type = type
+        self.envelope = {"type": type, "message": message}
+        self._encoded: dict = {}
+
+    def encode(self, codec: str) -> Union[str, bytes]:
+        data = self._encoded.get(codec)
+        if data is None:
+            data = self._encoded[codec] = encode(codec, self.envelope)
+        return data
@@ -1,27 +1,75 @@
+import asyncio
 import json
 import os
+import time
+from collections import Counter
 from dotenv import load_dotenv
 from fastapi import WebSocket
 from jose import jwt, JWTError
-from typing import List
+from typing import Callable, Iterable, Optional
 
 from backend.core.security import decode_access_token
+from backend.core.token_revocation import token_revocation
+from backend.websocket.service.outbound import ConnectionWriter, WS_QUEUE_MAX_SIZE, WS_SEND_TIMEOUT_SECONDS
+from backend.websocket.service.topics import can_subscribe, is_valid_topic
+from backend.websocket.service.pubsub import InProcessPubSubBackend, PubSubBackend
+from backend.websocket.service.codecs import CODEC_JSON, Frame, negotiate_codec
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
+class ClientConnection:
+    """Estado de uma conexão registrada: dono, fila de saída e metadados."""
+    __slots__ = ("websocket", "user_id", "writer", "codec", "connected_at", "last_activity", "subscriptions", "topic_options")
+
+    def __init__(self, websocket: WebSocket, user_id: int, writer: ConnectionWriter, codec: str = CODEC_JSON):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.writer = writer
+        self.codec = codec
+        self.connected_at = time.time()
+        self.last_activity = self.connected_at
+        self.subscriptions: set[str] = set()
+        # Opções enviadas na assinatura (ex.: {"interval": 5} em system_stats)
+        self.topic_options: dict[str, dict] = {}
+
+
 # backend/connection_manager.py
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, pubsub: Optional[PubSubBackend] = None):
+        # send_to_user/broadcast/publish passam pelo pub/sub, que entrega em todos os workers
+        self.pubsub = pubsub or InProcessPubSubBackend()
+        self.pubsub.deliver = self.deliver
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         # Cada user_id pode ter várias conexões (multi-aba, multi-device)
-        self.active_connections: dict[int, list[WebSocket]] = {}
+        self.active_connections: dict[int, set[WebSocket]] = {}
+        # Índice reverso websocket -> conexão (dono, fila e metadados): tudo em O(1)
+        self.connections: dict[WebSocket, ClientConnection] = {}
+        # Tópico -> conexões assinantes
+        self.topics: dict[str, set[WebSocket]] = {}
+        # Chamados a cada nova assinatura do tópico (ex.: para acordar quem só publica sob demanda)
+        self._subscribe_listeners: dict[str, list[Callable[[], None]]] = {}
+        self.evicted = 0
+
+    @property
+    def connection_count(self) -> int:
+        return len(self.connections)
+
+    def get_connection(self, websocket: WebSocket) -> Optional[ClientConnection]:
+        return self.connections.get(websocket)
+
+    def touch(self, websocket: WebSocket):
+        """Marca atividade do cliente (mensagem recebida)."""
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            connection.last_activity = time.time()
 
-    async def connect(self, websocket: WebSocket, token: str):
+    async def connect(self, websocket: WebSocket, token: str, encoding: Optional[str] = None):
         await websocket.accept()
         try:
-            payload = decode_access_token(token)
+            payload = self._authenticate(websocket, token)
             print("WebSocket Payload JWT:", payload)  # para depuração
             
             # Tenta pegar 'user_id' ou 'sub'
@@ -38,10 +86,30 @@ class ConnectionManager:
             await websocket.close(code=1008)
             return
 
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
-        print(f"🔗 Cliente conectado via WS: {user_id}")
+        codec = negotiate_codec(encoding)
+        self._register(user_id, websocket, codec)
+        print(f"🔗 Cliente conectado via WS: {user_id} ({codec})")
+
+    def _register(self, user_id: int, websocket: WebSocket, codec: str = CODEC_JSON):
+        writer = ConnectionWriter(websocket, on_dead=self.disconnect)
+        self.connections[websocket] = ClientConnection(websocket, user_id, writer, codec)
+        self.active_connections.setdefault(user_id, set()).add(websocket)
+
+    def _authenticate(self, websocket: WebSocket, token: str) -> dict:
+        """
+        Valida o access token da query string. Se ele já venceu (o cliente reconecta com o
+        token guardado no login), aceita o refresh_token do cookie enviado no handshake.
+        """
+        for candidate, token_type in ((token, "access"), (websocket.cookies.get("refresh_token"), "refresh")):
+            if not candidate:
+                continue
+            try:
+                payload = decode_access_token(candidate)
+            except ValueError:
+                continue
+            if payload.get("type", "access") == token_type and not token_revocation.is_revoked(payload):
+                return payload
+        raise ValueError("Token inválido, expirado ou revogado")
 
     async def connect_OLD(self, websocket: WebSocket, token: str):
         try:
@@ -60,27 +128,208 @@ class ConnectionManager:
         print(f"🔗 Cliente conectado: {user_id}")
 
     def disconnect(self, websocket: WebSocket):
-        for user_id, conns in list(self.active_connections.items()):
-            if websocket in conns:
-                conns.remove(websocket)
-                if not conns:
-                    del self.active_connections[user_id]
-                print(f"❌ Cliente {user_id} desconectado")
-                break
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return
+        connection.writer.close()
+        for topic in connection.subscriptions:
+            self._remove_subscriber(topic, websocket)
+        conns = self.active_connections.get(connection.user_id)
+        if conns is not None:
+            conns.discard(websocket)
+            if not conns:
+                del self.active_connections[connection.user_id]
+        print(f"❌ Cliente {connection.user_id} desconectado")
+
+    # --- Tópicos ---
+    def subscribe(self, websocket: WebSocket, topic: str, options: Optional[dict] = None):
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        connection.subscriptions.add(topic)
+        if options:
+            connection.topic_options[topic] = options
+        self.topics.setdefault(topic, set()).add(websocket)
+        for listener in self._subscribe_listeners.get(topic, ()):
+            listener()
+
+    def add_subscribe_listener(self, topic: str, listener: Callable[[], None]):
+        self._subscribe_listeners.setdefault(topic, []).append(listener)
+
+    def unsubscribe(self, websocket: WebSocket, topic: str):
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        connection.subscriptions.discard(topic)
+        connection.topic_options.pop(topic, None)
+        self._remove_subscriber(topic, websocket)
+
+    def _remove_subscriber(self, topic: str, websocket: WebSocket):
+        subscribers = self.topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self.topics[topic]
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self.topics.get(topic, ()))
+
+    async def handle_client_message(self, websocket: WebSocket, data: str):
+        """
+        Mensagens de controle do cliente: {"action": "subscribe" | "unsubscribe", "topic"/"topics"}.
+        Os demais campos de um subscribe são guardados como opções do tópico.
+        Responde com as assinaturas atuais ("subscriptions") ou com "error".
+        {"action": "pong"} (resposta ao ping do heartbeat) só conta como atividade.
+        """
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        try:
+            request = json.loads(data)
+            action = request.get("action")
+        except (ValueError, AttributeError):
+            return  # texto livre: ignorado
+        if action not in ("subscribe", "unsubscribe"):
+            return
+
+        topics = request.get("topics") or [request.get("topic")]
+        options = {key: value for key, value in request.items() if key not in ("action", "topic", "topics")}
+        denied = []
+        for topic in topics:
+            if not isinstance(topic, str) or not is_valid_topic(topic):
+                denied.append(topic)
+            elif action == "unsubscribe":
+                self.unsubscribe(websocket, topic)
+            elif topic in connection.subscriptions:
+                if options:
+                    self.subscribe(websocket, topic, options)
+            # A checagem de permissão consulta o banco: fora do event loop
+            elif await asyncio.to_thread(can_subscribe, connection.user_id, topic):
+                self.subscribe(websocket, topic, options)
+            else:
+                denied.append(topic)
+
+        if denied:
+            self._fan_out([websocket], Frame("error", {
+                "action": action,
+                "topics": denied,
+                "detail": "Tópico inválido ou sem permissão.",
+            }))
+        self._fan_out([websocket], Frame("subscriptions", sorted(connection.subscriptions)))
+
+    async def publish(self, topic: str, type: str, message, exclude_user_id: Optional[int] = None):
+        """Envia só para as conexões assinantes do tópico (opcionalmente sem as de um usuário)."""
+        await self.pubsub.publish({
+            "topic": topic, "type": type, "message": message, "exclude_user_id": exclude_user_id
+        })
+
+    def send_frame(self, conns: Iterable[WebSocket], frame: Frame):
+        """Enfileira um Frame (quem publica pode reaproveitá-lo entre envios; a codificação fica em cache)."""
+        self._fan_out(list(conns), frame)
+
+    def _fan_out(self, conns: Iterable[WebSocket], frame: Frame):
+        """
+        Enfileira o frame na fila de cada conexão, sem esperar o envio. Ele é codificado
+        uma vez por codec (JSON/MessagePack) e os mesmos dados vão para todas as conexões.
+        Conexões cuja fila continua cheia além da tolerância são derrubadas.
+        """
+        for conn in conns:
+            connection = self.connections.get(conn)
+            if connection is not None and not connection.writer.enqueue(frame.type, frame.encode(connection.codec)):
+                self._evict(conn)
+
+    def _evict(self, websocket: WebSocket):
+        print("⚠️ Cliente WS lento demais (fila cheia); removendo conexão")
+        self.evicted += 1
+        # 1013: "tente novamente mais tarde"
+        self.close_connection(websocket, 1013)
+
+    def close_connection(self, websocket: WebSocket, code: int):
+        """Desregistra a conexão na hora e fecha o socket em segundo plano."""
+        self.disconnect(websocket)
+        # O close também pode travar num socket parado
+        asyncio.create_task(self._close_quietly(websocket, code))
+
+    async def _close_quietly(self, websocket: WebSocket, code: int):
+        try:
+            await asyncio.wait_for(websocket.close(code=code), WS_SEND_TIMEOUT_SECONDS)
+        except Exception:
+            pass
+
+    def queue_stats(self) -> dict:
+        """Profundidade das filas de saída e contadores de descarte/coalescência/remoção."""
+        writers = [connection.writer for connection in self.connections.values()]
+        depths = [writer.depth for writer in writers]
+        return {
+            "connections": len(writers),
+            "queued": sum(depths),
+            "max_depth": max(depths, default=0),
+            "full": sum(1 for writer in writers if writer.full_since is not None),
+            "max_size": WS_QUEUE_MAX_SIZE,
+            "sent": sum(writer.sent for writer in writers),
+            "dropped": sum(writer.dropped for writer in writers),
+            "coalesced": sum(writer.coalesced for writer in writers),
+            "evicted": self.evicted,
+            "codecs": dict(Counter(connection.codec for connection in self.connections.values())),
+        }
 
     async def send_to_user(self, user_id: int,type:str, message: str):
         
         """Envia notificação só para o usuário específico"""
-        if user_id in self.active_connections:
-            for conn in self.active_connections[user_id]:
-                print(f"Enviando mensagem para usuário {user_id}: {message}")
-                await conn.send_text(json.dumps(self.set_msg(type, message)))
-                # await conn.send_text(json.dumps(self.set_msg(type, message)))
+        await self.pubsub.publish({"user_id": user_id, "type": type, "message": message})
 
     async def broadcast(self, type:str, message: str):
-        for conns in self.active_connections.values():
-            for conn in conns:
-                await conn.send_text(json.dumps(self.set_msg(type, message)))
+        await self.pubsub.publish({"type": type, "message": message})
+
+    async def start(self):
+        """Inicia o pub/sub e guarda o loop para publish_threadsafe."""
+        self._loop = asyncio.get_running_loop()
+        await self.pubsub.start()
+
+    def publish_threadsafe(self, envelope: dict):
+        """
+        Publica um envelope pelo pub/sub a partir de código sync (rotas def, no threadpool)
+        ou do próprio event loop. Antes do start, não há para onde publicar.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            loop.create_task(self.pubsub.publish(envelope))
+        else:
+            asyncio.run_coroutine_threadsafe(self.pubsub.publish(envelope), loop)
+
+    def deliver(self, envelope: dict):
+        """
+        Entrega um evento às conexões deste processo (chamado pelo backend de pub/sub).
+        Destino: "user_id", "topic" (com "exclude_user_id" opcional) ou, sem nenhum, todos.
+        Envelopes com "revocation" não vão para os clientes: atualizam as revogações de token.
+        """
+        if "revocation" in envelope:
+            token_revocation.apply(envelope["revocation"])
+            return
+
+        type = envelope["type"]
+        if envelope.get("user_id") is not None:
+            conns = list(self.active_connections.get(envelope["user_id"], ()))
+            if conns:
+                print(f"Enviando mensagem para usuário {envelope['user_id']}: {envelope['message']}")
+        elif envelope.get("topic") is not None:
+            exclude_user_id = envelope.get("exclude_user_id")
+            conns = [
+                conn for conn in self.topics.get(envelope["topic"], ())
+                if exclude_user_id is None or self.connections[conn].user_id != exclude_user_id
+            ]
+        else:
+            # Cópia: o fan-out pode remover conexões lentas
+            conns = list(self.connections)
+
+        if conns:
+            self._fan_out(conns, Frame(type, envelope["message"]))
                 
     def set_msg(self, type:str, message: str):
         return {
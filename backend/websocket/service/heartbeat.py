@@ -0,0 +1,62 @@
+# backend/websocket/service/heartbeat.py
+import asyncio
+import os
+import time
+from backend.websocket.service.codecs import Frame
+from backend.websocket.service.ws_instance import manager
+
+# A cada intervalo, conexões sem atividade recebem {"type": "ping"}; o cliente responde
+# {"action": "pong"} (qualquer mensagem recebida conta como atividade).
+WS_HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("WS_HEARTBEAT_INTERVAL_SECONDS", 25))
+# Sem nenhuma mensagem do cliente por esse tempo, a conexão é considerada morta
+WS_IDLE_TIMEOUT_SECONDS = float(os.getenv("WS_IDLE_TIMEOUT_SECONDS", 75))
+
+
+class HeartbeatService:
+    """
+    Pings do servidor e remoção de conexões meio-abertas (ex.: notebook que dormiu),
+    que de outra forma só sairiam do manager quando um envio falhasse.
+    O ping é de aplicação: o ASGI não expõe os frames de ping/pong do protocolo.
+    """
+
+    def __init__(self):
+        self.is_running = False
+        self.pings = 0
+        self.reaped = 0
+
+    def sweep(self):
+        now = time.time()
+        ping_frame = None
+        for websocket, connection in list(manager.connections.items()):
+            idle = now - connection.last_activity
+            if idle >= WS_IDLE_TIMEOUT_SECONDS:
+                print(f"💤 Conexão WS do usuário {connection.user_id} sem resposta há {int(idle)}s; encerrando")
+                self.reaped += 1
+                # 1001: "going away"
+                manager.close_connection(websocket, 1001)
+            elif idle >= WS_HEARTBEAT_INTERVAL_SECONDS:
+                if ping_frame is None:
+                    # Um frame por varredura, codificado uma vez por codec
+                    ping_frame = Frame("ping", {"ts": now})
+                manager.send_frame([websocket], ping_frame)
+                self.pings += 1
+
+    async def start_scheduler(self):
+        self.is_running = True
+        print("💓 Heartbeat do websocket iniciado")
+        while self.is_running:
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"❌ Erro no heartbeat do websocket: {e}")
+            await asyncio.sleep(WS_HEARTBEAT_INTERVAL_SECONDS / 2)
+
+    def stop(self):
+        self.is_running = False
+
+    def stats(self) -> dict:
+        return {"pings": self.pings, "reaped": self.reaped}
+
+
+# Instância global
+heartbeat_service = HeartbeatService()
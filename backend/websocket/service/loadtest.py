@@ -0,0 +1,56 @@
+# backend/websocket/service/loadtest.py
+import asyncio
+import os
+import time
+import psutil
+from backend.websocket.service.ws_instance import manager
+
+# Rotas de apoio ao benchmarks/ws_loadtest.py (publicação sintética e sonda do servidor).
+# Desligadas por padrão; só ligar em instâncias de teste.
+WS_LOADTEST_ENABLED = os.getenv("WS_LOADTEST_ENABLED", "false").lower() == "true"
+
+LOADTEST_MESSAGE_TYPE = "loadtest"
+
+
+async def publish_load(mode: str, user_ids: list, seq: int, size: int) -> dict:
+    """
+    Publica uma mensagem "loadtest" com o instante de envio (o cliente calcula a latência):
+    - broadcast: uma para todas as conexões;
+    - users: uma send_to_user por id (o caminho das notificações).
+    """
+    payload = {"seq": seq, "sent_at": time.time(), "pad": "x" * max(size, 0)}
+    started = time.perf_counter()
+    if mode == "users":
+        for user_id in user_ids:
+            await manager.send_to_user(user_id, LOADTEST_MESSAGE_TYPE, payload)
+    else:
+        await manager.broadcast(LOADTEST_MESSAGE_TYPE, payload)
+    return {
+        "mode": mode,
+        "seq": seq,
+        "publish_ms": (time.perf_counter() - started) * 1000,
+        "connections": manager.connection_count,
+    }
+
+
+async def probe_server(seconds: float = 1.0, tick: float = 0.01) -> dict:
+    """Memória do processo e atraso do event loop (quanto cada sleep curto passou do previsto)."""
+    lags = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(tick)
+        lags.append((time.perf_counter() - started - tick) * 1000)
+    lags.sort()
+    stats = manager.queue_stats()
+    return {
+        "rss_bytes": psutil.Process().memory_info().rss,
+        "connections": stats["connections"],
+        "queued": stats["queued"],
+        "evicted": stats["evicted"],
+        "loop_lag_ms": {
+            "avg": sum(lags) / len(lags) if lags else 0.0,
+            "p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0,
+            "max": lags[-1] if lags else 0.0,
+        },
+    }
@@ -0,0 +1,111 @@
+# backend/websocket/service/outbound.py
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Callable, Optional
+from fastapi import WebSocket
+
+# Tempo máximo de um envio; conexões que estouram são consideradas mortas e removidas
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", 5))
+# Mensagens pendentes por conexão
+WS_QUEUE_MAX_SIZE = int(os.getenv("WS_QUEUE_MAX_SIZE", 256))
+# Por quanto tempo uma fila pode ficar cheia antes de a conexão ser derrubada
+WS_SLOW_CONSUMER_GRACE_SECONDS = float(os.getenv("WS_SLOW_CONSUMER_GRACE_SECONDS", 10))
+
+# Tipos em que só o último valor importa: uma mensagem pendente é substituída pela nova
+# e, com a fila cheia, a nova é descartada em vez de empurrar notificações para fora.
+LOW_PRIORITY_TYPES = frozenset({"system_stats", "system_stats_delta"})
+
+
+class ConnectionWriter:
+    """
+    Fila de saída limitada de uma conexão, esvaziada por uma task própria.
+    Quem publica só enfileira (não espera o socket); um cliente lento só atrasa a si mesmo.
+    """
+
+    def __init__(self, websocket: WebSocket, on_dead: Callable[[WebSocket], None]):
+        self.websocket = websocket
+        self._on_dead = on_dead
+        # Cada item é [tipo, dados]; itens de baixa prioridade também ficam em _latest,
+        # para que a mensagem pendente seja atualizada no lugar.
+        self._pending: deque = deque()
+        self._latest: dict[str, list] = {}
+        self._wakeup = asyncio.Event()
+        self.full_since: Optional[float] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, type: str, data) -> bool:
+        """
+        Enfileira um frame já codificado (str = texto, bytes = binário). Retorna False quando a fila está cheia há mais
+        de WS_SLOW_CONSUMER_GRACE_SECONDS: a conexão deve ser derrubada.
+        """
+        slot = self._latest.get(type)
+        if slot is not None:
+            slot[1] = data
+            self.coalesced += 1
+            return True
+
+        if len(self._pending) >= WS_QUEUE_MAX_SIZE:
+            now = time.monotonic()
+            if self.full_since is None:
+                self.full_since = now
+            elif now - self.full_since > WS_SLOW_CONSUMER_GRACE_SECONDS:
+                return False
+
+            if type in LOW_PRIORITY_TYPES or not self._drop_low_priority():
+                self.dropped += 1
+                return True
+
+        item = [type, data]
+        self._pending.append(item)
+        if type in LOW_PRIORITY_TYPES:
+            self._latest[type] = item
+        self._wakeup.set()
+        return True
+
+    def _drop_low_priority(self) -> bool:
+        """Abre espaço para uma notificação descartando uma mensagem de baixa prioridade pendente."""
+        for msg_type, item in list(self._latest.items()):
+            self._pending.remove(item)
+            del self._latest[msg_type]
+            self.dropped += 1
+            return True
+        return False
+
+    async def _run(self):
+        try:
+            while True:
+                if not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                item = self._pending.popleft()
+                if self._latest.get(item[0]) is item:
+                    del self._latest[item[0]]
+                data = item[1]
+                send = self.websocket.send_bytes(data) if isinstance(data, bytes) else self.websocket.send_text(data)
+                await asyncio.wait_for(send, WS_SEND_TIMEOUT_SECONDS)
+                self.sent += 1
+                if len(self._pending) < WS_QUEUE_MAX_SIZE:
+                    self.full_since = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Envio WS falhou ({type(e).__name__}); removendo conexão")
+            self._on_dead(self.websocket)
+
+    def close(self):
+        """Para a task de envio e descarta o que estiver pendente."""
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._pending.clear()
+        self._latest.clear()
@@ -0,0 +1,162 @@
+# backend/websocket/service/pubsub.py
+import asyncio
+import json
+import os
+import select
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+WS_PUBSUB_BACKEND = os.getenv("WS_PUBSUB_BACKEND", "memory")  # "memory" | "postgres"
+WS_PUBSUB_CHANNEL = os.getenv("WS_PUBSUB_CHANNEL", "ws_events")
+
+# O NOTIFY do PostgreSQL aceita payloads de até 8000 bytes
+_PG_NOTIFY_MAX_BYTES = 7900
+
+
+class PubSubBackend(ABC):
+    """
+    Transporte dos eventos do websocket entre processos. Um evento é um dict
+    ("envelope") com o destino e a mensagem; 'deliver' (ligado pelo ConnectionManager)
+    entrega o envelope às conexões deste processo. Implementações devem chamar 'deliver'
+    também para os eventos publicados pelos outros workers.
+    """
+
+    def __init__(self):
+        self.deliver: Optional[Callable[[dict], None]] = None
+
+    async def start(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, envelope: dict):
+        ...
+
+    async def stop(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__}
+
+
+class InProcessPubSubBackend(PubSubBackend):
+    """Entrega direta no processo. Suficiente para um único worker."""
+
+    async def publish(self, envelope: dict):
+        self.deliver(envelope)
+
+
+class PostgresPubSubBackend(PubSubBackend):
+    """
+    LISTEN/NOTIFY no banco principal, para rodar a API com vários workers.
+
+    O evento é entregue na hora às conexões locais e publicado com NOTIFY; cada worker
+    escuta o canal numa conexão dedicada (thread própria, funciona também no Windows) e
+    ignora os eventos que ele mesmo publicou. Eventos maiores que o limite do NOTIFY
+    ficam só no worker de origem. Enquanto a conexão de escuta estiver caída, os eventos
+    dos outros workers são perdidos (o cliente recupera o estado pela API).
+    """
+
+    def __init__(self, engine: Engine, channel: str = WS_PUBSUB_CHANNEL):
+        super().__init__()
+        self._engine = engine
+        self._channel = channel
+        self._origin = uuid.uuid4().hex
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.published = 0
+        self.received = 0
+        self.oversized = 0
+        self.errors = 0
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen_forever, name="ws-pubsub-listen", daemon=True)
+        self._thread.start()
+
+    async def publish(self, envelope: dict):
+        self.deliver(envelope)
+        payload = json.dumps({**envelope, "origin": self._origin})
+        if len(payload.encode("utf-8")) > _PG_NOTIFY_MAX_BYTES:
+            self.oversized += 1
+            print(f"⚠️ Evento WS grande demais para NOTIFY ({envelope.get('type')}); entregue só neste worker")
+            return
+        try:
+            await asyncio.to_thread(self._notify, payload)
+            self.published += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"❌ Erro ao publicar evento WS no PostgreSQL: {e}")
+
+    def _notify(self, payload: str):
+        with self._engine.begin() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self._channel, "payload": payload})
+
+    def _listen_forever(self):
+        while not self._stopping.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                self.errors += 1
+                print(f"❌ Escuta do canal WS caiu ({e}); reconectando em 5s")
+                self._stopping.wait(5)
+
+    def _listen(self):
+        raw = self._engine.raw_connection()
+        try:
+            dbapi_conn = raw.driver_connection
+            dbapi_conn.autocommit = True
+            with dbapi_conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self._channel}"')
+            print(f"📡 Escutando eventos WS no canal '{self._channel}'")
+
+            while not self._stopping.is_set():
+                # Timeout curto para perceber o stop sem depender de notificações
+                if not select.select([dbapi_conn], [], [], 1.0)[0]:
+                    continue
+                dbapi_conn.poll()
+                while dbapi_conn.notifies:
+                    notify = dbapi_conn.notifies.pop(0)
+                    self._loop.call_soon_threadsafe(self._dispatch, notify.payload)
+        finally:
+            # A conexão ficou em autocommit/LISTEN: descarta em vez de devolver ao pool
+            raw.invalidate()
+
+    def _dispatch(self, payload: str):
+        try:
+            envelope = json.loads(payload)
+        except ValueError:
+            return
+        if envelope.pop("origin", None) == self._origin:
+            return
+        self.received += 1
+        self.deliver(envelope)
+
+    async def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, 5)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self).__name__,
+            "channel": self._channel,
+            "published": self.published,
+            "received": self.received,
+            "oversized": self.oversized,
+            "errors": self.errors,
+        }
+
+
+def build_pubsub_backend() -> PubSubBackend:
+    if WS_PUBSUB_BACKEND == "postgres":
+        from backend.database.database import engine
+        if engine.dialect.name == "postgresql":
+            return PostgresPubSubBackend(engine)
+        print("AVISO: WS_PUBSUB_BACKEND=postgres exige PRINCIPAL_DATABASE_URL em PostgreSQL. Usando entrega em processo.")
+    return InProcessPubSubBackend()
@@ -1,3 +1,4 @@
+import asyncio
 import psutil
 from datetime import timedelta
 # from backend.frota.database import SessionLocal
@@ -39,10 +40,11 @@ def get_system_stats() -> dict:
     }
 
 
-async def get_online_users_data():
-    """Retorna os usuários online diretamente do DB (síncrono)."""
-    online_ids = list(manager.active_connections.keys())
+def query_online_users(online_ids: list) -> list:
+    """Consulta (síncrona) os dados dos usuários conectados."""
     users_data = []
+    if not online_ids:
+        return users_data
 
     db = SessionLocal()  # cria sessão manualmente
     try:
@@ -56,4 +58,9 @@ async def get_online_users_data():
     finally:
         db.close()
 
-    return users_data
\ No newline at end of file
+    return users_data
+
+
+async def get_online_users_data():
+    """Retorna os usuários online, consultando o DB fora do event loop."""
+    return await asyncio.to_thread(query_online_users, list(manager.active_connections.keys()))
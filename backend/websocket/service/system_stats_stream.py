@@ -0,0 +1,177 @@
+# backend/websocket/service/system_stats_stream.py
+import asyncio
+import os
+import time
+from typing import Optional
+from fastapi import WebSocket
+from backend.websocket.service.codecs import Frame
+from backend.websocket.service.settings import get_system_stats, query_online_users
+from backend.websocket.service.topics import TOPIC_SYSTEM_STATS
+from backend.websocket.service.ws_instance import manager
+
+# Intervalo de amostragem por assinante (o cliente pode pedir outro com {"interval": s})
+SYSTEM_STATS_DEFAULT_INTERVAL_SECONDS = float(os.getenv("SYSTEM_STATS_DEFAULT_INTERVAL_SECONDS", 2))
+SYSTEM_STATS_MIN_INTERVAL_SECONDS = float(os.getenv("SYSTEM_STATS_MIN_INTERVAL_SECONDS", 1))
+SYSTEM_STATS_MAX_INTERVAL_SECONDS = float(os.getenv("SYSTEM_STATS_MAX_INTERVAL_SECONDS", 60))
+# Idade máxima do keyframe; depois disso o próximo snapshot vira o novo keyframe
+SYSTEM_STATS_KEYFRAME_SECONDS = float(os.getenv("SYSTEM_STATS_KEYFRAME_SECONDS", 30))
+
+
+def diff_snapshot(base: dict, current: dict) -> dict:
+    """Campos de 'current' que diferem de 'base' (recursivo em dicts; listas são trocadas inteiras)."""
+    changes = {}
+    for key, value in current.items():
+        old = base.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = diff_snapshot(old, value)
+            if nested:
+                changes[key] = nested
+        elif key not in base or value != old:
+            changes[key] = value
+    return changes
+
+
+class _Subscriber:
+    __slots__ = ("interval", "next_due", "keyframe_seq", "last_changes")
+
+    def __init__(self, interval: float, now: float):
+        self.interval = interval
+        self.next_due = now
+        self.keyframe_seq: Optional[int] = None
+        self.last_changes: Optional[dict] = None
+
+
+class SystemStatsStream:
+    """
+    Publica o tópico system_stats só enquanto houver assinantes.
+
+    Cada assinante recebe primeiro o keyframe ("system_stats", snapshot completo) e depois
+    "system_stats_delta" com os campos que mudaram desde esse keyframe. Os deltas são
+    cumulativos: perder ou coalescer um delta não corrompe o estado do cliente, e um delta
+    com 'base' diferente do keyframe que o cliente tem é ignorado até o próximo keyframe.
+    Cada frame é codificado uma vez por amostra e codec e compartilhado entre os assinantes
+    (o keyframe, enquanto vale, é reaproveitado entre as amostras).
+    """
+
+    def __init__(self):
+        self.is_running = False
+        self._wakeup = asyncio.Event()
+        self._subscribers: dict[WebSocket, _Subscriber] = {}
+        self._seq = 0
+        self._keyframe: Optional[dict] = None
+        self._keyframe_seq = 0
+        self._keyframe_at = 0.0
+        self._keyframe_frame: Optional[Frame] = None
+        self._online_ids: Optional[frozenset] = None
+        self._online_users: list = []
+        manager.add_subscribe_listener(TOPIC_SYSTEM_STATS, self._wakeup.set)
+
+    def _interval_for(self, websocket: WebSocket) -> float:
+        connection = manager.get_connection(websocket)
+        options = connection.topic_options.get(TOPIC_SYSTEM_STATS, {}) if connection else {}
+        try:
+            interval = float(options.get("interval", SYSTEM_STATS_DEFAULT_INTERVAL_SECONDS))
+        except (TypeError, ValueError):
+            interval = SYSTEM_STATS_DEFAULT_INTERVAL_SECONDS
+        return min(max(interval, SYSTEM_STATS_MIN_INTERVAL_SECONDS), SYSTEM_STATS_MAX_INTERVAL_SECONDS)
+
+    def _sync_subscribers(self, now: float):
+        """Acompanha entradas, saídas e mudanças de intervalo dos assinantes do tópico."""
+        current = manager.topics.get(TOPIC_SYSTEM_STATS, set())
+        for websocket in list(self._subscribers):
+            if websocket not in current:
+                del self._subscribers[websocket]
+        for websocket in current:
+            interval = self._interval_for(websocket)
+            subscriber = self._subscribers.get(websocket)
+            if subscriber is None:
+                self._subscribers[websocket] = _Subscriber(interval, now)
+            elif subscriber.interval != interval:
+                subscriber.interval = interval
+                subscriber.next_due = min(subscriber.next_due, now + interval)
+
+    async def _sample(self) -> dict:
+        # psutil e a consulta dos usuários online rodam fora do event loop
+        stats = await asyncio.to_thread(get_system_stats)
+        stats["connections"] = manager.connection_count
+
+        # Usuários online só são consultados de novo quando o conjunto de ids muda
+        online_ids = frozenset(manager.active_connections)
+        if online_ids != self._online_ids:
+            self._online_users = await asyncio.to_thread(query_online_users, list(online_ids))
+            self._online_ids = online_ids
+
+        return {"server_stats": stats, "users_stats": self._online_users}
+
+    async def _publish(self, due: list, now: float):
+        snapshot = await self._sample()
+        self._seq += 1
+
+        if self._keyframe is None or now - self._keyframe_at >= SYSTEM_STATS_KEYFRAME_SECONDS:
+            self._keyframe = snapshot
+            self._keyframe_seq = self._seq
+            self._keyframe_at = now
+            self._keyframe_frame = Frame("system_stats", {"seq": self._seq, **snapshot})
+
+        changes, delta_frame = None, None
+        if self._keyframe_seq != self._seq:
+            changes = diff_snapshot(self._keyframe, snapshot)
+            delta_frame = Frame("system_stats_delta", {
+                "base": self._keyframe_seq,
+                "seq": self._seq,
+                "changes": changes,
+            })
+
+        for websocket in due:
+            subscriber = self._subscribers[websocket]
+            subscriber.next_due = now + subscriber.interval
+            if subscriber.keyframe_seq != self._keyframe_seq:
+                manager.send_frame([websocket], self._keyframe_frame)
+                subscriber.keyframe_seq = self._keyframe_seq
+                subscriber.last_changes = None
+            # Nada mudou desde o último delta entregue a este assinante: não reenvia
+            if delta_frame is not None and changes != subscriber.last_changes:
+                manager.send_frame([websocket], delta_frame)
+                subscriber.last_changes = changes
+
+    async def start_scheduler(self):
+        self.is_running = True
+        print("📡 Stream de system_stats aguardando assinantes")
+        while self.is_running:
+            try:
+                if not manager.subscriber_count(TOPIC_SYSTEM_STATS):
+                    # Sem assinantes: nada é amostrado até alguém assinar
+                    self._subscribers.clear()
+                    self._keyframe = None
+                    self._online_ids = None
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                self._wakeup.clear()
+                now = time.monotonic()
+                self._sync_subscribers(now)
+                due = [ws for ws, subscriber in self._subscribers.items() if subscriber.next_due <= now]
+                if due:
+                    await self._publish(due, now)
+
+                if self._subscribers:
+                    next_due = min(subscriber.next_due for subscriber in self._subscribers.values())
+                    try:
+                        # Acorda antes se alguém novo assinar (ou mudar o intervalo)
+                        await asyncio.wait_for(self._wakeup.wait(), max(next_due - time.monotonic(), 0.05))
+                    except asyncio.TimeoutError:
+                        pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erro no stream de system_stats: {e}")
+                await asyncio.sleep(SYSTEM_STATS_DEFAULT_INTERVAL_SECONDS)
+
+    def stop(self):
+        self.is_running = False
+        self._wakeup.set()
+
+
+# Instância global
+system_stats_stream = SystemStatsStream()
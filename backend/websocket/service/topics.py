@@ -0,0 +1,63 @@
+# backend/websocket/service/topics.py
+import re
+from typing import Optional
+from sqlalchemy import or_
+from backend.database.database import SessionLocal
+from backend.models.user import User
+from backend.ticket.models.ticket import Ticket
+
+# Tópicos do canal /ws. O cliente assina com:
+#   {"action": "subscribe", "topics": ["vehicles", "ticket:42"]}
+#   {"action": "unsubscribe", "topic": "ticket:42"}
+TOPIC_SYSTEM_STATS = "system_stats"   # painel do administrador
+TOPIC_VEHICLES = "vehicles"           # lista de veículos / reservas
+
+_TICKET_TOPIC = re.compile(r"^ticket:(\d+)$")
+
+
+def ticket_topic(ticket_id: int) -> str:
+    return f"ticket:{ticket_id}"
+
+
+def parse_ticket_topic(topic: str) -> Optional[int]:
+    match = _TICKET_TOPIC.match(topic)
+    return int(match.group(1)) if match else None
+
+
+def is_valid_topic(topic: str) -> bool:
+    return topic in (TOPIC_SYSTEM_STATS, TOPIC_VEHICLES) or parse_ticket_topic(topic) is not None
+
+
+def can_subscribe(user_id: int, topic: str) -> bool:
+    """
+    Permissão de assinatura (síncrona, consulta o banco principal):
+    - system_stats: só administradores (o payload lista os usuários online);
+    - ticket:<id>: mesmo escopo de leitura de read_ticket_route;
+    - vehicles: qualquer usuário autenticado.
+    """
+    if topic == TOPIC_VEHICLES:
+        return True
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user or not user.is_active:
+            return False
+        if topic == TOPIC_SYSTEM_STATS:
+            return bool(user.is_admin or user.is_super_admin)
+
+        ticket_id = parse_ticket_topic(topic)
+        if ticket_id is None:
+            return False
+        query = db.query(Ticket.id).filter(Ticket.id == ticket_id)
+        if user.is_admin and not user.is_super_admin:
+            query = query.filter(or_(
+                Ticket.requester_id == user.id,
+                Ticket.assignee_id == user.id,
+                Ticket.assignee_id == None
+            ))
+        elif not user.is_super_admin:
+            query = query.filter(Ticket.requester_id == user.id)
+        return query.first() is not None
+    finally:
+        db.close()
@@ -1,4 +1,10 @@
 # backend/websocket/service/ws_instance.py
+from backend.core.token_revocation import token_revocation
 from .connection_manager import ConnectionManager
+from .pubsub import build_pubsub_backend
 
-manager = ConnectionManager()
+# WS_PUBSUB_BACKEND=postgres para entregar os eventos entre vários workers
+manager = ConnectionManager(pubsub=build_pubsub_backend())
+
+# Revogações de token (logout, mudança de perfil) chegam a todos os workers pelo mesmo canal
+token_revocation.publisher = lambda event: manager.publish_threadsafe({"revocation": event})
@@ -1,6 +1,6 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { SystemStats, User } from "../../types";
-import { connectWebSocket, getWebSocket } from "../../../services/websocket";
+import { connectWebSocket, getWebSocket, subscribeTopic } from "../../../services/websocket";
 import { IUser } from "../../../components/AUTH/interfaces/user";
 
 const API_URL = import.meta.env.VITE_API_URL; // ex: http://localhost:8000/api
@@ -14,6 +14,21 @@ const getAuthHeaders = (extraHeaders: Record<string, string> = {}) => {
   return headers;
 };
 
+// Frequência de atualização pedida ao servidor para o painel
+const STATS_INTERVAL_SECONDS = 2;
+
+const isPlainObject = (value: unknown): value is Record<string, any> =>
+  typeof value === "object" && value !== null && !Array.isArray(value);
+
+// Aplica as mudanças de um delta sobre o keyframe (objetos são mesclados, o resto é trocado)
+const mergeChanges = (base: Record<string, any>, changes: Record<string, any>): Record<string, any> => {
+  const result: Record<string, any> = { ...base };
+  Object.entries(changes).forEach(([key, value]) => {
+    result[key] = isPlainObject(value) && isPlainObject(base[key]) ? mergeChanges(base[key], value) : value;
+  });
+  return result;
+};
+
 export const useDashboardStats = () => {
   const [stats, setStats] = useState<SystemStats>({
     cpu: { percent: 0 },
@@ -24,17 +39,30 @@ export const useDashboardStats = () => {
   });
 
   const [users, setUsers] = useState<User[]>([]);
+  // Último keyframe recebido; os deltas trazem só o que mudou desde ele
+  const keyframeRef = useRef<{ seq: number; data: any } | null>(null);
 
   useEffect(() => {
     const ws = getWebSocket() || connectWebSocket();
+    const unsubscribe = subscribeTopic("system_stats", { interval: STATS_INTERVAL_SECONDS });
+
+    const applySnapshot = (snapshot: any) => {
+      setStats(snapshot.server_stats);
+      setUsers(snapshot.users_stats || []);
+    };
 
     const handleMessage = (event: MessageEvent) => {
       try {
         const data = JSON.parse(event.data);
 
         if (data.type === "system_stats") {
-          setStats(data.message.server_stats);
-          setUsers(data.message.users_stats || []);
+          keyframeRef.current = { seq: data.message.seq, data: data.message };
+          applySnapshot(data.message);
+        } else if (data.type === "system_stats_delta") {
+          const keyframe = keyframeRef.current;
+          // Delta de outro keyframe: aguarda o próximo keyframe
+          if (!keyframe || keyframe.seq !== data.message.base) return;
+          applySnapshot(mergeChanges(keyframe.data, data.message.changes));
         }
       } catch (err) {
         console.error("Erro ao processar mensagem WS:", err);
@@ -42,7 +70,10 @@ export const useDashboardStats = () => {
     };
 
     ws.addEventListener("message", handleMessage);
-    return () => ws.removeEventListener("message", handleMessage);
+    return () => {
+      ws.removeEventListener("message", handleMessage);
+      unsubscribe();
+    };
   }, []);
 
   return { stats, users };
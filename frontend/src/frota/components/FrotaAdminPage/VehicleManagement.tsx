@@ -1,17 +1,17 @@
 import React, { useState, useEffect } from 'react';
-import { useVehicles, createVehicle, updateVehicle, deleteVehicle } from '../../services/frota.services';
+import { useVehicles, createVehicle, updateVehicle, deleteVehicle, scheduleRefetch } from '../../services/frota.services';
 import { Vehicle } from '../../types';
 import { VehicleListItem } from '../VehicleListItem';
 import { VehicleFormModal } from '../VehicleFormModal';
 import { Pagination } from '../Pagination';
 import { Plus } from 'lucide-react';
-import { getWebSocket } from '../../../services/websocket';
+import { getWebSocket, subscribeTopic } from '../../../services/websocket';
 import './styles.css';
 
 const ITEMS_PER_PAGE = 9;
 
 export const VehicleManagement = () => {
-  const { vehicles, isLoading, error, refetchVehicles } = useVehicles();
+  const { vehicles, isLoading, error, refetchVehicles, applyVehicleUpdate } = useVehicles();
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [vehicleToEdit, setVehicleToEdit] = useState<Vehicle | null>(null);
   const [isSaving, setIsSaving] = useState(false);
@@ -19,14 +19,16 @@ export const VehicleManagement = () => {
 
   // ✅ EFEITO: Escutar atualizações em tempo real via WebSocket
   useEffect(() => {
+    const unsubscribe = subscribeTopic("vehicles");
     const ws = getWebSocket();
-    if (!ws) return;
+    if (!ws) return unsubscribe;
 
     const handleMessage = (event: MessageEvent) => {
       try {
         const data = JSON.parse(event.data);
-        if (data.type === "vehicle_update") {
-          refetchVehicles();
+        // O evento traz os novos status; só recarrega se não der para corrigir localmente
+        if (data.type === "vehicle_update" && !applyVehicleUpdate(data.message)) {
+          scheduleRefetch(refetchVehicles);
         }
       } catch (err) {
         console.error("Erro ao processar mensagem WS na gestão de veículos:", err);
@@ -34,8 +36,11 @@ export const VehicleManagement = () => {
     };
 
     ws.addEventListener("message", handleMessage);
-    return () => ws.removeEventListener("message", handleMessage);
-  }, [refetchVehicles]);
+    return () => {
+      ws.removeEventListener("message", handleMessage);
+      unsubscribe();
+    };
+  }, [refetchVehicles, applyVehicleUpdate]);
 
   // Paginação
   const paginatedVehicles = React.useMemo(() => {
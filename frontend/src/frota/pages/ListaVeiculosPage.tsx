@@ -2,7 +2,7 @@ import React, { useState, useMemo, useEffect } from 'react';
 import '../styles/frota.css';
 import './ListaVeiculosPage.css';
 import { useAuth } from '../../components/AUTH/AuthContext';
-import { useVehiclesWithBookings } from '../services/frota.services';
+import { useVehiclesWithBookings, scheduleRefetch } from '../services/frota.services';
 import { Dashboard } from '../components/Dashboard';
 import { VehicleCard } from '../components/VehicleCard';
 import { CheckoutModal } from '../components/CheckoutModal';
@@ -14,11 +14,11 @@ import Loading from '../../components/Loads/Loading';
 import { Search } from 'lucide-react';
 // 1. IMPORTAÇÃO DO COMPONENTE DE PAGINAÇÃO
 import { Pagination } from '../components/Pagination';
-import { getWebSocket } from '../../services/websocket';
+import { getWebSocket, subscribeTopic } from '../../services/websocket';
 
 export default function ListaVeiculosPage() {
   const { user, loadingUser } = useAuth();
-  const { vehicles, isLoading, error, refetchVehicles } = useVehiclesWithBookings();
+  const { vehicles, isLoading, error, refetchVehicles, applyVehicleUpdate } = useVehiclesWithBookings();
 
   const [isCheckoutModalOpen, setIsCheckoutModalOpen] = useState(false);
   const [isScheduleModalOpen, setIsScheduleModalOpen] = useState(false);
@@ -47,15 +47,17 @@ export default function ListaVeiculosPage() {
 
   // ✅ EFEITO: Escutar atualizações em tempo real via WebSocket
   useEffect(() => {
+    const unsubscribe = subscribeTopic("vehicles");
     const ws = getWebSocket();
-    if (!ws) return;
+    if (!ws) return unsubscribe;
 
     const handleMessage = (event: MessageEvent) => {
       try {
         const data = JSON.parse(event.data);
-        if (data.type === "vehicle_update") {
+        // O evento traz os novos status; só recarrega se não der para corrigir localmente
+        if (data.type === "vehicle_update" && !applyVehicleUpdate(data.message)) {
           console.log("🔄 Recebido sinal de atualização de veículos via WS");
-          refetchVehicles();
+          scheduleRefetch(refetchVehicles);
         }
       } catch (err) {
         console.error("Erro ao processar mensagem WS na lista de veículos:", err);
@@ -63,8 +65,11 @@ export default function ListaVeiculosPage() {
     };
 
     ws.addEventListener("message", handleMessage);
-    return () => ws.removeEventListener("message", handleMessage);
-  }, [refetchVehicles]);
+    return () => {
+      ws.removeEventListener("message", handleMessage);
+      unsubscribe();
+    };
+  }, [refetchVehicles, applyVehicleUpdate]);
 
   const handleOpenCheckoutModal = (vehicle: VehicleWithBookings) => {
     setSelectedVehicle(vehicle);
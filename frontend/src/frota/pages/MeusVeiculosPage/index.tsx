@@ -1,7 +1,7 @@
-import { getWebSocket } from '../../../services/websocket';
+import { getWebSocket, subscribeTopic } from '../../../services/websocket';
 import React, { useState, useEffect } from 'react';
 import './styles.css';
-import { usePersonalBookings, completeReturn, cancelBooking, departVehicle } from '../../services/frota.services';
+import { usePersonalBookings, completeReturn, cancelBooking, departVehicle, scheduleRefetch } from '../../services/frota.services';
 import { FrotaHeader } from '../../components/Header';
 import { VehicleCard } from '../../components/VehicleCard';
 import { ReturnVehicleModal } from '../../components/ReturnVehicleModal';
@@ -11,7 +11,7 @@ import { BookingWithVehicle } from '../../types';
 import { DepartVehicleModal } from '../../components/DepartVehicleModal';
 
 export default function MeusVeiculosPage() {
-  const { bookings, isLoading, error, refetchBookings } = usePersonalBookings();
+  const { bookings, isLoading, error, refetchBookings, applyVehicleUpdate } = usePersonalBookings();
 
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [selectedBooking, setSelectedBooking] = useState<BookingWithVehicle | null>(null);
@@ -28,15 +28,17 @@ export default function MeusVeiculosPage() {
 
   // ✅ EFEITO: Escutar atualizações em tempo real via WebSocket
   useEffect(() => {
+    const unsubscribe = subscribeTopic("vehicles");
     const ws = getWebSocket();
-    if (!ws) return;
+    if (!ws) return unsubscribe;
 
     const handleMessage = (event: MessageEvent) => {
       try {
         const data = JSON.parse(event.data);
-        if (data.type === "vehicle_update") {
+        // O evento traz os novos status; só recarrega se não der para corrigir localmente
+        if (data.type === "vehicle_update" && !applyVehicleUpdate(data.message)) {
           console.log("🔄 Recebido sinal de atualização de veículos via WS (Meus Veículos)");
-          refetchBookings();
+          scheduleRefetch(refetchBookings);
         }
       } catch (err) {
         console.error("Erro ao processar mensagem WS em Meus Veículos:", err);
@@ -44,8 +46,11 @@ export default function MeusVeiculosPage() {
     };
 
     ws.addEventListener("message", handleMessage);
-    return () => ws.removeEventListener("message", handleMessage);
-  }, [refetchBookings]);
+    return () => {
+      ws.removeEventListener("message", handleMessage);
+      unsubscribe();
+    };
+  }, [refetchBookings, applyVehicleUpdate]);
 
   const handleOpenReturnModal = (booking: BookingWithVehicle) => {
     setSelectedBooking(booking);
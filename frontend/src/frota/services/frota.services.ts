@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { Vehicle, Booking, BookingWithVehicle, VehicleWithBookings } from '../types';
 
 // @ts-ignore
@@ -290,6 +290,68 @@ export async function deleteVehicle(id: number) {
 }
 
 
+// --- EVENTO vehicle_update (WebSocket) ---
+
+// O servidor junta as mudanças de uma rajada em um único evento com os novos status.
+// 'reload' vem true quando o cadastro de um veículo mudou (não dá para corrigir só o status).
+export interface VehicleUpdateEvent {
+  vehicles?: { id: number; status: Vehicle['status'] }[];
+  bookings?: { id: number; vehicle_id: number | null; status: Booking['status'] }[];
+  reload?: boolean;
+}
+
+const vehicleStatuses = (event: VehicleUpdateEvent) =>
+  new Map((event.vehicles || []).map(v => [v.id, v.status] as [number, Vehicle['status']]));
+
+const bookingStatuses = (event: VehicleUpdateEvent) =>
+  new Map((event.bookings || []).map(b => [b.id, b.status] as [number, Booking['status']]));
+
+const patchVehicle = <T extends Vehicle>(vehicle: T, statuses: Map<number, Vehicle['status']>): T =>
+  statuses.has(vehicle.id) ? { ...vehicle, status: statuses.get(vehicle.id)! } : vehicle;
+
+const patchBooking = <T extends BookingWithVehicle>(
+  booking: T, statuses: Map<number, Booking['status']>, vehicles: Map<number, Vehicle['status']>
+): T => {
+  const patched = statuses.has(booking.id) ? { ...booking, status: statuses.get(booking.id)! } : booking;
+  return patched.vehicle ? { ...patched, vehicle: patchVehicle(patched.vehicle, vehicles) } : patched;
+};
+
+/** Aplica o evento à lista de veículos; null quando é preciso recarregar (reload ou veículo desconhecido). */
+export function patchVehicles<T extends Vehicle>(vehicles: T[], event: VehicleUpdateEvent): T[] | null {
+  const statuses = vehicleStatuses(event);
+  if (event.reload || Array.from(statuses.keys()).some(id => !vehicles.some(v => v.id === id))) {
+    return null;
+  }
+  return vehicles.map(v => patchVehicle(v, statuses));
+}
+
+/** Como patchVehicles, corrigindo também o status das reservas de cada veículo. */
+export function patchVehiclesWithBookings(vehicles: VehicleWithBookings[], event: VehicleUpdateEvent): VehicleWithBookings[] | null {
+  const patched = patchVehicles(vehicles, event);
+  if (!patched) return null;
+  const bookings = bookingStatuses(event);
+  const statuses = vehicleStatuses(event);
+  return patched.map(v => ({ ...v, bookings: v.bookings.map(b => patchBooking(b, bookings, statuses)) }));
+}
+
+/** Aplica o evento a uma lista de reservas (reservas de outros usuários são ignoradas). */
+export function patchBookings(bookings: BookingWithVehicle[], event: VehicleUpdateEvent): BookingWithVehicle[] | null {
+  if (event.reload) return null;
+  const statuses = vehicleStatuses(event);
+  return bookings.map(b => patchBooking(b, bookingStatuses(event), statuses));
+}
+
+// Quando é preciso recarregar, espalha as requisições dos clientes em vez de chegarem todas juntas
+const REFETCH_JITTER_MS = 1500;
+export const scheduleRefetch = (refetch: () => void) => setTimeout(refetch, Math.random() * REFETCH_JITTER_MS);
+
+// Guarda o valor atual para callbacks estáveis (sem recriar os listeners do WebSocket)
+function useLatest<T>(value: T) {
+  const ref = useRef(value);
+  ref.current = value;
+  return ref;
+}
+
 // --- HOOKS CUSTOMIZADOS ---
 
 export function useVehicles() {
@@ -322,7 +384,16 @@ export function useVehicles() {
     fetchVehicles();
   }, [fetchVehicles]);
 
-  return { vehicles, isLoading, error, refetchVehicles: fetchVehicles };
+  // Aplica um vehicle_update localmente; false quando a lista precisa ser recarregada
+  const vehiclesRef = useLatest(vehicles);
+  const applyVehicleUpdate = useCallback((event: VehicleUpdateEvent) => {
+    const patched = vehiclesRef.current && patchVehicles(vehiclesRef.current, event);
+    if (!patched) return false;
+    setVehicles(patched);
+    return true;
+  }, [vehiclesRef]);
+
+  return { vehicles, isLoading, error, refetchVehicles: fetchVehicles, applyVehicleUpdate };
 }
 
 
@@ -357,7 +428,16 @@ export function useMyBookings() {
     fetchBookings();
   }, [fetchBookings]);
 
-  return { bookings, isLoading, error, refetchBookings: fetchBookings };
+  // Aplica um vehicle_update localmente; false quando a lista precisa ser recarregada
+  const bookingsRef = useLatest(bookings);
+  const applyVehicleUpdate = useCallback((event: VehicleUpdateEvent) => {
+    const patched = bookingsRef.current && patchBookings(bookingsRef.current, event);
+    if (!patched) return false;
+    setBookings(patched);
+    return true;
+  }, [bookingsRef]);
+
+  return { bookings, isLoading, error, refetchBookings: fetchBookings, applyVehicleUpdate };
 }
 
 export function usePersonalBookings() {
@@ -390,7 +470,16 @@ export function usePersonalBookings() {
     fetchBookings();
   }, [fetchBookings]);
 
-  return { bookings, isLoading, error, refetchBookings: fetchBookings };
+  // Aplica um vehicle_update localmente; false quando a lista precisa ser recarregada
+  const bookingsRef = useLatest(bookings);
+  const applyVehicleUpdate = useCallback((event: VehicleUpdateEvent) => {
+    const patched = bookingsRef.current && patchBookings(bookingsRef.current, event);
+    if (!patched) return false;
+    setBookings(patched);
+    return true;
+  }, [bookingsRef]);
+
+  return { bookings, isLoading, error, refetchBookings: fetchBookings, applyVehicleUpdate };
 }
 
 export async function uploadVehicleImage(file: File): Promise<{ file_url: string }> {
@@ -453,7 +542,16 @@ export function useVehiclesWithBookings() {
     fetchData();
   }, [fetchData]);
 
-  return { vehicles, isLoading, error, refetchVehicles: fetchData };
+  // Aplica um vehicle_update localmente; false quando a lista precisa ser recarregada
+  const vehiclesRef = useLatest(vehicles);
+  const applyVehicleUpdate = useCallback((event: VehicleUpdateEvent) => {
+    const patched = vehiclesRef.current && patchVehiclesWithBookings(vehiclesRef.current, event);
+    if (!patched) return false;
+    setVehicles(patched);
+    return true;
+  }, [vehiclesRef]);
+
+  return { vehicles, isLoading, error, refetchVehicles: fetchData, applyVehicleUpdate };
 
 
 }
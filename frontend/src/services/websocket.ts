@@ -5,6 +5,9 @@ const VITE_WS_URL = import.meta.env.VITE_WS_URL;
 let ws: WebSocket | null = null;
 let reconnectTimeout: ReturnType<typeof setTimeout> | null = null;
 let token: string | null = null;
+// Tópicos assinados pelas telas abertas (com contagem de referências); reenviados a cada (re)conexão
+type TopicOptions = Record<string, unknown>;
+const topicRefs = new Map<string, { refs: number; options?: TopicOptions }>();
 
 
 export function connectWebSocket(newToken?: string): WebSocket {
@@ -25,9 +28,21 @@ export function connectWebSocket(newToken?: string): WebSocket {
 
   ws.onopen = () => {
     console.log("✅ Conectado ao WebSocket");
+    topicRefs.forEach(({ options }, topic) => {
+      ws?.send(JSON.stringify({ action: "subscribe", topic, ...options }));
+    });
   };
 
   ws.onmessage = (event) => {
+    // Heartbeat do servidor: sem resposta, a conexão é encerrada como inativa
+    try {
+      const data = JSON.parse(event.data);
+      if (data.type === "ping") {
+        ws?.send(JSON.stringify({ action: "pong" }));
+      }
+    } catch {
+      // frames que não são JSON ficam com os listeners das telas
+    }
   };
 
   ws.onclose = (event) => {
@@ -54,6 +69,33 @@ export function sendMessage(message: string) {
     console.warn("⚠️ WebSocket não está conectado.");
   }
 }
+
+/**
+ * Assina um tópico do /ws ("system_stats", "vehicles", "ticket:<id>").
+ * 'options' segue junto no subscribe (ex.: { interval: 5 } para system_stats).
+ * Retorna a função que cancela a assinatura (para usar no cleanup do useEffect).
+ */
+export function subscribeTopic(topic: string, options?: TopicOptions): () => void {
+  const entry = topicRefs.get(topic);
+  const refs = entry ? entry.refs : 0;
+  topicRefs.set(topic, { refs: refs + 1, options: options || entry?.options });
+  if ((refs === 0 || options) && ws && ws.readyState === WebSocket.OPEN) {
+    ws.send(JSON.stringify({ action: "subscribe", topic, ...options }));
+  }
+
+  return () => {
+    const current = topicRefs.get(topic);
+    if (current && current.refs > 1) {
+      topicRefs.set(topic, { ...current, refs: current.refs - 1 });
+      return;
+    }
+    topicRefs.delete(topic);
+    if (ws && ws.readyState === WebSocket.OPEN) {
+      ws.send(JSON.stringify({ action: "unsubscribe", topic }));
+    }
+  };
+}
+
 export function getWebSocket(): WebSocket | null {
   return ws;
 }
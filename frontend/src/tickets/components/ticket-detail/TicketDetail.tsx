@@ -8,7 +8,7 @@ import './TicketDetail.css';
 //@ts-ignore
 import './Forms.css';
 import { IUser } from '../../../components/AUTH/interfaces/user';
-import { connectWebSocket, getWebSocket } from '../../../services/websocket';
+import { connectWebSocket, getWebSocket, subscribeTopic } from '../../../services/websocket';
 import Loading from '../../../components/Loads/Loading';
 import { useAuth } from '../../../components/AUTH/AuthContext';
 //@ts-ignore
@@ -61,10 +61,11 @@ const TicketDetail: React.FC = () => {
     if (!getWebSocket()) {
       connectWebSocket();
     }
+    const unsubscribe = subscribeTopic(`ticket:${ticketId}`);
     const ws = getWebSocket();
 
 
-    if (!ws) return;
+    if (!ws) return unsubscribe;
 
     const handleMessage = (event: MessageEvent) => {
       try {
@@ -82,7 +83,10 @@ const TicketDetail: React.FC = () => {
     };
 
     ws.addEventListener("message", handleMessage);
-    return () => ws.removeEventListener("message", handleMessage);
+    return () => {
+      ws.removeEventListener("message", handleMessage);
+      unsubscribe();
+    };
   }, [ticketId]);
 
 